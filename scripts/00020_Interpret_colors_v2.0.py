@@ -3,8 +3,19 @@ import os
 import argparse
 import colorsys
 import glob
+import sys
 from pathlib import Path
 
+sys.path.append(str(Path(__file__).parent))
+from build_cache import BuildCache
+from project_state import discover_projects, record_stage
+
+# Optional: NumPy for the batch mode (vectorized HSV over all projects); pure Python otherwise
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
 def hex_to_rgb(hex_color):
     """Convert hex color to RGB tuple."""
     hex_color = hex_color.lstrip('#')
@@ -15,43 +26,31 @@ def rgb_to_hsv(r, g, b):
     r, g, b = r / 255.0, g / 255.0, b / 255.0
     return colorsys.rgb_to_hsv(r, g, b)
 
-def interpret_colors(project_name):
-    """Interpret colors from color_definitions.json and generate interpreted_colors.json."""
-    project_dir = f"content/{project_name}"
+def find_color_definitions(project_dir):
+    """First file ending with _color_definitions.json in the project folder."""
     # Search for any file ending with _color_definitions.json
     color_files = glob.glob(f"{project_dir}/*_color_definitions.json")
-    
     if not color_files:
         raise FileNotFoundError(f"Error: No file ending with '_color_definitions.json' found in {project_dir}.")
-    
     # Use the first matching file (or modify to select based on criteria, e.g., newest)
-    input_file = color_files[0]
-    output_file = f"{project_dir}/interpreted_colors.json"
+    return color_files[0]
 
-    # Read input
-    try:
-        with open(input_file, 'r') as f:
-            color_data = json.load(f)
-    except FileNotFoundError:
-        raise FileNotFoundError(f"Error: {input_file} not found.")
-
-    # Extract colors
+def branding_colors(color_data):
+    """Primary, secondary and accent color from color definitions (with defaults)."""
     branding = color_data.get("design", {}).get("branding", {})
-    primary_color = branding.get("primary_color", "#FF5733")
-    secondary_color = branding.get("secondary_color", "#C70039")
-    accent_color = branding.get("accent_color", "#900C3F")
+    return (branding.get("primary_color", "#FF5733"),
+            branding.get("secondary_color", "#C70039"),
+            branding.get("accent_color", "#900C3F"))
 
-    # Calculate HSV for primary_color
-    rgb = hex_to_rgb(primary_color)
-    h, s, v = rgb_to_hsv(*rgb)
+def interpreted_output(primary_color, secondary_color, accent_color, rgb, s, v):
+    """Assemble interpreted_colors.json from the colors and the HSV saturation/value of primary_color."""
     gradient_type = "vertical" if v < 0.3 else "horizontal"
     style_recommendation = "stylish" if s > 0.5 else "classic"
 
     # Generate image frame gradient
     image_frame_gradient = f"linear-gradient(to top, {accent_color}, transparent)"
 
-    # Output
-    output = {
+    return {
         "colors": {
             "primary_color": primary_color,
             "secondary_color": secondary_color,
@@ -63,15 +62,134 @@ def interpret_colors(project_name):
         }
     }
 
+def build_interpreted_colors(color_data):
+    """Derive the interpreted colors (HSV-based gradient/style recommendation) from color definitions."""
+    primary_color, secondary_color, accent_color = branding_colors(color_data)
+
+    # Calculate HSV for primary_color
+    rgb = hex_to_rgb(primary_color)
+    h, s, v = rgb_to_hsv(*rgb)
+    return interpreted_output(primary_color, secondary_color, accent_color, rgb, s, v)
+
+def build_interpreted_colors_batch(color_data_list):
+    """
+    Same as build_interpreted_colors for many projects at once.
+    With NumPy, saturation and value of all primary colors are computed as arrays in one go
+    (same operation order as colorsys, so the decisions are identical).
+    """
+    colors = [branding_colors(color_data) for color_data in color_data_list]
+    rgbs = [hex_to_rgb(primary_color) for primary_color, _, _ in colors]
+    if np is not None and rgbs:
+        scaled = np.array(rgbs, dtype=np.float64) / 255.0
+        maxc = scaled.max(axis=1)
+        minc = scaled.min(axis=1)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            saturation = np.where(maxc > 0, (maxc - minc) / maxc, 0.0)
+        sv_pairs = zip(saturation.tolist(), maxc.tolist())
+    else:
+        sv_pairs = (rgb_to_hsv(*rgb)[1:] for rgb in rgbs)
+    return [interpreted_output(primary_color, secondary_color, accent_color, rgb, s, v)
+            for (primary_color, secondary_color, accent_color), rgb, (s, v) in zip(colors, rgbs, sv_pairs)]
+
+def interpret_colors(project_name, force=False):
+    """Interpret colors from color_definitions.json and generate interpreted_colors.json."""
+    project_dir = f"content/{project_name}"
+    input_file = find_color_definitions(project_dir)
+    output_file = f"{project_dir}/interpreted_colors.json"
+
+    # Skip if inputs (color definitions + this script) are unchanged since the last run
+    cache = BuildCache(project_dir)
+    cache_key = cache.stage_key("interpret_colors", [input_file, __file__])
+    if not force and cache.is_fresh("interpret_colors", cache_key):
+        cache.save()
+        record_stage(project_dir, "interpret_colors", cache_key, cache.outputs("interpret_colors"))
+        print(f"   - ⏭️ interpret_colors: inputs unchanged for {project_name}, skipping.")
+        return
+
+    # Read input
+    try:
+        color_data = load_color_data(input_file)
+    except FileNotFoundError:
+        raise FileNotFoundError(f"Error: {input_file} not found.")
+
+    output = build_interpreted_colors(color_data)
+
     # Ensure project directory exists
     os.makedirs(project_dir, exist_ok=True)
 
     # Write output
     with open(output_file, 'w') as f:
         json.dump(output, f, indent=2)
+    cache.record("interpret_colors", cache_key, [output_file])
+    record_stage(project_dir, "interpret_colors", cache_key, [output_file])
+
+def load_color_data(input_file):
+    """
+    Read color definitions and check that the primary color is a valid hex color.
+    Raises ValueError for broken JSON or malformed colors, so one bad project can be skipped on its own.
+    """
+    with open(input_file, 'r') as f:
+        try:
+            color_data = json.load(f)
+        except json.JSONDecodeError as e:
+            raise ValueError(f"{input_file}: invalid JSON ({e})")
+    if not isinstance(color_data, dict):
+        raise ValueError(f"{input_file}: expected a JSON object")
+    try:
+        primary_color = branding_colors(color_data)[0]
+    except AttributeError:
+        raise ValueError(f"{input_file}: 'design'/'branding' must be JSON objects")
+    try:
+        valid = isinstance(primary_color, str) and len(primary_color.lstrip('#')) == 6 and hex_to_rgb(primary_color)
+    except ValueError:
+        valid = False
+    if not valid:
+        raise ValueError(f"{input_file}: malformed primary_color {primary_color!r}")
+    return color_data
+
+def interpret_colors_batch(content_dir="content", force=False):
+    """Interpret colors for every project under content/ in one pass (one process, one vectorized HSV step)."""
+    jobs = []
+    for project_path in discover_projects(content_dir):
+        project_dir = str(project_path)
+        try:
+            input_file = find_color_definitions(project_dir)
+        except FileNotFoundError:
+            continue
+        cache = BuildCache(project_dir)
+        cache_key = cache.stage_key("interpret_colors", [input_file, __file__])
+        if not force and cache.is_fresh("interpret_colors", cache_key):
+            cache.save()
+            record_stage(project_dir, "interpret_colors", cache_key, cache.outputs("interpret_colors"))
+            continue
+        # Validate per project before the shared NumPy step: a malformed project is skipped, not the whole batch
+        try:
+            color_data = load_color_data(input_file)
+        except ValueError as e:
+            cache.save()
+            record_stage(project_dir, "interpret_colors", cache_key, error=str(e))
+            print(f"   - ⚠️ interpret_colors: skipping {os.path.basename(project_dir)}: {e}")
+            continue
+        jobs.append((project_dir, cache, cache_key, color_data))
+
+    outputs = build_interpreted_colors_batch([color_data for _, _, _, color_data in jobs])
+    for (project_dir, cache, cache_key, _), output in zip(jobs, outputs):
+        output_file = f"{project_dir}/interpreted_colors.json"
+        with open(output_file, 'w') as f:
+            json.dump(output, f, indent=2)
+        cache.record("interpret_colors", cache_key, [output_file])
+        record_stage(project_dir, "interpret_colors", cache_key, [output_file])
+    print(f"   - 🎨 interpret_colors: {len(outputs)} project(s) written ({'NumPy' if np is not None else 'pure Python'}).")
+    return [project_dir for project_dir, _, _, _ in jobs]
 
 if __name__ == "__main__":
     parser = argparse.ArgumentParser(description="Interpret colors for a project.")
-    parser.add_argument("--project", required=True, help="Project name (e.g., content_template_new_project)")
+    target = parser.add_mutually_exclusive_group(required=True)
+    target.add_argument("--project", help="Project name (e.g., content_template_new_project)")
+    target.add_argument("--all", action="store_true", help="Batch mode: every project under content/ with a *_color_definitions.json")
+    parser.add_argument("--force", action="store_true", help="Ignore the build cache and always rewrite outputs")
     args = parser.parse_args()
-    interpret_colors(args.project)
\ No newline at end of file
+    if args.all:
+        interpret_colors_batch(force=args.force)
+    else:
+        interpret_colors(args.project, force=args.force)
\ No newline at end of file
@@ -2,7 +2,15 @@ import json
 import csv
 import os
 import argparse
+import sys
 from datetime import datetime
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).parent))
+from build_cache import BuildCache
+from color_contrast import WCAG_AA_NORMAL, contrast_ratio, parse_hex, repair_contrast
+from style_modulator import compile_modulator
+from project_state import record_stage
 
 
 def read_csv(file_path):
@@ -12,23 +20,24 @@ def read_csv(file_path):
         return list(reader)
 
 
-def calculate_contrast(bg_color, text_color):
-    """Calculate WCAG contrast ratio (simplified)."""
-    def luminance(color):
-        r, g, b = [int(color.lstrip('#')[i:i+2], 16) / 255.0 for i in (0, 2, 4)]
-        return 0.299 * r + 0.587 * g + 0.114 * b
-    bg_lum = luminance(bg_color)
-    text_lum = luminance(text_color)
-    contrast = (max(bg_lum, text_lum) + 0.05) / (min(bg_lum, text_lum) + 0.05)
-    return contrast
-
-def interpret_styles(project_name):
+def interpret_styles(project_name, force=False):
     """Interpret styles and generate interpreted_styles_<variant>.json and interpreted_text_colors.json."""
     project_dir = f"content/{project_name}"
     colors_file = f"{project_dir}/interpreted_colors.json"
     layout_file = f"{project_dir}/layout_extended_v2.csv"
     style_modulator_file = "templates/components/style_modulator.json"
     config_file = f"{project_dir}/customer_style_config.json"
+    layout_rules_file = f"{project_dir}/layout_rules.json"
+
+    # Skip if all inputs (and this script) are unchanged since the last run
+    cache = BuildCache(project_dir)
+    code_files = [__file__] + [str(Path(__file__).parent / name) for name in ("color_contrast.py", "style_modulator.py")]
+    cache_key = cache.stage_key("interpret_styles", [colors_file, layout_file, style_modulator_file, config_file, layout_rules_file] + code_files)
+    if not force and cache.is_fresh("interpret_styles", cache_key):
+        cache.save()
+        record_stage(project_dir, "interpret_styles", cache_key, cache.outputs("interpret_styles"))
+        print(f"   - ⏭️ interpret_styles: inputs unchanged for {project_name}, skipping.")
+        return
 
     # Read inputs
     try:
@@ -42,94 +51,137 @@ def interpret_styles(project_name):
     except FileNotFoundError as e:
         raise FileNotFoundError(f"Error: {e.filename} not found.")
 
-
     # Read layout_rules.json
-    with open(f"{project_dir}/layout_rules.json", 'r') as f:
+    with open(layout_rules_file, 'r') as f:
         layout_rules = json.load(f)
 
+    styles_output, text_colors = build_styles(colors, layout_data, style_modulator, config, layout_rules)
+    outputs = write_styles(project_dir, styles_output, text_colors)
+    cache.record("interpret_styles", cache_key, outputs)
+    record_stage(project_dir, "interpret_styles", cache_key, outputs)
+
+
+class LayoutRow:
+    """One compiled layout row: typed order and the precomputed per-row facts."""
+
+    __slots__ = ("component", "order", "styling_default", "bg_index", "last_before_footer", "fixed")
+
+    def __init__(self, component, order, styling_default, bg_index, last_before_footer, fixed):
+        self.component = component
+        self.order = order
+        self.styling_default = styling_default
+        self.bg_index = bg_index
+        self.last_before_footer = last_before_footer
+        self.fixed = fixed
+
+
+class LayoutPlan:
+    """The layout CSV compiled once: rows plus max order, enabled count and parity."""
+
+    __slots__ = ("rows", "max_order", "enabled_count", "odd_enabled")
+
+    def __init__(self, rows, max_order, enabled_count):
+        self.rows = rows
+        self.max_order = max_order
+        self.enabled_count = enabled_count
+        self.odd_enabled = enabled_count % 2 == 1
+
+
+def compile_layout(layout_data, fixed_layouts):
+    """Compile the layout rows (list of CSV dicts) into a LayoutPlan in two linear passes."""
+    orders = [int(row["order"]) for row in layout_data]
+    max_order = max(orders, default=0)
+    enabled_count = sum(1 for row in layout_data if row["enabled"].lower() == "true")
+    rows = []
+    for row, order in zip(layout_data, orders):
+        component = row["component"]
+        rows.append(LayoutRow(
+            component=component,
+            order=order,
+            styling_default=row["styling_default"],
+            bg_index=0 if order % 2 == 0 else 1,
+            last_before_footer=order == max_order and component != "footer",
+            fixed=fixed_layouts.get(component),
+        ))
+    return LayoutPlan(rows, max_order, enabled_count)
+
+
+def build_styles(colors, layout_data, style_modulator, config, layout_rules):
+    """Compute the per-variant component styles and the text colors (no file access)."""
     # Get preferred variants
     preferred_variants = config.get("preferred_variants", ["classic", "stylish", "classic_accents", "hyper_stylish"])
 
-    # Process styles for each variant
-    styles_output = {}
-    text_colors = {}
-    fixed_layouts = layout_rules.get("fixed_layouts", {})
+    # Color tokens in style_modulator and fixed layouts resolved once per palette (cached by palette hash)
+    modulator = compile_modulator(style_modulator, colors, layout_rules)
+    plan = compile_layout(layout_data, modulator.fixed_layouts)
     footer_bg = colors["primary_color"]  # Assume footer uses primary_color
+    light_footer = sum(parse_hex(footer_bg)) / 3 / 255 > 0.5
+    variants = [(variant, modulator.variant(variant)) for variant in preferred_variants]
 
-    for variant in preferred_variants:
-        styles = {}
-        variant_styles = style_modulator["variants"].get(variant, {})
-        alt_backgrounds = variant_styles.get("alternating_backgrounds", ["#FFFFFF", "#F5F5F5"])
-        element_styles = variant_styles.get("element_styles", {})
-
-        for row in layout_data:
-            component = row["component"]
-            order = int(row["order"])
-
+    # Style all variants in a single pass over the plan
+    styles_output = {variant: {"styles": {}} for variant, _ in variants}
+    text_colors = {}
+    for row in plan.rows:
+        component = row.component
+        for variant, compiled in variants:
             # Apply fixed layout if exists
-            if component in fixed_layouts:
-                style = fixed_layouts[component].copy()
-                for key, value in style.items():
-                    style[key] = value.replace("{{colors.gradient_type}}", colors["gradient_type"]).replace("{{colors.primary_color}}", colors["primary_color"]).replace("{{colors.secondary_color}}", colors["secondary_color"])
+            if row.fixed is not None:
+                style = row.fixed.copy()
             else:
                 # Alternating layouts
-                #is_last_before_footer = (order == max(int(r["order"]) for r in layout_data if r["enabled"].lower() == "true") and component != "footer")
-                is_last_before_footer = (order == max(int(r["order"]) for r in layout_data) and component != "footer")
-                bg_index = 0 if order % 2 == 0 else 1
-                bg_color = alt_backgrounds[bg_index]
-                if is_last_before_footer and len([r for r in layout_data if r["enabled"].lower() == "true"]) % 2 == 1:
+                bg_color = compiled.alternating_backgrounds[row.bg_index]
+                if row.last_before_footer and plan.odd_enabled and light_footer:
                     # Ungerade Anzahl: last module before footer
-                    footer_lum = sum(hex_to_rgb(footer_bg)) / 3 / 255
-                    if footer_lum > 0.5:  # Light footer
-                        bg_color = "#FFFFFF" if variant in ["classic", "classic_accents"] else bg_color.replace("{{colors.accent_color_rgb}}", ",".join(map(str, colors["accent_color_rgb"])))
+                    if variant in ["classic", "classic_accents"]:
+                        bg_color = "#FFFFFF"
 
                 style = {
                     "gradient_type": "none",
                     "background_color": bg_color,
-                    "class": row["styling_default"],
-                    "image_frame": element_styles.get("image_frame", {}).get("style", "none"),
-                    "card_style": element_styles.get("card", {}).get("style", "none"),
-                    "button_style": element_styles.get("button", {}).get("style", "none")
+                    "class": row.styling_default,
+                    "image_frame": compiled.image_frame,
+                    "card_style": compiled.card_style,
+                    "button_style": compiled.button_style
                 }
 
-            styles[component] = style
+            styles_output[variant]["styles"][component] = style
 
             # Calculate text colors
-            bg_color = style["background_color"].replace("rgba({{colors.accent_color_rgb}}, 0.2)", f"#{colors['accent_color'][:7]}").replace("rgba({{colors.accent_color_rgb}}, 0.3)", f"#{colors['accent_color'][:7]}")
-            default_color = "#000000" if calculate_contrast(bg_color, "#000000") > 4.5 else "#FFFFFF"
+            bg_color = modulator.contrast_background(style["background_color"])
+            # WCAG contrast (sRGB relative luminance, memoized per color pair)
+            default_color = "#000000" if contrast_ratio(bg_color, "#000000") > WCAG_AA_NORMAL else "#FFFFFF"
             heading_color = default_color
+            # Accent headings are shifted in lightness until they reach 4.5:1 on the section background
             if variant == "stylish" or variant == "hyper_stylish":
                 if bg_color in ["#FFFFFF", "#F5F5F5"]:  # White or gray modules
-                    heading_color = colors["accent_color"]
+                    heading_color = repair_contrast(bg_color, colors["accent_color"])
             elif variant == "classic_accents":
-                heading_color = colors["accent_color"]
+                heading_color = repair_contrast(bg_color, colors["accent_color"])
 
             text_colors[component] = {"default": default_color, "heading": heading_color}
 
-        styles_output[variant] = {"styles": styles}
+    return styles_output, text_colors
 
-    # Write outputs
+
+def write_styles(project_dir, styles_output, text_colors, timestamp=None):
+    """Write interpreted_styles_<variant>_<timestamp>.json and interpreted_text_colors_<timestamp>.json."""
     os.makedirs(project_dir, exist_ok=True)
-    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+    timestamp = timestamp or datetime.now().strftime("%Y%m%d_%H%M%S")
 
+    outputs = []
     for variant, data in styles_output.items():
-        with open(f"{project_dir}/interpreted_styles_{variant}_{timestamp}.json", 'w') as f:
+        outputs.append(f"{project_dir}/interpreted_styles_{variant}_{timestamp}.json")
+        with open(outputs[-1], 'w') as f:
             json.dump(data, f, indent=2)
-    with open(f"{project_dir}/interpreted_text_colors_{timestamp}.json", 'w') as f:
+    outputs.append(f"{project_dir}/interpreted_text_colors_{timestamp}.json")
+    with open(outputs[-1], 'w') as f:
         json.dump({"text_colors": text_colors}, f, indent=2)
+    return outputs
 
 
-
-
-
-
-def hex_to_rgb(hex_color):
-    """Convert hex color to RGB tuple."""
-    hex_color = hex_color.lstrip('#')
-    return tuple(int(hex_color[i:i+2], 16) for i in (0, 2, 4))
-
 if __name__ == "__main__":
     parser = argparse.ArgumentParser(description="Interpret styles for a project.")
     parser.add_argument("--project", required=True, help="Project name (e.g., content_template_new_project)")
+    parser.add_argument("--force", action="store_true", help="Ignore the build cache and always rewrite outputs")
     args = parser.parse_args()
-    interpret_styles(args.project)
\ No newline at end of file
+    interpret_styles(args.project, force=args.force)
\ No newline at end of file
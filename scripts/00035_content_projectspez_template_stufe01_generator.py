@@ -7,66 +7,70 @@ import logging
 import argparse
 import sys
 
-# ... (Der obere Teil mit argparse und der Pfad-Abfrage bleibt exakt gleich) ...
-# START COPY-PASTE HIER
+# Import der Template-Engine (Listen-Index)
+sys.path.append(str(Path(__file__).parent))
+from template_engine import index_list_blocks
+from build_cache import BuildCache, component_template_files
+from project_state import record_stage
 
 # ==============================================================================
-# 1. INTERAKTIVE & DYNAMISCHE PROJEKTPFAD-ERMITTLUNG
-# ==============================================================================
-parser = argparse.ArgumentParser(
-    description="Generiert ein maßgeschneidertes Content-Template für ein spezifisches Projekt.",
-    formatter_class=argparse.RawTextHelpFormatter
-)
-parser.add_argument(
-    "project_path", type=str, nargs="?",
-    help="Der vollständige Pfad zum Projektordner.\n"
-         "Dieser Ordner muss eine 'layout_extended_v2.csv' enthalten.\n"
-         "Beispielaufruf: python content_generator.py /pfad/zum/projekt"
-)
-args = parser.parse_args()
-
-if args.project_path:
-    project_path_str = args.project_path
-    print(f"Projektpfad '{project_path_str}' wurde über Kommandozeile erkannt.")
-else:
-    print("="*60, "\nINTERAKTIVER MODUS: KEIN PROJEKTPFAD ANGEGEBEN\n", "="*60)
-    print("Dieses Skript benötigt den Pfad zu einem Projektordner.")
-    print("Der angegebene Ordner muss eine 'layout_extended_v2.csv' enthalten.\n")
-    project_path_str = input("Bitte geben Sie jetzt den vollständigen Pfad zum Projektordner ein und drücken Sie Enter:\n> ")
-
-PROJECT_DIR = Path(project_path_str).resolve()
-
-if not PROJECT_DIR.is_dir():
-    print(f"\nFEHLER: Der angegebene Pfad '{PROJECT_DIR}' ist kein gültiger Ordner.")
-    sys.exit(1)
-
-CSV_LAYOUT_PATH = PROJECT_DIR / 'layout_extended_v2.csv'
-if not CSV_LAYOUT_PATH.exists():
-    print(f"\nFEHLER: Im Ordner '{PROJECT_DIR}' wurde keine 'layout_extended_v2.csv' gefunden.")
-    sys.exit(1)
-
-print(f"Verarbeite Projekt in: {PROJECT_DIR}\n")
-
-# ==============================================================================
-# 2. KONFIGURATION & PFADE
+# 1. KONFIGURATION & PFADE
 # ==============================================================================
 SCRIPT_DIR = Path(__file__).parent.resolve()
 BASE_DIR = SCRIPT_DIR.parent
 TEMPLATES_DIR = BASE_DIR / 'templates/components'
 
 # NEU: Angepasster Output-Dateiname und Speicherort
+# Die Datei wird direkt im Projektordner gespeichert, nicht in einem 'output' Unterordner.
 OUTPUT_FILENAME_PREFIX = 'project_template_Stufe01_Anleitung'
-# Die Datei wird jetzt direkt im Projektordner gespeichert, nicht in einem 'output' Unterordner.
-OUTPUT_DIR = PROJECT_DIR 
-
-logging.basicConfig(
-    filename=OUTPUT_DIR / 'content_generator.log',
-    level=logging.INFO,
-    format='%(asctime)s - %(levelname)s - %(message)s',
-    filemode='w'
-)
+GENERATOR_VERSION = "v5.2-final-audited-fix"
+CACHE_STAGE = "content_template_stufe01"
+
 placeholder_pattern = re.compile(r'\{\{([^}]+)\}\}')
 
+# ==============================================================================
+# 2. INTERAKTIVE & DYNAMISCHE PROJEKTPFAD-ERMITTLUNG
+# ==============================================================================
+def resolve_project_dir(argv=None):
+    """Liest Projektpfad und Optionen von der Kommandozeile (oder interaktiv) und prüft den Ordner."""
+    parser = argparse.ArgumentParser(
+        description="Generiert ein maßgeschneidertes Content-Template für ein spezifisches Projekt.",
+        formatter_class=argparse.RawTextHelpFormatter
+    )
+    parser.add_argument(
+        "project_path", type=str, nargs="?",
+        help="Der vollständige Pfad zum Projektordner.\n"
+             "Dieser Ordner muss eine 'layout_extended_v2.csv' enthalten.\n"
+             "Beispielaufruf: python content_generator.py /pfad/zum/projekt"
+    )
+    parser.add_argument(
+        "--force", action="store_true",
+        help="Build-Cache ignorieren und das Template immer neu schreiben."
+    )
+    args = parser.parse_args(argv)
+
+    if args.project_path:
+        project_path_str = args.project_path
+        print(f"Projektpfad '{project_path_str}' wurde über Kommandozeile erkannt.")
+    else:
+        print("="*60, "\nINTERAKTIVER MODUS: KEIN PROJEKTPFAD ANGEGEBEN\n", "="*60)
+        print("Dieses Skript benötigt den Pfad zu einem Projektordner.")
+        print("Der angegebene Ordner muss eine 'layout_extended_v2.csv' enthalten.\n")
+        project_path_str = input("Bitte geben Sie jetzt den vollständigen Pfad zum Projektordner ein und drücken Sie Enter:\n> ")
+
+    project_dir = Path(project_path_str).resolve()
+
+    if not project_dir.is_dir():
+        print(f"\nFEHLER: Der angegebene Pfad '{project_dir}' ist kein gültiger Ordner.")
+        sys.exit(1)
+
+    if not (project_dir / 'layout_extended_v2.csv').exists():
+        print(f"\nFEHLER: Im Ordner '{project_dir}' wurde keine 'layout_extended_v2.csv' gefunden.")
+        sys.exit(1)
+
+    print(f"Verarbeite Projekt in: {project_dir}\n")
+    return project_dir, args.force
+
 # ==============================================================================
 # 3. HELFERFUNKTIONEN (unverändert)
 # ==============================================================================
@@ -101,26 +105,21 @@ def get_definition_for_placeholder(placeholder, definitions, use_example_values=
 # ==============================================================================
 
 
-def generate_content_template():
-    logging.info(f"Starte Content-Generierungsprozess für Projekt: {PROJECT_DIR}")
+def load_layout(csv_layout_path):
+    """Liest die Layout-CSV eines Projekts (Leerzeilen werden ignoriert)."""
+    with open(csv_layout_path, 'r', encoding='utf-8') as f:
+        reader = csv.DictReader(line for line in f if line.strip())
+        return [row for row in reader]
 
-    # --- Schritt 1: Projekt-Layout laden ---
-    try:
-        with open(CSV_LAYOUT_PATH, 'r', encoding='utf-8') as f:
-            reader = csv.DictReader(line for line in f if line.strip())
-            layout = [row for row in reader]
-        logging.info(f"Projekt-Layout-CSV '{CSV_LAYOUT_PATH}' erfolgreich geladen.")
-    except Exception as e:
-        logging.error(f"FEHLER beim Lesen der CSV-Datei: {e}")
-        print(f"FEHLER beim Lesen der CSV-Datei: {e}")
-        return
 
+def build_content_template(layout, layout_source):
+    """Baut das Stufe01-Template (Python-Objekt) aus den Layout-Zeilen, ohne Dateien zu schreiben."""
     # --- Schritt 2: JSON-Grundstruktur aufbauen ---
     content = {
         "metadata": {
             "generated_at": datetime.now().isoformat(),
-            "generator_version": "v5.2-final-audited-fix", # Versionsnummer erhöht
-            "layout_source": str(CSV_LAYOUT_PATH)
+            "generator_version": GENERATOR_VERSION, # Versionsnummer erhöht
+            "layout_source": str(layout_source)
         },
         "page_content": {}
     }
@@ -142,6 +141,15 @@ def generate_content_template():
         html_content = html_path.read_text(encoding='utf-8')
         all_placeholders = set(p.strip() for p in placeholder_pattern.findall(html_content))
 
+        # Listen-Blöcke einmal pro Komponente indizieren (statt pro Instanz neue Regex-Suchen)
+        list_index = index_list_blocks(html_content)
+        component_lists = []
+        for full_list_marker, blocks in sorted(list_index.by_marker.items(), key=lambda entry: entry[1][0].start):
+            component_prefix, _, list_name = full_list_marker.partition('.')
+            if component_prefix != component or not list_name or '.' in list_name:
+                continue
+            component_lists.append((list_name, full_list_marker, set(blocks[0].placeholders)))
+
         # --- Schritt 3b: Instanzen basierend auf 'max_count' erstellen ---
         instance_count = int(row.get('max_count', 0))
         if instance_count == 0:
@@ -153,22 +161,12 @@ def generate_content_template():
             instance_content = {}
             processed_placeholders = set()
 
-            # --- Schritt 3c: Listen speziell behandeln (KORRIGIERT) ---
-            # KORREKTUR: Der Regex sucht jetzt nach dem Format `component_name.list_name`
-            list_marker_pattern = re.compile(rf'BEGIN_LIST_ITEM:{re.escape(component)}\.([\w_]+)')
-            
-            for list_name_match in list_marker_pattern.finditer(html_content):
-                list_name = list_name_match.group(1) # Nur der reine Listenname (z.B. 'values_list')
-                full_list_marker = f"{component}.{list_name}" # Der volle Marker (z.B. 'culture_section.values_list')
-
+            # --- Schritt 3c: Listen speziell behandeln (aus dem vorindizierten Listen-Index) ---
+            for list_name, full_list_marker, list_item_placeholders in component_lists:
+                # list_name ist der reine Listenname (z.B. 'values_list'),
+                # full_list_marker der volle Marker (z.B. 'culture_section.values_list')
                 list_item_count = int(row.get('max_list_items', 0))
                 list_content = []
-                
-                list_block_pattern = re.compile(rf'<!-- BEGIN_LIST_ITEM:{re.escape(full_list_marker)} -->(.*?)<!-- END_LIST_ITEM:{re.escape(full_list_marker)} -->', re.DOTALL)
-                list_block_match = list_block_pattern.search(html_content)
-                if not list_block_match: continue
-                
-                list_item_placeholders = set(placeholder_pattern.findall(list_block_match.group(1)))
 
                 for j in range(1, list_item_count + 1):
                     list_item_content = {}
@@ -197,24 +195,67 @@ def generate_content_template():
 
             content["page_content"][component].append(instance_content)
 
+    return content
+
+
+def write_content_template(project_dir, content, timestamp=None):
+    """Speichert das Stufe01-Template als project_template_Stufe01_Anleitung_<timestamp>.json."""
+    timestamp = timestamp or datetime.now().strftime("%Y%m%d_%H%M%S")
+    output_path = Path(project_dir) / f'{OUTPUT_FILENAME_PREFIX}_{timestamp}.json'
+    with open(output_path, 'w', encoding='utf-8') as f:
+        json.dump(content, f, indent=2, ensure_ascii=False)
+    return output_path
+
+
+def generate_content_template(project_dir, force=False):
+    logging.info(f"Starte Content-Generierungsprozess für Projekt: {project_dir}")
+    csv_layout_path = project_dir / 'layout_extended_v2.csv'
+
+    # --- Schritt 0: Build-Cache prüfen (Layout, Komponenten-Templates, dieses Skript) ---
+    cache = BuildCache(project_dir)
+    cache_key = cache.stage_key(CACHE_STAGE, [csv_layout_path, Path(__file__), *component_template_files(TEMPLATES_DIR)])
+    if not force and cache.is_fresh(CACHE_STAGE, cache_key):
+        cache.save()
+        record_stage(project_dir, CACHE_STAGE, cache_key, cache.outputs(CACHE_STAGE))
+        logging.info("Inputs unverändert, Stufe01-Template wird nicht neu geschrieben.")
+        print(f"Inputs unverändert, überspringe. Aktuelles Template: {cache.outputs(CACHE_STAGE)[0].name}")
+        return
+
+    # --- Schritt 1: Projekt-Layout laden ---
+    try:
+        layout = load_layout(csv_layout_path)
+        logging.info(f"Projekt-Layout-CSV '{csv_layout_path}' erfolgreich geladen.")
+    except Exception as e:
+        logging.error(f"FEHLER beim Lesen der CSV-Datei: {e}")
+        print(f"FEHLER beim Lesen der CSV-Datei: {e}")
+        record_stage(project_dir, CACHE_STAGE, cache_key, error=f"CSV: {e}")
+        return
+
+    content = build_content_template(layout, csv_layout_path)
+
     # --- Schritt 4: Finale JSON-Datei speichern (unverändert) ---
-    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-    output_filename = f'{OUTPUT_FILENAME_PREFIX}_{timestamp}.json'
-    output_path = OUTPUT_DIR / output_filename
-    
     try:
-        with open(output_path, 'w', encoding='utf-8') as f:
-            json.dump(content, f, indent=2, ensure_ascii=False)
+        output_path = write_content_template(project_dir, content)
+        cache.record(CACHE_STAGE, cache_key, [output_path])
+        record_stage(project_dir, CACHE_STAGE, cache_key, [output_path])
         logging.info(f"Prozess abgeschlossen. Template wurde hier gespeichert: '{output_path}'")
         print(f"Prozess erfolgreich abgeschlossen. Output in '{output_path}'")
     except Exception as e:
         logging.error(f"FEHLER beim Schreiben der JSON-Datei: {e}")
         print(f"FEHLER beim Schreiben der JSON-Datei: {e}")
+        record_stage(project_dir, CACHE_STAGE, cache_key, error=f"JSON: {e}")
 
 
 # ==============================================================================
 # 5. SKRIPT AUSFÜHREN
 # ==============================================================================
 if __name__ == "__main__":
-    generate_content_template()
+    PROJECT_DIR, force = resolve_project_dir()
+    logging.basicConfig(
+        filename=PROJECT_DIR / 'content_generator.log',
+        level=logging.INFO,
+        format='%(asctime)s - %(levelname)s - %(message)s',
+        filemode='w'
+    )
+    generate_content_template(PROJECT_DIR, force=force)
 
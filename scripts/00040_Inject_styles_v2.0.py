@@ -1,21 +1,42 @@
+import hashlib
 import json
 import os
 import argparse
 from datetime import datetime
-import copy
+import sys
 from pathlib import Path
 
-def find_newest_file(directory, pattern):
-    """Findet die neueste Datei in einem Ordner, die einem Muster entspricht."""
-    files = list(directory.glob(pattern))
-    if not files:
-        return None
-    return max(files, key=lambda f: f.stat().st_mtime)
+sys.path.append(str(Path(__file__).parent))
+from build_cache import BuildCache
+from project_index import get_project_index
+from content_overlay import build_overlay, styled_view
+from project_state import record_stage
 
-def inject_styles(project_name):
+STYLE_VARIANTS = ["classic", "classic_accents", "stylish", "hyper_stylish"]
+GENERATOR_VERSION = "v2.0-structured-injector"
+
+def inject_variant(base_template, styles_data, variant):
+    """
+    Stufe02-Sicht einer Style-Variante über dem Stufe01-Template (ohne Dateizugriff).
+    Keine tiefe Kopie mehr: die Sicht teilt alle Teilbäume mit der Basis und ist read-only,
+    nur die Style-Felder pro Komponente werden neu angelegt.
+    """
+    return styled_view(base_template, styles_data, variant, GENERATOR_VERSION)
+
+def write_variant(project_dir, variant, output_template, timestamp=None):
+    """Schreibt die Stufe02-Datei einer Variante und gibt ihren Pfad zurück."""
+    timestamp = timestamp or datetime.now().strftime("%Y%m%d_%H%M%S")
+    output_filename = f"project_template_Stufe02_Styled_{variant}_{timestamp}.json"
+    output_path = project_dir / output_filename
+    
+    with output_path.open('w', encoding='utf-8') as f:
+        json.dump(output_template, f, indent=2, ensure_ascii=False)
+    return output_path
+
+def inject_styles(project_name, force=False):
     """
     Liest das neueste 'Stufe01'-Template, injiziert die vier Style-Varianten
-    und erzeugt für jede Variante eine 'Stufe02'-Datei.
+    und erzeugt für jede Variante eine 'Stufe02'-Datei (Overlay über der Stufe01-Basis).
     """
     print(f"--- STARTING INJECTOR V2.0 für Projekt: {project_name} ---")
     
@@ -23,16 +44,19 @@ def inject_styles(project_name):
     base_dir = Path(__file__).resolve().parent.parent
     project_dir = base_dir / "content" / project_name
 
+    # Ein Verzeichnis-Scan für alle Suchen (neueste Generation nach Zeitstempel im Dateinamen)
+    project_index = get_project_index(project_dir)
+
     # Finde die neueste Stufe01-Template-Datei
-    template_file = find_newest_file(project_dir, "project_template_Stufe01_Anleitung_*.json")
+    template_file = project_index.latest("project_template_Stufe01_Anleitung")
     if not template_file:
         raise FileNotFoundError(f"Error: Keine 'project_template_Stufe01_...' Datei in {project_dir} gefunden.")
     
     print(f"   - ℹ️ Verarbeite Template: {template_file.name}")
 
     # Lese die Basis-Dateien dynamisch
-    colors_file = find_newest_file(project_dir, "interpreted_colors*.json")
-    text_colors_file = find_newest_file(project_dir, "interpreted_text_colors*.json")
+    colors_file = project_index.latest("interpreted_colors")
+    text_colors_file = project_index.latest("interpreted_text_colors")
 
     # Prüfe, ob alle notwendigen Dateien gefunden wurden
     if not all([template_file, colors_file, text_colors_file]):
@@ -40,20 +64,34 @@ def inject_styles(project_name):
         print(f"   - ❌ FEHLER: Folgende Input-Dateien konnten nicht gefunden werden: {', '.join(missing)}")
         return
 
+    # Build-Cache: Stufe01, Farben und alle Style-Dateien unverändert -> nichts zu tun
+    styles_files = {variant: project_index.latest("interpreted_styles", variant) for variant in STYLE_VARIANTS}
+    cache = BuildCache(project_dir)
+    cache_inputs = [template_file, colors_file, text_colors_file, Path(__file__)] + [f for f in styles_files.values() if f]
+    cache_key = cache.stage_key("inject_styles", cache_inputs, extra=sorted(v for v, f in styles_files.items() if f))
+    if not force and cache.is_fresh("inject_styles", cache_key):
+        cache.save()
+        record_stage(project_dir, "inject_styles", cache_key, cache.outputs("inject_styles"))
+        print("   - ⏭️ Inputs unverändert, Stufe02-Dateien sind aktuell. Überspringe.")
+        return
+
     try:
-        with template_file.open('r', encoding='utf-8') as f:
-            base_template = json.load(f)
+        base_bytes = template_file.read_bytes()
+        base_template = json.loads(base_bytes)
     except json.JSONDecodeError as e:
         print(f"   - ❌ FEHLER beim Parsen von {template_file.name}: {e}")
+        record_stage(project_dir, "inject_styles", cache_key, error=f"{template_file.name}: {e}")
         return
 
 
+    base_sha256 = hashlib.sha256(base_bytes).hexdigest()
+
     # Verarbeite jede der vier Styling-Varianten
-    variants = ["classic", "classic_accents", "stylish", "hyper_stylish"]
-    for variant in variants:
+    outputs = []
+    for variant in STYLE_VARIANTS:
         print(f"   - 💉 Injiziere Style-Variante: '{variant}'")
         
-        styles_file = find_newest_file(project_dir, f"interpreted_styles_{variant}*.json")
+        styles_file = styles_files[variant]
         if not styles_file:
             print(f"   - ⚠️ WARNUNG: Style-Datei für '{variant}' nicht gefunden. Überspringe.")
             continue
@@ -66,43 +104,15 @@ def inject_styles(project_name):
             print(f"   - ❌ FEHLER beim Laden der Style-Datei {styles_file.name}: {e}")
             continue
 
-        # Erstelle eine tiefe Kopie für jede Variante, um Seiteneffekte zu vermeiden
-        output_template = copy.deepcopy(base_template)
-
-        # Füge die Style-Informationen in jede Instanz jeder Komponente ein
-        if "page_content" in output_template:
-            for component_name, instances in output_template["page_content"].items():
-                if component_name in styles_data:
-                    component_style = styles_data[component_name]
-                    
-                    # Iteriere durch jede Instanz der Komponente
-                    for instance in instances:
-                        # Füge die Style-Werte direkt in das Instanz-Objekt ein
-                        if "class" in component_style:
-                            instance["styling_default"] = {"description": "CSS-Klasse für das Haupt-Styling.", "value": component_style["class"]}
-                        if "background_color" in component_style:
-                            instance["background_color"] = {"description": "Hintergrundfarbe der Sektion.", "value": component_style["background_color"]}
-                        if "card_style" in component_style:
-                            instance["card_style"] = {"description": "Styling-Typ für Karten innerhalb der Sektion.", "value": component_style["card_style"]}
-                        if "image_frame" in component_style:
-                            instance["image_frame"] = {"description": "Rahmen-Stil für Bilder.", "value": component_style["image_frame"]}
-                        if "button_style" in component_style:
-                            instance["button_style"] = {"description": "Styling für Buttons.", "value": component_style["button_style"]}
-        
-        # Update der Metadaten
-        output_template["metadata"]["generator_version"] = "v2.0-structured-injector"
-        output_template["metadata"]["injected_style"] = variant
-
-        # Schreibe die neue Stufe-02-Datei
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        output_filename = f"project_template_Stufe02_Styled_{variant}_{timestamp}.json"
-        output_path = project_dir / output_filename
-        
-        with output_path.open('w', encoding='utf-8') as f:
-            json.dump(output_template, f, indent=2, ensure_ascii=False)
+        # Stufe02 als Overlay: nur die Style-Felder + Verweis auf die Stufe01-Basis per Hash
+        overlay = build_overlay(base_template, template_file, base_sha256, styles_data, variant, GENERATOR_VERSION)
+        output_path = write_variant(project_dir, variant, overlay)
         
+        outputs.append(output_path)
         print(f"   - ✅ '{variant}' erfolgreich injiziert. Output: {output_path.name}")
 
+    cache.record("inject_styles", cache_key, outputs)
+    record_stage(project_dir, "inject_styles", cache_key, outputs)
     print("\n--- INJECTOR V2.0 erfolgreich abgeschlossen. ---")
 
 
@@ -110,8 +120,9 @@ if __name__ == "__main__":
     parser = argparse.ArgumentParser(description="Inject styles into a project's content template.")
     # Das Argument ist jetzt der Projekt-Ordnername, nicht der ganze Pfad
     parser.add_argument("--project", required=True, help="Project name (e.g., DEF_88)")
+    parser.add_argument("--force", action="store_true", help="Build-Cache ignorieren und alle Stufe02-Dateien neu schreiben")
     args = parser.parse_args()
     try:
-        inject_styles(args.project)
+        inject_styles(args.project, force=args.force)
     except Exception as e:
         print(f"\nEin unerwarteter Fehler ist aufgetreten: {e}")
@@ -15,6 +15,18 @@ from pathlib import Path
 from datetime import datetime
 import logging
 
+# Import der Template-Engine
+import sys
+sys.path.append(str(Path(__file__).parent))
+from template_engine import render_template, index_list_blocks
+from component_registry import get_registry
+from project_index import get_project_index
+from content_overlay import resolve_content
+from style_modulator import compile_modulator, resolve_tokens
+from css_consolidator import StyleSheet
+from css_pruner import ThemePruner, theme_vocabulary
+from project_state import discover_projects
+
 # === 1. KONFIGURATION & PFADE ===
 BASE_DIR = Path(__file__).resolve().parent.parent
 CONTENT_DIR = BASE_DIR / "content"
@@ -23,10 +35,11 @@ COMPONENTS_DIR = TEMPLATES_DIR / "components"
 OUTPUT_DIR = BASE_DIR / "docs"
 OUTPUT_DIR.mkdir(exist_ok=True)
 logging.basicConfig(filename=OUTPUT_DIR / "html_generator.log", level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s', filemode='w')
+COMPONENT_REGISTRY = get_registry(COMPONENTS_DIR)
 
 # === 2. HELFERFUNKTIONEN ===
 def load_json(file_path, default=None):
-    if not file_path.exists():
+    if file_path is None or not file_path.exists():
         logging.warning(f"Datei fehlt: {file_path}")
         return default if default is not None else {}
     try:
@@ -36,12 +49,12 @@ def load_json(file_path, default=None):
         logging.error(f"JSON-Fehler in {file_path}: {e}")
         return default if default is not None else {}
 
-def find_newest_file(directory, pattern):
-    try:
-        return max(directory.glob(pattern), key=lambda f: f.stat().st_mtime)
-    except ValueError:
-        logging.warning(f"Keine Dateien für {pattern} in {directory}")
-        return None
+def find_newest_artifact(project_dir, kind, style=None):
+    # Ein Scan pro Projekt (Projekt-Index) statt glob + stat bei jedem Aufruf
+    path = get_project_index(project_dir).latest(kind, style)
+    if path is None:
+        logging.warning(f"Keine Dateien für {kind} {style or ''} in {project_dir}")
+    return path
 
 def flatten_dict(d, parent_key='', sep='.'):
     items = []
@@ -57,15 +70,12 @@ def flatten_dict(d, parent_key='', sep='.'):
     return dict(items)
 
 def replace_placeholders(html, data_dict):
+    # Jeder Durchlauf ist ein einziger Scan; weitere Durchläufe nur für verschachtelte Werte
     for _ in range(5):
-        is_dirty = False
-        for key, value in data_dict.items():
-            placeholder = f"{{{{{key}}}}}"
-            if placeholder in html:
-                html = html.replace(placeholder, str(value))
-                is_dirty = True
-        if not is_dirty:
+        rendered = render_template(html, data_dict)
+        if rendered == html:
             break
+        html = rendered
     remaining = re.findall(r'\{\{[^}]+\}\}', html)
     if remaining:
         logging.warning(f"Unersetzte Platzhalter: {remaining}")
@@ -77,11 +87,13 @@ def generate_site_for_style(project_dir, style_name, content_data, layout_plan,
     print(f"   - 🎨 Generiere Seite für Style: '{style_name}'")
 
     # Lade Daten
-    style_data = load_json(find_newest_file(project_dir, f"interpreted_styles_{style_name}*.json"))
-    colors_data = load_json(find_newest_file(project_dir, "interpreted_colors*.json"))
-    text_colors_data = load_json(find_newest_file(project_dir, "interpreted_text_colors*.json"))
+    style_data = load_json(find_newest_artifact(project_dir, "interpreted_styles", style_name))
+    colors_data = load_json(find_newest_artifact(project_dir, "interpreted_colors"))
+    text_colors_data = load_json(find_newest_artifact(project_dir, "interpreted_text_colors"))
     layout_rules = load_json(project_dir / "layout_rules.json", {})
-    component_jsons = {f.stem: load_json(f) for f in COMPONENTS_DIR.glob("*.json") if f.stem not in ["_defaults", "_placeholder_assets", "style_modulator"]}
+    component_jsons = COMPONENT_REGISTRY.schemas()
+    # {{colors.*}} in fixed_layouts einmal pro Palette aufgelöst (gecacht über den Palette-Hash)
+    modulator = compile_modulator(load_json(COMPONENTS_DIR / "style_modulator.json", {}), colors_data.get("colors", {}), layout_rules)
 
     # Mapping aufbauen
     final_mapping = flatten_dict(global_defaults)
@@ -93,7 +105,7 @@ def generate_site_for_style(project_dir, style_name, content_data, layout_plan,
         final_mapping[f"{section}.text.heading"] = colors.get('heading', '#000000')
     if "global_settings" in content_data:
         final_mapping.update(flatten_dict(content_data["global_settings"]))
-    for component, rules in layout_rules.get("fixed_layouts", {}).items():
+    for component, rules in modulator.fixed_layouts.items():
         final_mapping.update(flatten_dict(rules, component))
 
     component_counters = {row['component']: 0 for row in layout_plan}
@@ -139,7 +151,9 @@ def generate_site_for_style(project_dir, style_name, content_data, layout_plan,
     # Section-spezifische Hintergründe
     for section, styles in style_data.get("styles", {}).items():
         if 'background_color' in styles:
-            css_vars_string += f"    --{section.replace('_', '-')}-background: {styles['background_color']};\n"
+            # Ältere Styles-Dateien enthalten noch ungelöste Tokens
+            background = resolve_tokens(styles['background_color'], colors_data.get("colors", {}))
+            css_vars_string += f"    --{section.replace('_', '-')}-background: {background};\n"
     # Abstände, Fonts, Radius
     css_vars_string += """
     --spacing-section-large: 100px;
@@ -151,14 +165,18 @@ def generate_site_for_style(project_dir, style_name, content_data, layout_plan,
     --font-family-base: Arial, sans-serif;
 """
     css_vars_string += "}\n@media (max-width: 768px) { :root { --font-size-h1: 2.5rem; --font-size-h2: 2.2rem; --spacing-section-large: 60px; } }\n"
-    css_vars_string = f"<style>\n{css_vars_string}</style>\n"
+    # Ein Stylesheet für den <head>: :root-Variablen zuerst, dann die Komponenten-Blöcke
+    # (dedupliziert, ohne Regeln für Theme-Klassen, die am <body> nicht aktiv sind)
+    theme_classes = style_data.get("theme_classes", "classic")
+    stylesheet = StyleSheet(prune=ThemePruner(theme_classes, theme_vocabulary(component_jsons.get("technik_header_section", {}))))
+    stylesheet.add(css_vars_string)
 
     # HTML aufbauen
     full_html = ""
-    component_styles = []
     header_path = COMPONENTS_DIR / "technik_header.html"
-    if header_path.exists():
-        header_html = header_path.read_text(encoding='utf-8')
+    header_component = COMPONENT_REGISTRY.get("technik_header")
+    if header_component is not None:
+        header_html = header_component.html
         # Ersetze Platzhalter direkt in Header
         header_html = replace_placeholders(header_html, final_mapping)
         header_html = re.sub(r'<style>.*?</style>', '{{GENERATED_STYLE_BLOCK}}', header_html, flags=re.DOTALL)
@@ -167,58 +185,63 @@ def generate_site_for_style(project_dir, style_name, content_data, layout_plan,
     else:
         logging.error(f"Header fehlt: {header_path}")
 
+    render_counters = {row['component']: 0 for row in layout_plan}
     for item in sorted(layout_plan, key=lambda x: int(x.get('order', 0))):
         component_name = item['component']
-        component_path = COMPONENTS_DIR / f"{component_name}.html"
-        if not component_path.exists():
-            logging.warning(f"Komponente fehlt: {component_path}")
+        component = COMPONENT_REGISTRY.get(component_name)
+        if component is None:
+            logging.warning(f"Komponente fehlt: {COMPONENTS_DIR / f'{component_name}.html'}")
             continue
-        component_html = component_path.read_text(encoding='utf-8')
+        component_html = component.html
 
-        # Styles extrahieren
-        style_matches = re.findall(r'<style>.*?</style>', component_html, re.DOTALL)
-        component_styles.extend(style_matches)
-        component_html = re.sub(r'<style>.*?</style>', '', component_html, flags=re.DOTALL)
+        # Styles extrahieren (mehrfach vorkommende Komponenten liefern ihr CSS nur einmal)
+        component_html = stylesheet.extract(component_html)
 
         # Style-Klasse
         component_style_class = style_data.get("styles", {}).get(component_name, {}).get("class", "")
         if component_style_class:
             component_html = re.sub(r'<section class="([^"]*)">', f'<section class="\\1 {component_style_class}">', component_html, 1)
 
-        # Listen verarbeiten
-        instance_data = content_data.get("page_content", {}).get(component_name, [])[component_counters[component_name] - 1]
+        # Listen verarbeiten (vorindizierte Listen-Blöcke, ein Join pro Liste)
+        # Eigene Zählung pro Komponente: n-tes Vorkommen im Layout = n-te Instanz; Komponenten ohne
+        # Inhalt (z.B. technik_header_section aus global_settings) haben keine Listen
+        component_instances = content_data.get("page_content", {}).get(component_name, [])
+        instance_index = render_counters[component_name]
+        render_counters[component_name] += 1
+        instance_data = component_instances[instance_index] if instance_index < len(component_instances) else {}
+        component_json = component_jsons.get(component_name, {})
+        list_index = index_list_blocks(component_html)
+        list_items = {}
         for key, list_data in instance_data.items():
             if isinstance(list_data, list):
                 list_marker = f"{component_name}.{key}"
-                pattern = re.compile(rf'<!-- BEGIN_LIST_ITEM:{re.escape(list_marker)} -->(.*?)<!-- END_LIST_ITEM:{re.escape(list_marker)} -->', re.DOTALL)
-                match = pattern.search(component_html)
-                if match:
-                    item_template = match.group(1)
-                    generated_items_html = ""
-                    for i, list_item in enumerate(list_data):
-                        item_html = item_template
-                        for sub_key, sub_data in list_item.items():
-                            sub_value = sub_data.get('value') or component_json.get(key, {}).get(sub_key, {}).get('example_value') or component_json.get(key, {}).get(sub_key, {}).get('description', '') or final_mapping.get(f"{component_name}.{key}[{i}].{sub_key}", "")
-                            item_html = item_html.replace(f"{{{{{sub_key}}}}}", str(sub_value))
-                        generated_items_html += item_html
-                    component_html = pattern.sub(generated_items_html, component_html)
+                if list_marker not in list_index.by_marker:
+                    continue
+                list_items[list_marker] = [
+                    {sub_key: sub_data.get('value') or component_json.get(key, {}).get(sub_key, {}).get('example_value') or component_json.get(key, {}).get(sub_key, {}).get('description', '') or final_mapping.get(f"{component_name}.{key}[{i}].{sub_key}", "")
+                     for sub_key, sub_data in list_item.items()}
+                    for i, list_item in enumerate(list_data)
+                ]
+        component_html = list_index.expand(list_items)
 
         full_html += component_html + "\n"
 
     # Footer
-    footer_path = COMPONENTS_DIR / "footer_section.html"
-    if footer_path.exists():
-        footer_html = footer_path.read_text(encoding='utf-8')
-        style_matches = re.findall(r'<style>.*?</style>', footer_html, re.DOTALL)
-        component_styles.extend(style_matches)
-        footer_html = re.sub(r'<style>.*?</style>', '', footer_html, flags=re.DOTALL)
+    footer_component = COMPONENT_REGISTRY.get("footer_section")
+    if footer_component is not None:
+        footer_html = stylesheet.extract(footer_component.html)
         full_html += footer_html + "\n"
     else:
         full_html += "</body>\n</html>"
 
     # Styles konsolidieren
-    final_mapping['GENERATED_STYLE_BLOCK'] = css_vars_string + "\n".join(component_styles)
-    final_mapping['theme_classes'] = style_data.get("theme_classes", "classic")
+    final_mapping['GENERATED_STYLE_BLOCK'] = stylesheet.render()
+    css_report = stylesheet.report()
+    print(f"   - 🧹 CSS: {css_report['blocks']} Blöcke -> {css_report['unique']} eindeutig, "
+          f"{css_report['bytes_saved'] / 1024:.1f} KB gespart, davon {css_report['bytes_pruned'] / 1024:.1f} KB ungenutzte Theme-Regeln "
+          f"({css_report['bytes_in'] / 1024:.1f} -> {css_report['bytes_out'] / 1024:.1f} KB)")
+    logging.info(f"CSS {style_name}: {css_report}")
+    final_mapping['theme_classes'] = theme_classes
 
     # Finale Ersetzung
     final_html = replace_placeholders(full_html, final_mapping)
@@ -244,23 +267,12 @@ def main():
             destination_path = destination_path.with_name(f"{f.stem}_{datetime.now().strftime('%Y%m%d_%H%M%S')}{f.suffix}")
         shutil.move(str(f), str(destination_path))
     print("   - ✅ Alte HTML-Dateien archiviert.")
-    content_archive_dir = CONTENT_DIR / "processed_contents_archives"
-    content_archive_dir.mkdir(exist_ok=True)
-    folders_to_archive = [d for d in CONTENT_DIR.iterdir() if d.is_dir() and d.name.startswith('processed_') and d.name != content_archive_dir.name]
-    if folders_to_archive:
-        for folder in folders_to_archive:
-            destination_path = content_archive_dir / folder.name
-            if destination_path.exists():
-                destination_path = destination_path.with_name(f"{folder.name}_{datetime.now().strftime('%Y%m%d_%H%M%S')}")
-            shutil.move(str(folder), str(destination_path))
-        print("   - ✅ Verarbeitete Projekte archiviert.")
-    else:
-        print("   - ℹ️ Keine verarbeiteten Projekte gefunden.")
 
     placeholder_assets = load_json(COMPONENTS_DIR / "_placeholder_assets.json")
     global_defaults = load_json(COMPONENTS_DIR / "_defaults.json")
 
-    projects_to_process = [d for d in CONTENT_DIR.iterdir() if d.is_dir() and d.name not in ["processed_contents_archives", "proceed_contents_archives"]]
+    # Content-Ordner behalten ihren Pfad (kein Umbenennen in processed_<name>, siehe project_state)
+    projects_to_process = discover_projects(CONTENT_DIR)
     for project_dir in projects_to_process:
         project_name = project_dir.name
         print(f"🚀 Verarbeite Projekt: {project_name}")
@@ -268,18 +280,12 @@ def main():
         if not layout_file.exists():
             continue
         layout_plan = [row for row in csv.DictReader(layout_file.open(encoding='utf-8')) if row.get('enabled', 'FALSE').upper() == 'TRUE']
-        for content_file in project_dir.glob("project_template_Stufe02_Styled_*.json"):
-            content_data = load_json(content_file)
+        # Pro Style nur die neueste Stufe02-Generation (ältere würden dieselbe Seite überschreiben)
+        for style_name, content_file in get_project_index(project_dir).latest_by_style("project_template_Stufe02_Styled").items():
+            content_data = resolve_content(load_json(content_file), project_dir)
             if not content_data:
                 continue
-            style_name_match = re.search(r"_Styled_(.+?)_\d+", content_file.name)
-            if not style_name_match:
-                continue
-            style_name = style_name_match.group(1)
             generate_site_for_style(project_dir, style_name, content_data, layout_plan, placeholder_assets, global_defaults)
-        new_name = f"processed_{project_name}_{datetime.now().strftime('%Y%m%d')}"
-        project_dir.rename(project_dir.parent / new_name)
-        print(f"   - ✅ Markiert als: '{new_name}'")
         print("-" * 50)
 
 if __name__ == "__main__":
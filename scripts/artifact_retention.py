@@ -0,0 +1,125 @@
+#!/usr/bin/env python3
+"""
+Aufbewahrung (Retention) der zeitgestempelten Stufen-Artefakte eines Projekts.
+- Pro Artefakt-Art und Style bleiben die neuesten N Generationen im Projekt-Ordner.
+- Ältere Generationen wandern komprimiert in ein Archiv-Paket pro Projekt
+  (`artifact_archive.zip`) und werden erst danach gelöscht.
+- Ein Index (`artifact_archive.json`) hält pro Dateiname alle archivierten Versionen
+  (Member, Art, Style, Zeitstempel, Hash) fest, damit jede gezielt wiederhergestellt werden kann;
+  ein gleicher Name mit anderem Inhalt überschreibt keine ältere Version.
+"""
+import hashlib
+import json
+import os
+import zipfile
+from datetime import datetime
+from pathlib import Path
+
+from project_index import ProjectIndex
+
+ARCHIVE_FILENAME = "artifact_archive.zip"
+ARCHIVE_INDEX_FILENAME = "artifact_archive.json"
+DEFAULT_KEEP = 3
+
+
+def load_archive_index(project_dir):
+    """Index {"artifacts": {name: [version, ...]}}, Versionen in Archivierungs-Reihenfolge."""
+    index_path = Path(project_dir) / ARCHIVE_INDEX_FILENAME
+    if not index_path.exists():
+        return {"artifacts": {}}
+    with index_path.open(encoding='utf-8') as f:
+        archive_index = json.load(f)
+    # Ältere Indizes hielten nur eine Version pro Name
+    archive_index["artifacts"] = {name: versions if isinstance(versions, list) else [versions]
+                                  for name, versions in archive_index["artifacts"].items()}
+    return archive_index
+
+
+def archived_versions(archive_index):
+    """Alle archivierten Versionen aller Dateien (flach)."""
+    return [version for versions in archive_index["artifacts"].values() for version in versions]
+
+
+def save_archive_index(project_dir, archive_index):
+    index_path = Path(project_dir) / ARCHIVE_INDEX_FILENAME
+    tmp_path = index_path.with_name(index_path.name + ".tmp")
+    with tmp_path.open('w', encoding='utf-8') as f:
+        json.dump(archive_index, f, indent=2, sort_keys=True)
+    os.replace(tmp_path, index_path)
+
+
+def expired_artifacts(project_dir, keep=DEFAULT_KEEP):
+    """Alle Artefakte, die über die neuesten `keep` Generationen ihrer Art/ihres Styles hinausgehen."""
+    keep = max(1, keep)
+    project_index = ProjectIndex(project_dir)
+    expired = []
+    for (kind, style), generations in sorted(project_index.artifacts.items(), key=lambda entry: (entry[0][0], entry[0][1] or "")):
+        expired.extend(generations[:-keep])
+    return expired
+
+
+def compact_project(project_dir, keep=DEFAULT_KEEP, dry_run=False):
+    """
+    Packt abgelaufene Generationen ins Archiv und löscht sie aus dem Projekt-Ordner.
+    Gibt eine Zusammenfassung zurück (Anzahl Dateien, freigegebene Bytes).
+    """
+    project_dir = Path(project_dir)
+    expired = expired_artifacts(project_dir, keep)
+    summary = {"project": project_dir.name, "archived": [], "bytes_freed": 0, "dry_run": dry_run}
+    if not expired:
+        return summary
+    if dry_run:
+        summary["archived"] = [artifact.path.name for artifact in expired]
+        summary["bytes_freed"] = sum(artifact.path.stat().st_size for artifact in expired)
+        return summary
+
+    archive_index = load_archive_index(project_dir)
+    archived_at = datetime.now().isoformat(timespec='seconds')
+    with zipfile.ZipFile(project_dir / ARCHIVE_FILENAME, 'a', compression=zipfile.ZIP_DEFLATED, compresslevel=9) as archive:
+        for artifact in expired:
+            data = artifact.path.read_bytes()
+            digest = hashlib.sha256(data).hexdigest()
+            name = artifact.path.name
+            versions = archive_index["artifacts"].setdefault(name, [])
+            if all(version["sha256"] != digest for version in versions):
+                # Gleicher Name mit anderem Inhalt: unter eindeutigem Member-Namen als weitere Version ablegen
+                member = f"{digest[:12]}/{name}" if versions else name
+                archive.writestr(member, data)
+                versions.append({
+                    "member": member, "kind": artifact.kind, "style": artifact.style,
+                    "timestamp": artifact.timestamp, "size": len(data), "sha256": digest,
+                    "archived_at": archived_at,
+                })
+            summary["archived"].append(name)
+            summary["bytes_freed"] += len(data)
+
+    # Erst wenn Archiv und Index geschrieben sind, werden die Originale gelöscht
+    save_archive_index(project_dir, archive_index)
+    for artifact in expired:
+        artifact.path.unlink()
+    return summary
+
+
+def restore_artifact(project_dir, name, overwrite=False, sha256=None):
+    """
+    Stellt eine archivierte Datei im Projekt-Ordner wieder her (Inhalt wird per Hash geprüft).
+    Ohne `sha256` (oder Präfix davon) die zuletzt archivierte Version des Namens.
+    """
+    project_dir = Path(project_dir)
+    versions = load_archive_index(project_dir)["artifacts"].get(name)
+    if not versions:
+        raise KeyError(f"'{name}' ist nicht im Archiv von {project_dir.name}.")
+    if sha256 is not None:
+        versions = [version for version in versions if version["sha256"].startswith(sha256)]
+        if len(versions) != 1:
+            raise KeyError(f"{len(versions)} archivierte Versionen von '{name}' passen zu {sha256}.")
+    entry = versions[-1]
+    target = project_dir / name
+    if target.exists() and not overwrite:
+        raise FileExistsError(f"'{name}' existiert bereits in {project_dir.name}.")
+    with zipfile.ZipFile(project_dir / ARCHIVE_FILENAME) as archive:
+        data = archive.read(entry["member"])
+    if hashlib.sha256(data).hexdigest() != entry["sha256"]:
+        raise ValueError(f"Prüfsumme von '{name}' im Archiv stimmt nicht.")
+    target.write_bytes(data)
+    return target
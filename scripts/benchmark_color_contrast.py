@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+"""
+Benchmark der WCAG-Kontrast-Engine (color_contrast.py); der Abgleich mit der exakten
+WCAG-Formel steht in tests/test_color_contrast.py.
+- Benchmark: bisheriges calculate_contrast (vereinfachte Luminanz, Hex-Parsing pro Aufruf)
+  gegen die memoisierte Engine und die Batch-API, Workload wie interpret_styles
+  (viele Projekte x 4 Varianten x Layout-Zeilen).
+- Zeigt, wie oft sich die Textfarben-Entscheidung durch die echte Formel ändert.
+- Kontrast-Reparatur: Laufzeit für alle Überschriften vieler Projekte (mit und ohne Cache-Treffer).
+
+Aufruf: python scripts/benchmark_color_contrast.py
+"""
+import random
+import time
+
+from color_contrast import (WCAG_AA_NORMAL, _repair_contrast, contrast_ratio, relative_luminance, repair_contrast,
+                            repair_table, score_variants)
+
+VARIANTS = ["classic", "classic_accents", "stylish", "hyper_stylish"]
+
+
+def legacy_contrast(bg_color, text_color):
+    """Bisheriges calculate_contrast aus 00030 (vereinfachte Luminanz)."""
+    def luminance(color):
+        r, g, b = [int(color.lstrip('#')[i:i+2], 16) / 255.0 for i in (0, 2, 4)]
+        return 0.299 * r + 0.587 * g + 0.114 * b
+    bg_lum = luminance(bg_color)
+    text_lum = luminance(text_color)
+    return (max(bg_lum, text_lum) + 0.05) / (min(bg_lum, text_lum) + 0.05)
+
+
+def random_color(rng):
+    return "#%06X" % rng.randrange(1 << 24)
+
+
+def build_workload(rng, project_count, rows):
+    """{projekt: {variante: {komponente: hintergrund}}} mit realistischer Wiederholung der Farben."""
+    palette = ["#FFFFFF", "#F5F5F5"]
+    workload = []
+    for _ in range(project_count):
+        brand = [random_color(rng) for _ in range(3)]
+        workload.append({variant: {f"component_{row}": (palette + brand)[(row + v) % 5] for row in range(rows)}
+                         for v, variant in enumerate(VARIANTS)})
+    return workload
+
+
+def main():
+    rng = random.Random(42)
+
+    workload = build_workload(rng, 2_000, 12)
+    pairs = [bg for project in workload for variant in project.values() for bg in variant.values()]
+
+    start = time.perf_counter()
+    legacy = ["#000000" if legacy_contrast(bg, "#000000") > WCAG_AA_NORMAL else "#FFFFFF" for bg in pairs]
+    legacy_time = time.perf_counter() - start
+
+    contrast_ratio.cache_clear()
+    relative_luminance.cache_clear()
+    start = time.perf_counter()
+    engine = ["#000000" if contrast_ratio(bg, "#000000") > WCAG_AA_NORMAL else "#FFFFFF" for bg in pairs]
+    engine_time = time.perf_counter() - start
+
+    contrast_ratio.cache_clear()
+    relative_luminance.cache_clear()
+    start = time.perf_counter()
+    for project in workload:
+        score_variants(project, ("#000000", "#FFFFFF"))
+    batch_time = time.perf_counter() - start
+
+    changed = sum(1 for a, b in zip(legacy, engine) if a != b)
+    print(f"   - ⏱️ {len(pairs)} Kontrast-Entscheidungen: alt {legacy_time * 1000:.1f} ms, "
+          f"Engine {engine_time * 1000:.1f} ms ({legacy_time / engine_time:.1f}x), "
+          f"Batch pro Projekt {batch_time * 1000:.1f} ms")
+    print(f"   - ℹ️ Textfarbe ändert sich durch die echte WCAG-Formel bei {changed} von {len(pairs)} Hintergründen.")
+
+    accents = [random_color(rng) for _ in workload]
+    heading_pairs = [(bg, accent) for project, accent in zip(workload, accents)
+                     for variant in project.values() for bg in variant.values()]
+    _repair_contrast.cache_clear()
+    start = time.perf_counter()
+    repaired = repair_table(heading_pairs)
+    cold_time = time.perf_counter() - start
+    start = time.perf_counter()
+    for pair in heading_pairs:
+        repair_contrast(*pair)
+    warm_time = time.perf_counter() - start
+    shifted = sum(1 for (bg, accent), color in repaired.items() if color != accent)
+    print(f"   - ⏱️ Reparatur für {len(heading_pairs)} Überschriften ({len(repaired)} Paare, {shifted} verschoben): "
+          f"{cold_time * 1000:.1f} ms ohne Cache, {warm_time * 1000:.1f} ms mit Cache")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+"""
+Benchmark: Style-Injektion mit copy.deepcopy pro Variante gegen die
+Varianten-Sichten mit geteilten Teilbäumen (content_overlay.styled_view).
+- Synthetische Stufe01-Templates mit vielen Komponenten, Instanzen und Listen-Items.
+- Misst die Zeit für alle vier Varianten, die Zeit für einen vollständigen Lesedurchlauf
+  wie im Generator und den zusätzlichen Speicher danach (tracemalloc).
+- Dass beide Varianten denselben Inhalt liefern, prüft tests/test_content_overlay.py.
+
+Aufruf: python scripts/benchmark_content_model.py
+"""
+import copy
+import gc
+import json
+import time
+import tracemalloc
+
+from content_overlay import style_fields, styled_view
+
+VARIANTS = ["classic", "classic_accents", "stylish", "hyper_stylish"]
+
+
+def legacy_inject(base_template, styles_data, variant):
+    """Bisheriger Injector (Referenz): tiefe Kopie, dann Felder in jede Instanz schreiben."""
+    output_template = copy.deepcopy(base_template)
+    for component_name, instances in output_template["page_content"].items():
+        if component_name in styles_data:
+            for instance in instances:
+                instance.update(style_fields(styles_data[component_name]))
+    output_template["metadata"]["generator_version"] = "v2.0-structured-injector"
+    output_template["metadata"]["injected_style"] = variant
+    return output_template
+
+
+def view_inject(base_template, styles_data, variant):
+    return styled_view(base_template, styles_data, variant, "v2.0-structured-injector")
+
+
+def build_template(component_count, instance_count, list_items):
+    """Stufe01-Format: Felder als {description, value}, Listen mit Items."""
+    field = lambda name: {"description": f"Beschreibung für '{name}', ausführlich genug für echte Templates.", "value": ""}
+    page_content = {}
+    for c in range(component_count):
+        instances = []
+        for _ in range(instance_count):
+            instance = {name: field(name) for name in ("headline", "subheadline", "description", "image_url", "image_alt_text")}
+            instance["items_list"] = [{name: field(name) for name in ("icon", "title", "text")} for _ in range(list_items)]
+            instances.append(instance)
+        page_content[f"component_{c}"] = instances
+    return {"metadata": {"generated_at": "2025-01-01T00:00:00", "generator_version": "v5.2"}, "page_content": page_content}
+
+
+def build_styles(base_template):
+    return {variant: {component: {"class": f"{variant}-{i}", "background_color": "#FFFFFF", "card_style": "shadow",
+                                  "image_frame": "none", "button_style": "solid"}
+                      for i, component in enumerate(base_template["page_content"])}
+            for variant in VARIANTS}
+
+
+def traverse(content):
+    """Lesezugriffe wie im Generator: jede Instanz, jedes Feld, jedes Listen-Item."""
+    count = 0
+    for instances in content["page_content"].values():
+        for instance in instances:
+            for value in instance.values():
+                count += len(value) if isinstance(value, list) else 1
+    return count
+
+
+def measure(inject, base_template, styles):
+    """Zeit der Injektion, Zeit eines Lesedurchlaufs und Speicher nach Injektion + Lesen (alle Varianten)."""
+    gc.collect()
+    start = time.perf_counter()
+    views = [inject(base_template, styles[variant], variant) for variant in VARIANTS]
+    inject_time = time.perf_counter() - start
+    start = time.perf_counter()
+    for view in views:
+        traverse(view)
+    read_time = time.perf_counter() - start
+
+    del views
+    gc.collect()
+    tracemalloc.start()
+    views = [inject(base_template, styles[variant], variant) for variant in VARIANTS]
+    for view in views:
+        traverse(view)
+    memory, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return inject_time, memory, read_time, views
+
+
+def main():
+    print(f"{'Komp.':>5} {'Inst.':>5} {'Items':>5} {'Basis KB':>9} {'deepcopy ms':>12} {'Sicht ms':>9} "
+          f"{'deepcopy KB':>12} {'Sicht KB':>9} {'Lesen alt ms':>13} {'Lesen neu ms':>13}")
+    print("-" * 104)
+    for component_count, instance_count, list_items in [(10, 2, 5), (50, 5, 20), (100, 10, 50)]:
+        base_template = build_template(component_count, instance_count, list_items)
+        styles = build_styles(base_template)
+        base_kb = len(json.dumps(base_template)) / 1024
+        legacy_time, legacy_mem, legacy_read, _ = measure(legacy_inject, base_template, styles)
+        view_time, view_mem, view_read, _ = measure(view_inject, base_template, styles)
+        print(f"{component_count:>5} {instance_count:>5} {list_items:>5} {base_kb:>9.0f} {legacy_time * 1000:>12.1f} {view_time * 1000:>9.2f} "
+              f"{legacy_mem / 1024:>12.0f} {view_mem / 1024:>9.1f} {legacy_read * 1000:>13.1f} {view_read * 1000:>13.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,60 @@
+#!/usr/bin/env python3
+"""
+Benchmark der CSS-Stufen (css_consolidator, css_pruner) auf den echten Komponenten;
+Parser- und Pruning-Checks stehen in tests/test_css_pruner.py.
+- Größe des Seiten-Stylesheets pro Theme-Kombination, mit Komponenten-Wiederholungen.
+- Zeit pro Seite ohne und mit Cache-Treffern (Parse- und Pruning-Cache).
+
+Aufruf: python scripts/benchmark_css.py
+"""
+import itertools
+import json
+import time
+from pathlib import Path
+
+from css_consolidator import StyleSheet, split_styles
+from css_pruner import ThemePruner, parse_css, prune_css, theme_vocabulary
+
+COMPONENTS_DIR = Path(__file__).resolve().parent.parent / "templates" / "components"
+
+
+def main():
+    components = {path.stem: path.read_text(encoding="utf-8") for path in sorted(COMPONENTS_DIR.glob("*.html"))}
+    vocabulary = theme_vocabulary(json.loads((COMPONENTS_DIR / "technik_header_section.json").read_text(encoding="utf-8")))
+    options = json.loads((COMPONENTS_DIR / "technik_header_section.json").read_text(encoding="utf-8"))["theme_classes"]["available_options"]
+
+    # Seite: jede Komponente einmal, zwei davon doppelt, plus Footer-Durchlauf
+    page = list(components) + ["culture_section", "values_section", "footer_section"]
+    combinations = [" ".join(combo) for combo in itertools.product(*options.values())]
+    sizes = []
+    parse_css.cache_clear()
+    prune_css.cache_clear()
+    start = time.perf_counter()
+    for theme_classes in combinations:
+        stylesheet = StyleSheet(prune=ThemePruner(theme_classes, vocabulary))
+        for name in page:
+            stylesheet.extract(components[name])
+        sizes.append(stylesheet.report())
+    cold_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for theme_classes in combinations:
+        stylesheet = StyleSheet(prune=ThemePruner(theme_classes, vocabulary))
+        for name in page:
+            stylesheet.extract(components[name])
+        stylesheet.render()
+    warm_time = time.perf_counter() - start
+
+    plain = StyleSheet()
+    for name in page:
+        plain.extract(components[name])
+    legacy_bytes = sum(len(f"<style>{css}</style>".encode("utf-8")) for name in page for css in split_styles(components[name])[1])
+    print(f"   - 📦 Bisher (alle Blöcke, auch doppelte): {legacy_bytes / 1024:.1f} KB, dedupliziert: {plain.report()['bytes_out'] / 1024:.1f} KB")
+    outputs = [report["bytes_out"] for report in sizes]
+    print(f"   - ✂️ Mit Pruning ({len(combinations)} Theme-Kombinationen): {min(outputs) / 1024:.1f} - {max(outputs) / 1024:.1f} KB "
+          f"(Ø {sum(outputs) / len(outputs) / 1024:.1f} KB)")
+    print(f"   - ⏱️ {len(combinations)} Seiten: {cold_time * 1000:.1f} ms ohne Cache, {warm_time * 1000:.1f} ms mit Cache")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,147 @@
+#!/usr/bin/env python3
+"""
+Benchmark: build_styles (00030) mit kompiliertem LayoutPlan gegen die bisherige Fassung
+(max(order) und Liste der aktiven Zeilen pro Zeile und Variante neu berechnet).
+- Synthetische Layouts mit wachsender Zeilenzahl und mehreren Varianten.
+- Die bisherige Fassung dient auch als Referenz für tests/test_interpret_styles.py
+  (identische Styles und Textfarben).
+- Kompilierter style_modulator: Zeit pro Projekt ohne und mit Cache-Treffer
+  (viele Projekte, wenige unterschiedliche Paletten).
+
+Aufruf: python scripts/benchmark_interpret_styles.py
+"""
+import importlib.util
+import json
+import time
+from pathlib import Path
+
+from color_contrast import WCAG_AA_NORMAL, contrast_ratio, parse_hex, repair_contrast
+from style_modulator import _COMPILED, compile_modulator
+
+SCRIPT_DIR = Path(__file__).parent
+BASE_DIR = SCRIPT_DIR.parent
+
+
+def load_script(filename):
+    spec = importlib.util.spec_from_file_location(Path(filename).stem.replace(".", "_"), SCRIPT_DIR / filename)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def legacy_build_styles(colors, layout_data, style_modulator, config, layout_rules):
+    """Bisherige Fassung (Referenz): O(Zeilen²) pro Variante."""
+    preferred_variants = config.get("preferred_variants", ["classic", "stylish", "classic_accents", "hyper_stylish"])
+    styles_output = {}
+    text_colors = {}
+    fixed_layouts = layout_rules.get("fixed_layouts", {})
+    footer_bg = colors["primary_color"]
+    for variant in preferred_variants:
+        styles = {}
+        variant_styles = style_modulator["variants"].get(variant, {})
+        alt_backgrounds = variant_styles.get("alternating_backgrounds", ["#FFFFFF", "#F5F5F5"])
+        element_styles = variant_styles.get("element_styles", {})
+        for row in layout_data:
+            component = row["component"]
+            order = int(row["order"])
+            if component in fixed_layouts:
+                style = fixed_layouts[component].copy()
+                for key, value in style.items():
+                    style[key] = value.replace("{{colors.gradient_type}}", colors["gradient_type"]).replace("{{colors.primary_color}}", colors["primary_color"]).replace("{{colors.secondary_color}}", colors["secondary_color"])
+            else:
+                is_last_before_footer = (order == max(int(r["order"]) for r in layout_data) and component != "footer")
+                bg_index = 0 if order % 2 == 0 else 1
+                bg_color = alt_backgrounds[bg_index]
+                if is_last_before_footer and len([r for r in layout_data if r["enabled"].lower() == "true"]) % 2 == 1:
+                    footer_lum = sum(parse_hex(footer_bg)) / 3 / 255
+                    if footer_lum > 0.5:
+                        bg_color = "#FFFFFF" if variant in ["classic", "classic_accents"] else bg_color.replace("{{colors.accent_color_rgb}}", ",".join(map(str, colors["accent_color_rgb"])))
+                style = {
+                    "gradient_type": "none",
+                    "background_color": bg_color,
+                    "class": row["styling_default"],
+                    "image_frame": element_styles.get("image_frame", {}).get("style", "none"),
+                    "card_style": element_styles.get("card", {}).get("style", "none"),
+                    "button_style": element_styles.get("button", {}).get("style", "none")
+                }
+            styles[component] = style
+            bg_color = style["background_color"].replace("rgba({{colors.accent_color_rgb}}, 0.2)", f"#{colors['accent_color'][:7]}").replace("rgba({{colors.accent_color_rgb}}, 0.3)", f"#{colors['accent_color'][:7]}")
+            default_color = "#000000" if contrast_ratio(bg_color, "#000000") > WCAG_AA_NORMAL else "#FFFFFF"
+            heading_color = default_color
+            if variant == "stylish" or variant == "hyper_stylish":
+                if bg_color in ["#FFFFFF", "#F5F5F5"]:
+                    heading_color = repair_contrast(bg_color, colors["accent_color"])
+            elif variant == "classic_accents":
+                heading_color = repair_contrast(bg_color, colors["accent_color"])
+            text_colors[component] = {"default": default_color, "heading": heading_color}
+        styles_output[variant] = {"styles": styles}
+    return styles_output, text_colors
+
+
+def build_inputs(row_count, variant_count, primary_color):
+    style_modulator = json.loads((BASE_DIR / "templates/components/style_modulator.json").read_text())
+    base_variants = list(style_modulator["variants"])
+    # Zusätzliche Varianten als Kopien der vorhandenen (eigene Namen)
+    for i in range(len(base_variants), variant_count):
+        style_modulator["variants"][f"custom_{i}"] = style_modulator["variants"][base_variants[i % len(base_variants)]]
+    variants = (base_variants + [f"custom_{i}" for i in range(len(base_variants), variant_count)])[:variant_count]
+    colors = {"primary_color": primary_color, "secondary_color": "#C70039", "accent_color": "#900C3F",
+              "gradient_type": "horizontal", "accent_color_rgb": [144, 12, 63]}
+    layout_data = [{"component": "hero_section", "order": "1", "enabled": "true", "styling_default": "fade-up"}]
+    layout_data += [{"component": f"module_{i}", "order": str(i + 2), "enabled": "true" if i % 7 else "false",
+                     "styling_default": "neutral"} for i in range(row_count - 1)]
+    layout_rules = {"fixed_layouts": {
+        "hero_section": {"gradient_type": "{{colors.gradient_type}}", "background_color": "{{colors.primary_color}}", "class": "fade-up"},
+        "footer": {"gradient_type": "none", "background_color": "{{colors.primary_color}}", "class": "neutral"},
+    }}
+    return colors, layout_data, style_modulator, {"preferred_variants": variants}, layout_rules
+
+
+def timed(build, inputs, repeat):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        result = build(*inputs)
+    return (time.perf_counter() - start) / repeat, result
+
+
+def main():
+    styles_stage = load_script("00030_Interpret_styles_v2.0.py")
+    print(f"{'Zeilen':>6} {'Varianten':>9} {'alt ms':>9} {'Plan ms':>9} {'Faktor':>7}")
+    print("-" * 44)
+    for row_count, variant_count in [(14, 4), (60, 4), (60, 12), (300, 12)]:
+        timings = None
+        # Dunkler/heller Footer, gerade/ungerade Anzahl aktiver Zeilen (Zeit aus dem ersten Fall)
+        for primary, extra_rows in [("#FF5733", 0), ("#F0F0F0", 0), ("#F0F0F0", 1)]:
+            inputs = build_inputs(row_count + extra_rows, variant_count, primary)
+            repeat = max(1, 2000 // (row_count * variant_count))
+            plan_time, result = timed(styles_stage.build_styles, inputs, repeat)
+            try:
+                legacy_time, _ = timed(legacy_build_styles, inputs, repeat)
+            except ValueError:
+                # Bisher Absturz: rgba-Hintergrund vor hellem Footer landete ungeparst im Kontrast-Check
+                fixed = result[1]["module_%d" % (len(inputs[1]) - 2)]
+                print(f"   - ℹ️ {row_count + extra_rows} Zeilen, heller Footer: bisher ValueError, jetzt {fixed}")
+                continue
+            timings = timings or (legacy_time, plan_time)
+        legacy_time, plan_time = timings
+        print(f"{row_count:>6} {variant_count:>9} {legacy_time * 1000:>9.2f} {plan_time * 1000:>9.2f} {legacy_time / plan_time:>6.1f}x")
+
+    # 2000 Projekte, 50 verschiedene Paletten
+    colors, _, style_modulator, _, layout_rules = build_inputs(14, 4, "#FF5733")
+    palettes = [dict(colors, primary_color="#%06X" % (i * 40503 % (1 << 24))) for i in range(50)]
+    _COMPILED.clear()
+    start = time.perf_counter()
+    for i in range(2000):
+        compile_modulator(style_modulator, palettes[i % len(palettes)], layout_rules)
+    cached_time = time.perf_counter() - start
+    start = time.perf_counter()
+    for i in range(2000):
+        _COMPILED.clear()
+        compile_modulator(style_modulator, palettes[i % len(palettes)], layout_rules)
+    uncached_time = time.perf_counter() - start
+    print(f"   - ⏱️ style_modulator für 2000 Projekte / 50 Paletten: {uncached_time * 1000:.1f} ms ohne Cache, "
+          f"{cached_time * 1000:.1f} ms mit Cache ({len(palettes)} Kompilierungen)")
+
+
+if __name__ == "__main__":
+    main()
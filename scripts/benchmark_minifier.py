@@ -0,0 +1,34 @@
+#!/usr/bin/env python3
+"""
+Benchmark des Streaming-Minifiers (html_minifier) auf den Seiten in docs/: Größe vor/nach
+pro Seite und Durchsatz. Chunk-Unabhängigkeit und unveränderte <pre>/<textarea>/<script>-Inhalte
+prüft tests/test_html_minifier.py.
+
+Aufruf: python scripts/benchmark_minifier.py
+"""
+import time
+from pathlib import Path
+
+from html_minifier import minify_chunks
+
+DOCS_DIR = Path(__file__).resolve().parent.parent / "docs"
+
+
+def main():
+    pages = {path.name: path.read_text(encoding="utf-8") for path in sorted(DOCS_DIR.glob("*.html"))}
+    total_in = 0
+    elapsed = 0.0
+    for name, html in pages.items():
+        stats = {}
+        start = time.perf_counter()
+        for _ in minify_chunks((html[i:i + 4096] for i in range(0, len(html), 4096)), stats):
+            pass
+        elapsed += time.perf_counter() - start
+        total_in += stats["bytes_in"]
+        print(f"   - {name}: {stats['bytes_in'] / 1024:.1f} KB -> {stats['bytes_out'] / 1024:.1f} KB "
+              f"({1 - stats['bytes_out'] / stats['bytes_in']:.0%} kleiner)")
+    print(f"   - ⏱️ {total_in / 1024:.0f} KB in {elapsed * 1000:.1f} ms ({total_in / 1024 / 1024 / max(elapsed, 1e-9):.1f} MB/s)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+"""
+Benchmark: find_newest_file (glob + stat pro Suche) gegen den Projekt-Index
+(ein os.scandir-Durchlauf, danach Dict-Zugriffe).
+- Synthetischer Projekt-Ordner mit N Generationen pro Style und Artefakt-Art.
+- Pro "Lauf" dieselben Suchen wie der V03-Generator: Styles + Farben für 4 Styles.
+- Gemessen: glob pro Suche, Index mit Scan pro Lauf, geteilter Index (Scan nur einmal).
+
+Aufruf: python scripts/benchmark_project_index.py
+"""
+import tempfile
+import time
+from pathlib import Path
+
+from project_index import ProjectIndex, get_project_index
+
+STYLES = ["classic", "classic_accents", "stylish", "hyper_stylish"]
+
+
+def find_newest_file(directory, pattern):
+    """Bisherige Implementierung aus dem V03-Generator (Referenz)."""
+    try:
+        return max(directory.glob(pattern), key=lambda f: f.stat().st_mtime)
+    except ValueError:
+        return None
+
+
+def build_project(project_dir, generations):
+    project_dir.mkdir()
+    (project_dir / "interpreted_colors.json").write_text("{}")
+    for g in range(generations):
+        timestamp = f"2025{(g // 28) % 12 + 1:02d}{g % 28 + 1:02d}_{g % 24:02d}0000"
+        (project_dir / f"interpreted_text_colors_{timestamp}.json").write_text("{}")
+        for style in STYLES:
+            (project_dir / f"interpreted_styles_{style}_{timestamp}.json").write_text("{}")
+            (project_dir / f"project_template_Stufe02_Styled_{style}_{timestamp}.json").write_text("{}")
+
+
+def legacy_lookups(project_dir):
+    for style in STYLES:
+        find_newest_file(project_dir, f"interpreted_styles_{style}*.json")
+        find_newest_file(project_dir, "interpreted_colors*.json")
+        find_newest_file(project_dir, "interpreted_text_colors*.json")
+
+
+def indexed_lookups(project_dir, index=None):
+    """Ohne `index`: kalter Index (Scan bei jedem Lauf). Mit geteiltem Index nur Dict-Zugriffe."""
+    index = index or ProjectIndex(project_dir)
+    for style in STYLES:
+        index.latest("interpreted_styles", style)
+        index.latest("interpreted_colors")
+        index.latest("interpreted_text_colors")
+
+
+def shared_lookups(project_dir):
+    """Wie im Generator: geteilter Index, pro Lauf nur ein stat() des Ordners."""
+    indexed_lookups(project_dir, get_project_index(project_dir))
+
+
+def time_it(func, project_dir, repeat):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        func(project_dir)
+    return (time.perf_counter() - start) / repeat
+
+
+def main():
+    print(f"{'Generationen':>12} {'Dateien':>8} {'glob ms':>9} {'Scan ms':>9} {'geteilt ms':>11} {'Speedup':>9}")
+    print("-" * 64)
+    with tempfile.TemporaryDirectory() as tmp:
+        for generations in (1, 10, 50, 200):
+            project_dir = Path(tmp) / f"project_{generations}"
+            build_project(project_dir, generations)
+            legacy = time_it(legacy_lookups, project_dir, 20)
+            cold = time_it(indexed_lookups, project_dir, 20)
+            shared = time_it(shared_lookups, project_dir, 20)
+            file_count = sum(1 for _ in project_dir.iterdir())
+            print(f"{generations:>12} {file_count:>8} {legacy * 1000:>9.2f} {cold * 1000:>9.2f} {shared * 1000:>11.3f} {legacy / shared:>8.0f}x")
+
+
+if __name__ == "__main__":
+    main()
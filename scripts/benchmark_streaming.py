@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+"""
+Speicher-Benchmark: bisheriger String-Aufbau (final_html += ...) gegen den
+Streaming-Modus (iter_render -> gepufferte Datei).
+- Seiten aus echten benefits_section-Komponenten mit Hunderten von Listen-Items.
+- Misst Peak-Speicher (tracemalloc) und Laufzeit pro Seite.
+
+Aufruf: python scripts/benchmark_streaming.py
+"""
+import re
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+from html_writer import write_chunks
+from template_engine import index_list_blocks
+
+BASE_DIR = Path(__file__).resolve().parent.parent
+COMPONENTS_DIR = BASE_DIR / "templates" / "components"
+COMPONENT_NAME = "benefits_section"
+LIST_MARKER = f"{COMPONENT_NAME}.benefits_list"
+
+
+def build_page(section_count, item_count):
+    """Content-Daten im Stufe02-Format: `section_count` Instanzen mit je `item_count` Items."""
+    instances = []
+    for s in range(section_count):
+        items = [{"icon": {"value": "⭐"}, "title": {"value": f"Benefit {s}.{i}"},
+                  "text": {"value": f"Eine ausführliche Beschreibung für Benefit {i}. " * 4}}
+                 for i in range(item_count)]
+        instances.append({"headline": {"value": f"Vorteile {s}"}, "description": {"value": "Was wir bieten."},
+                          "benefits_list": items})
+    return instances
+
+
+def legacy_render(html, instances, output_path):
+    """Bisheriger Ablauf aus dem V03-Generator: Regex-Listen, str.replace, final_html +=."""
+    final_html = ""
+    for instance_data in instances:
+        component_html = html
+        for key, list_data in instance_data.items():
+            if isinstance(list_data, list):
+                list_marker = f"{COMPONENT_NAME}.{key}"
+                pattern = re.compile(rf'<!-- BEGIN_LIST_ITEM:{re.escape(list_marker)} -->(.*?)<!-- END_LIST_ITEM:{re.escape(list_marker)} -->', re.DOTALL)
+                match = pattern.search(component_html)
+                item_template = match.group(1)
+                generated_items_html = ""
+                for list_item in list_data:
+                    item_html = item_template
+                    for sub_key, sub_data in list_item.items():
+                        item_html = item_html.replace(f"{{{{{sub_key}}}}}", str(sub_data["value"]))
+                    generated_items_html += item_html
+                component_html = pattern.sub(lambda m: generated_items_html, component_html)
+        for key, data in instance_data.items():
+            if isinstance(data, dict):
+                component_html = component_html.replace(f"{{{{{COMPONENT_NAME}.{key}}}}}", str(data["value"]))
+        final_html += component_html + "\n"
+    output_path.write_text(final_html, encoding='utf-8')
+
+
+def streaming_render(html, instances, output_path):
+    """Streaming-Modus: Chunks direkt aus dem Listen-Index in die gepufferte Datei."""
+    list_index = index_list_blocks(html)
+
+    def chunks():
+        for instance_data in instances:
+            mapping = {f"{COMPONENT_NAME}.{key}": data["value"] for key, data in instance_data.items() if isinstance(data, dict)}
+            lists = {LIST_MARKER: [{sub_key: sub_data["value"] for sub_key, sub_data in item.items()}
+                                   for item in instance_data["benefits_list"]]}
+            yield from list_index.iter_render(mapping, lists)
+            yield "\n"
+
+    write_chunks(output_path, chunks())
+
+
+def measure(func, html, instances, output_path):
+    tracemalloc.start()
+    start = time.perf_counter()
+    func(html, instances, output_path)
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return peak, elapsed
+
+
+def main():
+    html = (COMPONENTS_DIR / f"{COMPONENT_NAME}.html").read_text(encoding='utf-8')
+    index_list_blocks(html)  # Index-Aufbau nicht mitmessen
+
+    print(f"{'Sektionen':>9} {'Items':>7} {'Seite KB':>9} {'legacy Peak KB':>15} {'stream Peak KB':>15} {'legacy ms':>10} {'stream ms':>10}")
+    print("-" * 82)
+    with tempfile.TemporaryDirectory() as tmp:
+        legacy_path = Path(tmp) / "legacy.html"
+        stream_path = Path(tmp) / "stream.html"
+        for section_count, item_count in [(5, 100), (5, 500), (20, 500), (50, 1000)]:
+            instances = build_page(section_count, item_count)
+            legacy_peak, legacy_time = measure(legacy_render, html, instances, legacy_path)
+            stream_peak, stream_time = measure(streaming_render, html, instances, stream_path)
+            assert legacy_path.read_bytes() == stream_path.read_bytes(), "Ausgaben weichen ab"
+            print(f"{section_count:>9} {item_count:>7} {stream_path.stat().st_size / 1024:>9.0f} "
+                  f"{legacy_peak / 1024:>15.0f} {stream_peak / 1024:>15.0f} "
+                  f"{legacy_time * 1000:>10.1f} {stream_time * 1000:>10.1f}")
+
+
+if __name__ == "__main__":
+    main()
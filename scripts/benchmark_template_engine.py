@@ -0,0 +1,166 @@
+#!/usr/bin/env python3
+"""
+Benchmark: altes replace_placeholders (ein str.replace pro Mapping-Key)
+gegen die kompilierte Template-Engine.
+- Szenario 1: echte Komponenten + Mapping des Projekts DEF_88 (alle Stufe02-Styles).
+- Szenario 2: synthetische Mappings mit vielen Keys (wie flache Defaults + Farben).
+- Szenario 3: Listen-Expansion (Regex pro Liste gegen vorindizierte Listen-Blöcke).
+
+Aufruf: python scripts/benchmark_template_engine.py [--project DEF_88] [--repeat 20]
+"""
+import argparse
+import csv
+import json
+import re
+import time
+from pathlib import Path
+
+from content_overlay import resolve_content
+from template_engine import CompiledTemplate, index_list_blocks, render_template
+
+BASE_DIR = Path(__file__).resolve().parent.parent
+CONTENT_DIR = BASE_DIR / "content"
+COMPONENTS_DIR = BASE_DIR / "templates" / "components"
+
+
+def legacy_replace_placeholders(html, data_dict):
+    """Bisherige Implementierung aus dem V03-Generator (Referenz)."""
+    for key, value in data_dict.items():
+        html = html.replace(f"{{{{{key}}}}}", str(value))
+    return html
+
+
+def legacy_expand_list(html, list_marker, list_data):
+    """Bisherige Listen-Expansion aus dem V03-Generator (Referenz)."""
+    pattern = re.compile(rf'<!-- BEGIN_LIST_ITEM:{re.escape(list_marker)} -->(.*?)<!-- END_LIST_ITEM:{re.escape(list_marker)} -->', re.DOTALL)
+    match = pattern.search(html)
+    item_template = match.group(1)
+    generated_items_html = ""
+    for list_item in list_data:
+        item_html = item_template
+        for sub_key, sub_value in list_item.items():
+            item_html = item_html.replace(f"{{{{{sub_key}}}}}", str(sub_value))
+        generated_items_html += item_html
+    return pattern.sub(lambda m: generated_items_html, html)
+
+
+def flatten_dict(d, parent_key='', sep='.'):
+    items = []
+    for k, v in d.items():
+        new_key = parent_key + sep + k if parent_key else k
+        if isinstance(v, dict):
+            items.extend(flatten_dict(v, new_key, sep=sep).items())
+        else:
+            items.append((new_key, v))
+    return dict(items)
+
+
+def load_json(file_path):
+    with file_path.open(encoding='utf-8') as f:
+        return json.load(f)
+
+
+def build_project_workload(project_dir):
+    """Baut (html, mapping)-Paare wie generate_site_for_style im V03-Generator."""
+    layout_file = project_dir / "layout_extended_v2.csv"
+    with layout_file.open(encoding='utf-8') as f:
+        layout_plan = [row for row in csv.DictReader(f) if row.get('enabled', 'FALSE').upper() == 'TRUE']
+
+    global_mapping = flatten_dict(load_json(COMPONENTS_DIR / "_defaults.json"))
+    colors_file = project_dir / "interpreted_colors.json"
+    if colors_file.exists():
+        global_mapping.update(flatten_dict(load_json(colors_file).get("colors", {}), parent_key="design.branding"))
+
+    workload = []
+    for content_file in sorted(project_dir.glob("project_template_Stufe02_Styled_*.json")):
+        content_data = resolve_content(load_json(content_file), project_dir)
+        counters = {}
+        for item in sorted(layout_plan, key=lambda x: int(x.get('order', 0))):
+            component_name = item['component']
+            component_path = COMPONENTS_DIR / f"{component_name}.html"
+            instances = content_data.get("page_content", {}).get(component_name, [])
+            index = counters.get(component_name, 0)
+            if index >= len(instances) or not component_path.exists():
+                continue
+            counters[component_name] = index + 1
+            mapping = global_mapping.copy()
+            for key, data in instances[index].items():
+                if isinstance(data, dict) and "value" in data:
+                    mapping[f"{component_name}.{key}"] = data.get("value") or data.get("example_value", "")
+            workload.append((component_path.read_text(encoding='utf-8'), mapping))
+    return workload
+
+
+def build_synthetic_workload(key_count):
+    """Ein ~20 KB Template mit 200 Platzhaltern und einem Mapping mit `key_count` Keys."""
+    mapping = {f"section_{i}.field_{i % 7}": f"Wert {i}" for i in range(key_count)}
+    used_keys = list(mapping)[::max(1, key_count // 200)][:200]
+    block = '<div class="card"><h3>{{%s}}</h3><p>Lorem ipsum dolor sit amet, consectetur adipiscing.</p></div>\n'
+    html = "".join(block % key for key in used_keys)
+    return [(html, mapping)]
+
+
+def time_it(func, workload, repeat):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        for html, mapping in workload:
+            func(html, mapping)
+    return (time.perf_counter() - start) / repeat
+
+
+def compiled_cold(html, mapping):
+    """Inklusive Kompilierung bei jedem Aufruf (ohne Cache)."""
+    return CompiledTemplate(html).render(mapping)
+
+
+def run_scenario(name, workload, repeat):
+    for html, mapping in workload:
+        assert legacy_replace_placeholders(html, mapping) == render_template(html, mapping), f"Abweichung in {name}"
+    legacy = time_it(legacy_replace_placeholders, workload, repeat)
+    cold = time_it(compiled_cold, workload, repeat)
+    cached = time_it(render_template, workload, repeat)
+    keys = max(len(mapping) for _, mapping in workload)
+    print(f"{name:<28} {len(workload):>6} {keys:>8} {legacy * 1000:>11.2f} {cold * 1000:>11.2f} "
+          f"{cached * 1000:>11.2f} {legacy / cached:>8.1f}x")
+
+
+def run_list_scenario(item_count, repeat):
+    html = (COMPONENTS_DIR / "benefits_section.html").read_text(encoding='utf-8')
+    marker = "benefits_section.benefits_list"
+    items = [{"icon": "⭐", "title": f"Benefit {i}", "text": f"Beschreibung {i} " * 5} for i in range(item_count)]
+    list_index = index_list_blocks(html)
+    assert legacy_expand_list(html, marker, items) == list_index.expand({marker: items}), "Abweichung in Listen-Szenario"
+
+    start = time.perf_counter()
+    for _ in range(repeat):
+        legacy_expand_list(html, marker, items)
+    legacy = (time.perf_counter() - start) / repeat
+    start = time.perf_counter()
+    for _ in range(repeat):
+        list_index.expand({marker: items})
+    indexed = (time.perf_counter() - start) / repeat
+    print(f"{f'Liste {item_count} Items':<28} {1:>6} {3:>8} {legacy * 1000:>11.2f} {'-':>11} "
+          f"{indexed * 1000:>11.2f} {legacy / indexed:>8.1f}x")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark der kompilierten Template-Engine.")
+    parser.add_argument("--project", default="DEF_88", help="Projektordner unter content/ (Standard: DEF_88)")
+    parser.add_argument("--repeat", type=int, default=20, help="Wiederholungen pro Szenario")
+    args = parser.parse_args()
+
+    print(f"{'Szenario':<28} {'Renders':>6} {'Keys':>8} {'legacy ms':>11} {'kalt ms':>11} {'cached ms':>11} {'Speedup':>9}")
+    print("-" * 90)
+    project_dir = CONTENT_DIR / args.project
+    if (project_dir / "layout_extended_v2.csv").exists():
+        run_scenario(f"Projekt {args.project}", build_project_workload(project_dir), args.repeat)
+    else:
+        print(f"   - ⚠️ Projekt '{args.project}' nicht gefunden, überspringe Projekt-Szenario.")
+    for key_count in (1_000, 10_000, 50_000):
+        run_scenario(f"Synthetisch {key_count} Keys", build_synthetic_workload(key_count), max(1, args.repeat // 4))
+    for item_count in (10, 100, 1_000, 10_000):
+        run_list_scenario(item_count, max(1, args.repeat // 4))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+"""
+Inhaltsadressierter Build-Cache für die Pipeline-Stufen.
+- Jede Stufe bildet einen Schlüssel aus den Hashes ihrer Input-Dateien
+  (inkl. des eigenen Skripts als "Generator-Version").
+- Ist der Schlüssel unverändert und existieren die Outputs noch unverändert,
+  wird die Stufe übersprungen.
+- Der Cache liegt pro Projekt in `.build_cache.json` und wandert bei
+  Umbenennungen des Projekt-Ordners mit.
+- Datei-Hashes werden über (mtime, Größe) gecached, damit ein Check nur stat() braucht.
+"""
+import hashlib
+import json
+import os
+from pathlib import Path
+
+CACHE_FILENAME = ".build_cache.json"
+CACHE_VERSION = 1
+
+
+def hash_bytes(data):
+    return hashlib.sha256(data).hexdigest()
+
+
+class BuildCache:
+    """Stufen-Cache eines Projekt-Ordners."""
+
+    def __init__(self, project_dir):
+        self.project_dir = Path(project_dir)
+        self.path = self.project_dir / CACHE_FILENAME
+        self.data = {"version": CACHE_VERSION, "stages": {}, "file_hashes": {}}
+        self._dirty = False
+        if self.path.exists():
+            try:
+                with self.path.open(encoding='utf-8') as f:
+                    data = json.load(f)
+                if data.get("version") == CACHE_VERSION:
+                    self.data = data
+            except (json.JSONDecodeError, OSError):
+                # Ein kaputter Cache ist kein Fehler, er wird einfach neu aufgebaut
+                pass
+
+    def file_hash(self, path):
+        """SHA-256 einer Datei; über (mtime_ns, size) gecached. Fehlende Dateien -> 'missing'."""
+        path = Path(path)
+        try:
+            stat = path.stat()
+        except FileNotFoundError:
+            return "missing"
+        cache_key = str(path.resolve())
+        cached = self.data["file_hashes"].get(cache_key)
+        if cached and cached[0] == stat.st_mtime_ns and cached[1] == stat.st_size:
+            return cached[2]
+        digest = hash_bytes(path.read_bytes())
+        self.data["file_hashes"][cache_key] = [stat.st_mtime_ns, stat.st_size, digest]
+        self._dirty = True
+        return digest
+
+    def stage_key(self, stage, inputs, extra=None):
+        """Schlüssel einer Stufe aus Stufenname, Input-Hashes (nach Dateiname) und optionalen Parametern."""
+        digest = hashlib.sha256(stage.encode('utf-8'))
+        for path in sorted((Path(p) for p in inputs), key=lambda p: (p.name, str(p))):
+            digest.update(f"\0{path.name}\0{self.file_hash(path)}".encode('utf-8'))
+        if extra is not None:
+            digest.update(json.dumps(extra, sort_keys=True).encode('utf-8'))
+        return digest.hexdigest()
+
+    def is_fresh(self, stage, key):
+        """True, wenn die Stufe mit diesem Schlüssel gelaufen ist und alle Outputs unverändert existieren."""
+        entry = self.data["stages"].get(stage)
+        if not entry or entry.get("key") != key:
+            return False
+        for relative_path, (mtime_ns, size) in entry.get("outputs", {}).items():
+            try:
+                stat = (self.project_dir / relative_path).stat()
+            except FileNotFoundError:
+                return False
+            if stat.st_mtime_ns != mtime_ns or stat.st_size != size:
+                return False
+        return True
+
+    def outputs(self, stage):
+        """Pfade der zuletzt aufgezeichneten Outputs einer Stufe."""
+        entry = self.data["stages"].get(stage, {})
+        return [self.project_dir / relative_path for relative_path in entry.get("outputs", {})]
+
+    def record(self, stage, key, outputs):
+        """Speichert Schlüssel und Output-Signaturen einer erfolgreich gelaufenen Stufe."""
+        recorded = {}
+        for output in outputs:
+            output = Path(output)
+            stat = output.stat()
+            recorded[os.path.relpath(output, self.project_dir)] = [stat.st_mtime_ns, stat.st_size]
+        self.data["stages"][stage] = {"key": key, "outputs": recorded}
+        self._dirty = True
+        self.save()
+
+    def invalidate(self, stage):
+        if self.data["stages"].pop(stage, None) is not None:
+            self._dirty = True
+            self.save()
+
+    def save(self):
+        if not self._dirty:
+            return
+        tmp_path = self.path.with_name(self.path.name + ".tmp")
+        with tmp_path.open('w', encoding='utf-8') as f:
+            json.dump(self.data, f, indent=2)
+        os.replace(tmp_path, self.path)
+        self._dirty = False
+
+
+def component_template_files(components_dir):
+    """Alle Komponenten-Templates (HTML + JSON) als Cache-Inputs."""
+    components_dir = Path(components_dir)
+    return sorted(list(components_dir.glob("*.html")) + list(components_dir.glob("*.json")))
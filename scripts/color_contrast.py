@@ -0,0 +1,208 @@
+#!/usr/bin/env python3
+"""
+WCAG-Kontrast-Engine (WCAG 2.x, relative Luminanz nach sRGB).
+- Linearisierung der 8-Bit-Kanäle über eine vorberechnete Tabelle mit 256 Einträgen
+  statt pow() pro Aufruf.
+- Hex-Parsing, Luminanz und Kontrast pro Farbpaar werden memoisiert.
+- Batch-API: alle Hintergrund/Text-Paare (z.B. aller Varianten) in einem Aufruf,
+  jede Hintergrundfarbe wird dabei nur einmal ausgewertet.
+- Kontrast-Reparatur: kleinste Helligkeitsverschiebung einer Markenfarbe (OKLab-L,
+  Farbton und Chroma bleiben) bis zum Zielkontrast, per Bisektion, gecacht pro
+  (Hintergrund, Markenfarbe).
+"""
+from functools import lru_cache
+
+WCAG_AA_NORMAL = 4.5
+WCAG_AA_LARGE = 3.0
+
+
+def _linearize(channel):
+    """sRGB-Kanal (0..255) -> linearer Wert (0..1), exakte Formel."""
+    c = channel / 255.0
+    return c / 12.92 if c <= 0.04045 else ((c + 0.055) / 1.055) ** 2.4
+
+
+# Alle 256 möglichen 8-Bit-Werte einmal vorberechnet
+LINEAR_LUT = tuple(_linearize(channel) for channel in range(256))
+
+
+@lru_cache(maxsize=4096)
+def parse_hex(color):
+    """'#RRGGBB', 'RRGGBB' oder '#RGB' -> (r, g, b); weitere Zeichen (z.B. Alpha) werden ignoriert."""
+    value = color.strip().lstrip('#')
+    if len(value) in (3, 4):
+        value = "".join(ch * 2 for ch in value[:3])
+    if len(value) < 6:
+        raise ValueError(f"Keine Hex-Farbe: {color!r}")
+    return int(value[0:2], 16), int(value[2:4], 16), int(value[4:6], 16)
+
+
+@lru_cache(maxsize=4096)
+def relative_luminance(color):
+    """Relative Luminanz nach WCAG (0 = Schwarz, 1 = Weiß)."""
+    r, g, b = parse_hex(color)
+    return 0.2126 * LINEAR_LUT[r] + 0.7152 * LINEAR_LUT[g] + 0.0722 * LINEAR_LUT[b]
+
+
+def luminance_contrast(lum_a, lum_b):
+    """Kontrastverhältnis zweier Luminanzen (1..21)."""
+    lighter, darker = (lum_a, lum_b) if lum_a >= lum_b else (lum_b, lum_a)
+    return (lighter + 0.05) / (darker + 0.05)
+
+
+@lru_cache(maxsize=16384)
+def contrast_ratio(color_a, color_b):
+    """WCAG-Kontrastverhältnis zweier Hex-Farben (symmetrisch)."""
+    return luminance_contrast(relative_luminance(color_a), relative_luminance(color_b))
+
+
+@lru_cache(maxsize=4096)
+def best_text_color(background, candidates=("#000000", "#FFFFFF")):
+    """Erster Kandidat mit AA-Kontrast (4.5:1), sonst der mit dem höchsten Kontrast."""
+    for candidate in candidates:
+        if contrast_ratio(background, candidate) >= WCAG_AA_NORMAL:
+            return candidate
+    return max(candidates, key=lambda candidate: contrast_ratio(background, candidate))
+
+
+def contrast_table(backgrounds, text_colors):
+    """
+    Batch-API: {(hintergrund, text): kontrast} für alle Kombinationen.
+    `backgrounds` darf Duplikate enthalten (z.B. alle Komponenten aller Varianten).
+    """
+    text_luminance = {text: relative_luminance(text) for text in dict.fromkeys(text_colors)}
+    table = {}
+    for background in dict.fromkeys(backgrounds):
+        background_luminance = relative_luminance(background)
+        for text, luminance in text_luminance.items():
+            table[(background, text)] = luminance_contrast(background_luminance, luminance)
+    return table
+
+
+def score_variants(variant_backgrounds, text_colors):
+    """
+    Kontraste für alle Varianten auf einmal.
+    `variant_backgrounds`: {variante: {komponente: hintergrund}} ->
+    {variante: {komponente: {text: kontrast}}}
+    """
+    table = contrast_table((bg for backgrounds in variant_backgrounds.values() for bg in backgrounds.values()), text_colors)
+    return {variant: {component: {text: table[(background, text)] for text in text_colors}
+                      for component, background in backgrounds.items()}
+            for variant, backgrounds in variant_backgrounds.items()}
+
+
+# ============================================================================
+# KONTRAST-REPARATUR (OKLab)
+# ============================================================================
+
+REPAIR_STEPS = 16  # Bisektionsschritte auf L (Auflösung ~1.5e-5, unter einer 8-Bit-Stufe)
+GAMUT_STEPS = 12   # Bisektionsschritte beim Reduzieren des Chromas
+
+
+def _delinearize(value):
+    """Linearer Wert (0..1) -> sRGB-Kanal (0..255), auf den Gamut begrenzt."""
+    value = min(max(value, 0.0), 1.0)
+    c = value * 12.92 if value <= 0.0031308 else 1.055 * value ** (1 / 2.4) - 0.055
+    return int(round(c * 255))
+
+
+@lru_cache(maxsize=4096)
+def hex_to_oklab(color):
+    """Hex-Farbe -> (L, a, b) in OKLab."""
+    r, g, b = (LINEAR_LUT[channel] for channel in parse_hex(color))
+    l = (0.4122214708 * r + 0.5363325363 * g + 0.0514459929 * b) ** (1 / 3)
+    m = (0.2119034982 * r + 0.6806995451 * g + 0.1073969566 * b) ** (1 / 3)
+    s = (0.0883024619 * r + 0.2817188376 * g + 0.6299787005 * b) ** (1 / 3)
+    return (0.2104542553 * l + 0.7936177850 * m - 0.0040720468 * s,
+            1.9779984951 * l - 2.4285922050 * m + 0.4505937099 * s,
+            0.0259040371 * l + 0.7827717662 * m - 0.8086757660 * s)
+
+
+def _oklab_to_linear(lightness, a, b):
+    l = (lightness + 0.3963377774 * a + 0.2158037573 * b) ** 3
+    m = (lightness - 0.1055613458 * a - 0.0638541728 * b) ** 3
+    s = (lightness - 0.0894841775 * a - 1.2914855480 * b) ** 3
+    return (4.0767416621 * l - 3.3077115913 * m + 0.2309699292 * s,
+            -1.2684380046 * l + 2.6097574011 * m - 0.3413193965 * s,
+            -0.0041960771 * l - 0.7034186147 * m + 1.7076147010 * s)
+
+
+def _in_gamut(rgb, epsilon=1e-6):
+    return all(-epsilon <= value <= 1 + epsilon for value in rgb)
+
+
+def _oklab_to_rgb8(lightness, a, b):
+    """
+    (L, a, b) in OKLab -> 8-Bit-sRGB. Außerhalb des Gamuts wird (wie bei CSS Color 4)
+    das Chroma bei gleichem L und Farbton reduziert, statt Kanäle abzuschneiden;
+    dadurch steigt die Luminanz monoton mit L und L=0/1 ergibt Schwarz/Weiß.
+    """
+    lightness = min(max(lightness, 0.0), 1.0)
+    rgb = _oklab_to_linear(lightness, a, b)
+    if not _in_gamut(rgb):
+        low, high = 0.0, 1.0
+        for _ in range(GAMUT_STEPS):
+            scale = (low + high) / 2
+            if _in_gamut(_oklab_to_linear(lightness, a * scale, b * scale)):
+                low = scale
+            else:
+                high = scale
+        rgb = _oklab_to_linear(lightness, a * low, b * low)
+    return tuple(_delinearize(value) for value in rgb)
+
+
+def oklab_to_hex(lightness, a, b):
+    """(L, a, b) in OKLab -> Hex-Farbe (gamut-gemappt)."""
+    return "#%02X%02X%02X" % _oklab_to_rgb8(lightness, a, b)
+
+
+def _rgb8_luminance(rgb):
+    r, g, b = rgb
+    return 0.2126 * LINEAR_LUT[r] + 0.7152 * LINEAR_LUT[g] + 0.0722 * LINEAR_LUT[b]
+
+
+def _bisect_lightness(background_luminance, lab, limit, target):
+    """
+    Kleinste Verschiebung von L Richtung `limit` (0 oder 1), bei der der Kontrast `target` erreicht.
+    Geprüft wird immer die gerundete 8-Bit-Farbe; Zwischenwerte laufen bewusst an den Caches vorbei.
+    """
+    lightness, a, b = lab
+    readable = lambda value: luminance_contrast(background_luminance, _rgb8_luminance(_oklab_to_rgb8(value, a, b))) >= target
+    if not readable(limit):
+        return None
+    near, far = lightness, limit
+    for _ in range(REPAIR_STEPS):
+        middle = (near + far) / 2
+        if readable(middle):
+            far = middle
+        else:
+            near = middle
+    return oklab_to_hex(far, a, b), abs(far - lightness)
+
+
+def repair_contrast(background, brand, target=WCAG_AA_NORMAL):
+    """
+    Markenfarbe mit der kleinsten Helligkeitsverschiebung (OKLab-L), die auf `background`
+    mindestens `target` erreicht. Lesbare Farben bleiben unverändert (normalisiert auf #RRGGBB).
+    Ist das Ziel in keiner Richtung erreichbar, wird Schwarz oder Weiß (der höhere Kontrast) geliefert.
+    """
+    return _repair_contrast(background, brand, target)
+
+
+@lru_cache(maxsize=65536)
+def _repair_contrast(background, brand, target):
+    brand = "#%02X%02X%02X" % parse_hex(brand)
+    if contrast_ratio(background, brand) >= target:
+        return brand
+    background_luminance = relative_luminance(background)
+    lab = hex_to_oklab(brand)
+    # Abdunkeln und Aufhellen prüfen, die kleinere Verschiebung gewinnt
+    candidates = [found for found in (_bisect_lightness(background_luminance, lab, limit, target) for limit in (0.0, 1.0)) if found]
+    if candidates:
+        return min(candidates, key=lambda found: found[1])[0]
+    return max(("#000000", "#FFFFFF"), key=lambda color: contrast_ratio(background, color))
+
+
+def repair_table(pairs, target=WCAG_AA_NORMAL):
+    """Batch-API: {(hintergrund, markenfarbe): reparierte farbe}, jedes Paar nur einmal gelöst."""
+    return {(background, brand): repair_contrast(background, brand, target) for background, brand in dict.fromkeys(pairs)}
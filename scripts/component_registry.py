@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+"""
+In-Memory-Registry für templates/components.
+- Lädt pro Komponente HTML, JSON-Schema und die Listen-Marker genau einmal.
+- Invalidiert Einträge, sobald sich die mtime der HTML- oder JSON-Datei ändert.
+- Eine Instanz pro Komponenten-Ordner wird über alle Projekte und Styles eines Laufs geteilt.
+"""
+import json
+import logging
+from pathlib import Path
+
+from template_engine import compile_template, index_list_blocks
+
+# Dateien im Komponenten-Ordner, die keine Komponenten sind
+NON_COMPONENT_FILES = {"_defaults", "_placeholder_assets", "style_modulator"}
+
+
+def _mtime(path):
+    try:
+        return path.stat().st_mtime_ns
+    except FileNotFoundError:
+        return None
+
+
+class ComponentEntry:
+    """Geladene Komponente: HTML, kompiliertes Template, Schema und Listen-Index."""
+
+    __slots__ = ("name", "html", "template", "schema", "list_index", "html_mtime", "json_mtime")
+
+    def __init__(self, name, html, schema, html_mtime, json_mtime):
+        self.name = name
+        self.html = html
+        self.template = compile_template(html)
+        self.schema = schema
+        self.list_index = index_list_blocks(html)
+        self.html_mtime = html_mtime
+        self.json_mtime = json_mtime
+
+    @property
+    def list_markers(self):
+        """z.B. ["benefits_section.benefits_list"]"""
+        return self.list_index.markers
+
+
+class ComponentRegistry:
+    """Lazy geladener, mtime-validierter Cache aller Komponenten eines Ordners."""
+
+    def __init__(self, components_dir):
+        self.components_dir = Path(components_dir)
+        self._entries = {}
+        self.loads = 0
+
+    def get(self, name):
+        """Gibt die Komponente `name` zurück oder None, wenn kein HTML-Template existiert."""
+        html_path = self.components_dir / f"{name}.html"
+        json_path = self.components_dir / f"{name}.json"
+        html_mtime = _mtime(html_path)
+        if html_mtime is None:
+            self._entries.pop(name, None)
+            return None
+        json_mtime = _mtime(json_path)
+        entry = self._entries.get(name)
+        if entry is not None and entry.html_mtime == html_mtime and entry.json_mtime == json_mtime:
+            return entry
+
+        entry = ComponentEntry(name, html_path.read_text(encoding='utf-8'), self._load_schema(json_path), html_mtime, json_mtime)
+        self._entries[name] = entry
+        self.loads += 1
+        return entry
+
+    def get_schema(self, name):
+        """JSON-Schema einer Komponente (auch ohne HTML-Template), sonst {}."""
+        entry = self.get(name)
+        if entry is not None:
+            return entry.schema
+        return self._load_schema(self.components_dir / f"{name}.json")
+
+    def names(self):
+        """Alle Komponenten-Namen mit HTML- oder JSON-Datei (ohne Hilfsdateien)."""
+        names = {p.stem for p in self.components_dir.glob("*.html")}
+        names.update(p.stem for p in self.components_dir.glob("*.json"))
+        return sorted(names - NON_COMPONENT_FILES)
+
+    def schemas(self):
+        """Mapping Komponenten-Name -> JSON-Schema für alle Komponenten."""
+        return {name: self.get_schema(name) for name in self.names()}
+
+    @staticmethod
+    def _load_schema(json_path):
+        if not json_path.exists():
+            return {}
+        try:
+            with json_path.open(encoding='utf-8') as f:
+                return json.load(f)
+        except json.JSONDecodeError as e:
+            logging.error(f"Fehler beim Parsen von JSON in {json_path}: {e}")
+            return {}
+
+
+_REGISTRIES = {}
+
+
+def get_registry(components_dir):
+    """Geteilte Registry pro Komponenten-Ordner für den gesamten Lauf."""
+    key = Path(components_dir).resolve()
+    if key not in _REGISTRIES:
+        _REGISTRIES[key] = ComponentRegistry(key)
+    return _REGISTRIES[key]
@@ -0,0 +1,196 @@
+#!/usr/bin/env python3
+"""
+Stufe02 als Overlay über dem Stufe01-Template.
+- Eine Stufe02-Datei enthält nur noch die injizierten Style-Felder pro Komponente
+  und verweist per SHA-256 auf ihre Stufe01-Basis (statt einer vollen Kopie pro Variante).
+- Der Generator löst das Overlay lazy auf: die Basis wird erst beim ersten Zugriff
+  geladen, einmal pro Inhalts-Hash geparst und von allen Varianten geteilt.
+- Aufgelöst wird gegen die aktuelle Stufe01-Datei: wurde sie nach dem Injizieren bearbeitet,
+  greift die Änderung mit einer Warnung (statt die Basis als fehlend zu behandeln). Nur wenn die
+  referenzierte Datei fehlt, wird per Hash in anderen Generationen und im Archiv gesucht.
+- Instanzen werden beim ersten Zugriff auf ihre Komponente als flache, read-only
+  Zusammenführung (Basis-Instanz + Style-Felder) angelegt, mit derselben Key-Reihenfolge
+  wie die früheren vollen Kopien. Alle Feld-Werte und Listen bleiben geteilt.
+- Dasselbe Modell dient im Speicher als Varianten-Schicht (styled_view): alle
+  unveränderten Teilbäume werden mit der Basis geteilt, nur die Style-Felder sind neu.
+  Die Sichten sind read-only (MappingProxyType, keine Setter).
+- Alte, volle Stufe02-Dateien werden unverändert weiter akzeptiert.
+"""
+import hashlib
+import json
+import logging
+import zipfile
+from collections.abc import Mapping
+from pathlib import Path
+from types import MappingProxyType
+
+from artifact_retention import ARCHIVE_FILENAME, archived_versions, load_archive_index
+from project_index import get_project_index
+
+OVERLAY_FORMAT = "stufe02-overlay-v1"
+BASE_KIND = "project_template_Stufe01_Anleitung"
+
+# Style-Key aus interpreted_styles -> (Feldname in der Instanz, Beschreibung)
+STYLE_FIELDS = (
+    ("class", "styling_default", "CSS-Klasse für das Haupt-Styling."),
+    ("background_color", "background_color", "Hintergrundfarbe der Sektion."),
+    ("card_style", "card_style", "Styling-Typ für Karten innerhalb der Sektion."),
+    ("image_frame", "image_frame", "Rahmen-Stil für Bilder."),
+    ("button_style", "button_style", "Styling für Buttons."),
+)
+
+_BASES = {}
+
+
+def style_fields(component_style):
+    """Die injizierten Felder einer Komponente (gleich für alle ihre Instanzen)."""
+    return {field: {"description": description, "value": component_style[style_key]}
+            for style_key, field, description in STYLE_FIELDS if style_key in component_style}
+
+
+def _overlay(base_ref, base_template, styles_data, variant, generator_version):
+    return {
+        "format": OVERLAY_FORMAT,
+        "base": base_ref,
+        "metadata": {"generator_version": generator_version, "injected_style": variant},
+        "component_styles": {component: style_fields(styles_data[component])
+                             for component in base_template.get("page_content", {}) if component in styles_data},
+    }
+
+
+def build_overlay(base_template, base_file, base_sha256, styles_data, variant, generator_version):
+    """Overlay einer Variante: Verweis auf die Basis plus Style-Felder pro Komponente."""
+    base_ref = {"file": Path(base_file).name, "sha256": base_sha256}
+    return _overlay(base_ref, base_template, styles_data, variant, generator_version)
+
+
+def is_overlay(data):
+    return isinstance(data, Mapping) and data.get("format") == OVERLAY_FORMAT
+
+
+def _sha256(data):
+    return hashlib.sha256(data).hexdigest()
+
+
+def locate_base(project_dir, base_ref):
+    """
+    Stufe01-Basis eines Overlays als (Datei, Archiv-Member oder None).
+    Reihenfolge: referenzierte Datei (auch wenn bearbeitet), eine andere Generation oder ein
+    archiviertes Artefakt mit passendem Hash, zuletzt die neueste Stufe01-Generation.
+    """
+    project_dir = Path(project_dir)
+    referenced = project_dir / base_ref["file"]
+    if referenced.exists():
+        return referenced, None
+    sha256 = base_ref["sha256"]
+    generations = [artifact.path for artifact in reversed(get_project_index(project_dir).generations(BASE_KIND))]
+    for path in generations:
+        if _sha256(path.read_bytes()) == sha256:
+            return path, None
+    # Ältere Basis kann per Retention (gc) ins Archiv gewandert sein
+    archive_path = project_dir / ARCHIVE_FILENAME
+    if archive_path.exists():
+        for entry in archived_versions(load_archive_index(project_dir)):
+            if entry["sha256"] == sha256:
+                return archive_path, entry["member"]
+    if generations:
+        return generations[0], None
+    raise FileNotFoundError(f"Stufe01-Basis {base_ref['file']} ({sha256[:12]}) nicht in {project_dir} gefunden.")
+
+
+def _read_base_bytes(project_dir, base_ref):
+    path, member = locate_base(project_dir, base_ref)
+    if member is None:
+        return path.name, path.read_bytes()
+    with zipfile.ZipFile(path) as archive:
+        return member, archive.read(member)
+
+
+def load_base(project_dir, base_ref):
+    """Geparste Stufe01-Basis; einmal pro Inhalts-Hash geladen und zwischen allen Varianten geteilt."""
+    name, data = _read_base_bytes(Path(project_dir), base_ref)
+    sha256 = _sha256(data)
+    if sha256 not in _BASES:
+        if sha256 != base_ref["sha256"]:
+            logging.warning(f"Stufe01-Basis {base_ref['file']} wurde nach dem Injizieren geändert "
+                            f"({base_ref['sha256'][:12]} -> {sha256[:12]}); verwende {name}.")
+        _BASES[sha256] = json.loads(data)
+    return _BASES[sha256]
+
+
+def base_file(data, project_dir):
+    """Datei, aus der die Basis eines Overlays geladen wird (für Cache-Schlüssel); None bei vollen Dateien."""
+    return locate_base(project_dir, data["base"])[0] if is_overlay(data) else None
+
+
+class StyledPageContent(Mapping):
+    """page_content einer Variante: Basis-Instanzen mit vorgeschalteten Style-Feldern."""
+
+    def __init__(self, base_page_content, component_styles):
+        self._base = base_page_content
+        self._styles = component_styles
+        self._resolved = {}
+
+    def __getitem__(self, component):
+        if component not in self._resolved:
+            instances = self._base[component]
+            fields = self._styles.get(component)
+            # Nur die oberste Ebene jeder Instanz wird neu angelegt, die Werte bleiben geteilt
+            self._resolved[component] = [MappingProxyType({**instance, **fields}) for instance in instances] if fields else instances
+        return self._resolved[component]
+
+    def __iter__(self):
+        return iter(self._base)
+
+    def __len__(self):
+        return len(self._base)
+
+
+class StyledContent(Mapping):
+    """Lazy aufgelöste Stufe02-Datei (Overlay + geteilte Stufe01-Basis)."""
+
+    def __init__(self, overlay, project_dir=None, base=None):
+        self.overlay = overlay
+        self.project_dir = Path(project_dir) if project_dir is not None else None
+        self._base = base
+        self._page_content = None
+
+    @property
+    def base(self):
+        if self._base is None:
+            self._base = load_base(self.project_dir, self.overlay["base"])
+        return self._base
+
+    def __getitem__(self, key):
+        if key == "metadata":
+            return {**self.base.get("metadata", {}), **self.overlay["metadata"]}
+        if key == "page_content":
+            if self._page_content is None:
+                self._page_content = StyledPageContent(self.base.get("page_content", {}), self.overlay["component_styles"])
+            return self._page_content
+        return self.base[key]
+
+    def __iter__(self):
+        return iter(self.base)
+
+    def __len__(self):
+        return len(self.base)
+
+
+def styled_view(base_template, styles_data, variant, generator_version):
+    """Varianten-Schicht im Speicher: teilt alle Basis-Teilbäume, statt sie tief zu kopieren."""
+    return StyledContent(_overlay(None, base_template, styles_data, variant, generator_version), base=base_template)
+
+
+def resolve_content(data, project_dir):
+    """Stufe02-Daten für den Generator: Overlays werden lazy aufgelöst, volle Dateien bleiben wie sie sind."""
+    return StyledContent(data, project_dir) if is_overlay(data) else data
+
+
+def materialize(data):
+    """Tiefe Kopie als normale dicts/lists (z.B. für json.dump oder Code, der dicts erwartet)."""
+    if isinstance(data, Mapping):
+        return {key: materialize(value) for key, value in data.items()}
+    if isinstance(data, (list, tuple)):
+        return [materialize(item) for item in data]
+    return data
@@ -0,0 +1,72 @@
+#!/usr/bin/env python3
+"""
+CSS-Konsolidierung für generierte Seiten.
+- Zieht die <style>-Blöcke aus Komponenten-HTML (pro HTML-Text einmal, gecacht).
+- Dedupliziert Blöcke über einen Hash ihres Inhalts: eine Komponente, die mehrfach
+  auf der Seite vorkommt (oder zusätzlich im Footer-Durchlauf), liefert ihr CSS nur einmal.
+- Fügt alle Blöcke in der Reihenfolge ihres ersten Auftretens zu einem Stylesheet
+  für den <head> zusammen und zählt die eingesparten Bytes.
+- Optional läuft jeder eindeutige Block durch eine Pruning-Funktion (z.B. css_pruner.ThemePruner).
+"""
+import hashlib
+import re
+from functools import lru_cache
+
+STYLE_BLOCK = re.compile(r'<style>(.*?)</style>', re.DOTALL)
+
+
+@lru_cache(maxsize=256)
+def split_styles(html):
+    """HTML -> (HTML ohne <style>-Blöcke, Tupel der Block-Inhalte)."""
+    return STYLE_BLOCK.sub('', html), tuple(STYLE_BLOCK.findall(html))
+
+
+def block_hash(css):
+    """Inhalts-Hash eines Blocks; Whitespace am Rand zählt nicht."""
+    return hashlib.sha256(css.strip().encode('utf-8')).hexdigest()
+
+
+class StyleSheet:
+    """Sammelt CSS-Blöcke einer Seite, dedupliziert und in stabiler Reihenfolge."""
+
+    def __init__(self, prune=None):
+        self.prune = prune
+        self.bytes_pruned = 0
+        self.blocks = []
+        self.hashes = set()
+        self.blocks_seen = 0
+        self.bytes_in = 0
+
+    def add(self, css):
+        """Fügt einen Block-Inhalt hinzu; True, wenn er neu war."""
+        self.blocks_seen += 1
+        self.bytes_in += len(f"<style>{css}</style>".encode('utf-8'))
+        digest = block_hash(css)
+        if digest in self.hashes:
+            return False
+        self.hashes.add(digest)
+        if self.prune is not None:
+            pruned = self.prune(css)
+            self.bytes_pruned += len(css.encode('utf-8')) - len(pruned.encode('utf-8'))
+            css = pruned
+        self.blocks.append(css.strip('\n'))
+        return True
+
+    def extract(self, html):
+        """Entfernt die <style>-Blöcke aus `html`, übernimmt sie ins Stylesheet, liefert das HTML ohne sie."""
+        stripped, blocks = split_styles(html)
+        for css in blocks:
+            self.add(css)
+        return stripped
+
+    def render(self):
+        """Ein einziger <style>-Block mit allen eindeutigen Blöcken (leer, wenn keine)."""
+        if not self.blocks:
+            return ""
+        return "<style>\n" + "\n".join(self.blocks) + "\n</style>\n"
+
+    def report(self):
+        """Kennzahlen für das Log: Blöcke gesamt/eindeutig und eingesparte Bytes (davon durch Pruning)."""
+        bytes_out = len(self.render().encode('utf-8'))
+        return {"blocks": self.blocks_seen, "unique": len(self.blocks), "bytes_in": self.bytes_in,
+                "bytes_out": bytes_out, "bytes_saved": self.bytes_in - bytes_out, "bytes_pruned": self.bytes_pruned}
@@ -0,0 +1,246 @@
+#!/usr/bin/env python3
+"""
+Entfernt CSS-Regeln, die unter den Body-Klassen einer Seite nicht greifen können.
+- Die Komponenten enthalten Regeln für alle Themes (.bg-solid, .bg-gradient, .card-flat, ...),
+  eine Seite aktiviert über theme_classes aber nur eine Kombination.
+- Theme-Klassen (das Vokabular) stehen im Schema des Headers unter
+  theme_classes.available_options; sie werden nur am <body> gesetzt. Ein Selektor, der eine
+  Theme-Klasse verlangt, die nicht aktiv ist, wird entfernt; eine Regel ohne verbleibende
+  Selektoren fällt ganz weg, ebenso leere @media-/@supports-Blöcke.
+- Konservativ: Selektoren mit :not(...) sowie Regeln mit Kommentaren im Selektor und
+  unbekannte At-Regeln (@keyframes, @font-face, ...) bleiben unverändert; Kommentare vor
+  einer entfernten Regel bleiben stehen.
+- Jeder Block wird einmal geparst; das Ergebnis wird pro (Block, aktive Theme-Klassen) gecacht.
+"""
+import re
+from functools import lru_cache
+
+from css_consolidator import STYLE_BLOCK
+
+CLASS_SELECTOR = re.compile(r'\.(-?[_a-zA-Z][\w-]*)')
+# Whitespace und Kommentare vor dem eigentlichen Selektor (bleiben beim Entfernen stehen)
+LEADING_TRIVIA = re.compile(r'\s*(?:/\*.*?\*/\s*)*', re.DOTALL)
+GROUP_AT_RULES = ("@media", "@supports", "@container", "@layer")
+
+
+def theme_vocabulary(header_schema):
+    """Alle Theme-Klassen aus theme_classes.available_options des Header-Schemas."""
+    options = header_schema.get("theme_classes", {}).get("available_options", {})
+    return frozenset(cls for classes in options.values() for cls in classes)
+
+
+def _skip(css, i):
+    """Überspringt Kommentar oder String ab Position i; liefert die Position danach (oder i)."""
+    if css.startswith("/*", i):
+        end = css.find("*/", i + 2)
+        return len(css) if end == -1 else end + 2
+    if css[i] in "\"'":
+        quote = css[i]
+        i += 1
+        while i < len(css) and css[i] != quote:
+            i += 2 if css[i] == "\\" else 1
+        return i + 1
+    return i
+
+
+def _matching_brace(css, open_index):
+    depth = 0
+    i = open_index
+    while i < len(css):
+        j = _skip(css, i)
+        if j != i:
+            i = j
+            continue
+        if css[i] == "{":
+            depth += 1
+        elif css[i] == "}":
+            depth -= 1
+            if depth == 0:
+                return i
+        i += 1
+    return None
+
+
+def _prelude_end(css, start):
+    """Position von '{' oder ';' (Ende einer Anweisung wie @import) ab `start`, sonst None."""
+    i = start
+    depth = 0
+    while i < len(css):
+        j = _skip(css, i)
+        if j != i:
+            i = j
+            continue
+        char = css[i]
+        if char == "(":
+            depth += 1
+        elif char == ")":
+            depth -= 1
+        elif depth == 0 and char in "{;":
+            return i
+        i += 1
+    return None
+
+
+@lru_cache(maxsize=512)
+def parse_css(css):
+    """
+    CSS -> Tupel von Knoten, die zusammen wieder den Originaltext ergeben:
+    ("raw", text), ("rule", prelude, block) oder ("group", kopf, kinder, "}").
+    """
+    nodes = []
+    i = 0
+    while i < len(css):
+        end = _prelude_end(css, i)
+        if end is None or css[end] == ";":
+            stop = len(css) if end is None else end + 1
+            nodes.append(("raw", css[i:stop]))
+            i = stop
+            continue
+        close = _matching_brace(css, end)
+        if close is None:
+            nodes.append(("raw", css[i:]))
+            break
+        prelude = css[i:end]
+        keyword = prelude.strip().split(None, 1)[0].lower() if prelude.strip() else ""
+        if keyword.startswith("@"):
+            if keyword in GROUP_AT_RULES:
+                nodes.append(("group", css[i:end + 1], parse_css(css[end + 1:close]), "}"))
+            else:
+                nodes.append(("raw", css[i:close + 1]))
+        else:
+            nodes.append(("rule", prelude, css[end:close + 1]))
+        i = close + 1
+    return tuple(nodes)
+
+
+def _split_selectors(selector_text):
+    """Selektorliste an Kommas außerhalb von Klammern trennen."""
+    parts, depth, start = [], 0, 0
+    for i, char in enumerate(selector_text):
+        if char == "(":
+            depth += 1
+        elif char == ")":
+            depth -= 1
+        elif char == "," and depth == 0:
+            parts.append(selector_text[start:i])
+            start = i + 1
+    parts.append(selector_text[start:])
+    return [part.strip() for part in parts]
+
+
+def _can_match(selector, inactive):
+    if ":not(" in selector:
+        return True
+    return not any(cls in inactive for cls in CLASS_SELECTOR.findall(selector))
+
+
+def _prune_nodes(nodes, inactive):
+    output = []
+    kept_rules = 0
+    for node in nodes:
+        if node[0] == "raw":
+            output.append(node[1])
+        elif node[0] == "rule":
+            prelude, block = node[1], node[2]
+            lead = LEADING_TRIVIA.match(prelude).group(0)
+            selector_text = prelude[len(lead):]
+            if "/*" in selector_text:
+                output.append(prelude + block)
+                kept_rules += 1
+                continue
+            selectors = _split_selectors(selector_text)
+            kept = [selector for selector in selectors if _can_match(selector, inactive)]
+            if len(kept) == len(selectors):
+                output.append(prelude + block)
+            elif kept:
+                output.append(f"{lead}{', '.join(kept)} {block}")
+            else:
+                output.append(lead)
+                continue
+            kept_rules += 1
+        else:
+            head, children, tail = node[1], node[2], node[3]
+            body, child_rules = _prune_nodes(children, inactive)
+            has_rules = any(child[0] != "raw" for child in children)
+            if child_rules or not has_rules:
+                output.append(head + body + tail)
+                kept_rules += 1
+    return "".join(output), kept_rules
+
+
+@lru_cache(maxsize=2048)
+def prune_css(css, active_classes, vocabulary):
+    """CSS-Block ohne Regeln für nicht aktive Theme-Klassen (`active_classes`, `vocabulary`: frozensets)."""
+    inactive = vocabulary - active_classes
+    if not inactive or not any(cls in css for cls in inactive):
+        return css
+    return _prune_nodes(parse_css(css), inactive)[0]
+
+
+class ThemePruner:
+    """Pruning-Funktion für eine Seite: aktive Body-Klassen gegen das Theme-Vokabular."""
+
+    def __init__(self, body_classes, vocabulary):
+        self.active = frozenset(body_classes.split() if isinstance(body_classes, str) else body_classes)
+        self.vocabulary = frozenset(vocabulary)
+
+    def __call__(self, css):
+        return prune_css(css, self.active, self.vocabulary)
+
+
+def prune_style_blocks(html, prune):
+    """
+    Wendet `prune` auf jeden <style>-Block einer fertigen Seite an (auch Blöcke im <body>).
+    -> (Seite, Anzahl entfernter Bytes)
+    """
+    removed = 0
+
+    def prune_block(match):
+        nonlocal removed
+        css = match.group(1)
+        pruned = prune(css)
+        removed += len(css.encode('utf-8')) - len(pruned.encode('utf-8'))
+        return f"<style>{pruned}</style>"
+
+    return STYLE_BLOCK.sub(prune_block, html), removed
+
+
+def prune_style_chunks(chunks, prune, stats=None):
+    """
+    Streaming-Variante von prune_style_blocks: Text außerhalb von <style> wird sofort
+    weitergereicht, nur der Inhalt eines offenen <style>-Blocks wird gepuffert.
+    `stats` (dict) erhält 'bytes_pruned'.
+    """
+    open_tag, close_tag = "<style>", "</style>"
+    buffer = ""
+    in_style = False
+    removed = 0
+    for chunk in chunks:
+        buffer += chunk
+        while True:
+            if in_style:
+                end = buffer.find(close_tag)
+                if end < 0:
+                    break
+                css = buffer[:end]
+                pruned = prune(css)
+                removed += len(css.encode('utf-8')) - len(pruned.encode('utf-8'))
+                yield pruned + close_tag
+                buffer = buffer[end + len(close_tag):]
+                in_style = False
+            else:
+                start = buffer.find(open_tag)
+                if start < 0:
+                    # Ein angeschnittenes "<style" am Ende zurückhalten
+                    keep = len(open_tag) - 1
+                    if len(buffer) > keep:
+                        yield buffer[:-keep]
+                        buffer = buffer[-keep:]
+                    break
+                yield buffer[:start + len(open_tag)]
+                buffer = buffer[start + len(open_tag):]
+                in_style = True
+    if buffer:
+        yield buffer
+    if stats is not None:
+        stats["bytes_pruned"] = removed
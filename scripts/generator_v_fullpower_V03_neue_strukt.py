@@ -4,15 +4,38 @@ CompanyCultureHub HTML Generator v5.1 (Final)
 - Reads the new, structured Stufe02 JSON format.
 - Fully supports preview mode with placeholder texts and images.
 - Generates all four styling variants from the project folder.
+- Optional: --jobs N verteilt Projekte auf N Prozesse, Styles laufen pro Projekt auf Threads.
+- Build-Cache: Projekte mit unveränderten Inputs werden übersprungen (--force erzwingt alles).
+- Projekt-Zustand (Status, Input-Schlüssel, Outputs) liegt in content/.project_state.sqlite;
+  Content-Ordner werden nicht mehr in processed_<name>_<datum> umbenannt.
+- Optional: --minify minifiziert HTML und CSS der Seiten im selben Streaming-Durchlauf.
+- Optional: --gzip LEVEL schreibt vorkomprimierte .html.gz-Dateien (Thread-Pool, parallel zum Rendern)
+  und docs/manifest.json mit Hash und Größe aller Artefakte; ein vorhandenes Manifest wird bei
+  jedem Lauf nachgeführt.
 """
 import json
 import csv
-import re
-import shutil
+import argparse
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from contextlib import nullcontext
 from pathlib import Path
-from datetime import datetime
 import logging
 
+# Import der Template-Engine und der Komponenten-Registry
+import sys
+sys.path.append(str(Path(__file__).parent))
+from template_engine import render_template, resolve_mapping_values
+from component_registry import get_registry
+from html_writer import write_chunks
+from html_minifier import minify_chunks
+from css_pruner import ThemePruner, prune_style_chunks, theme_vocabulary
+from precompress import GZIP_SUFFIX, ArtifactManifest, Precompressor
+from output_store import OutputStore, parse_page_name
+from project_state import STATE_FILENAME, ProjectStateStore, discover_projects
+from build_cache import BuildCache, component_template_files
+from project_index import get_project_index
+from content_overlay import base_file, resolve_content
+
 # ==============================================================================
 # 1. KONFIGURATION & PFADE
 # ==============================================================================
@@ -23,9 +46,20 @@ COMPONENTS_DIR = TEMPLATES_DIR / "components"
 OUTPUT_DIR = BASE_DIR / "docs"
 OUTPUT_DIR.mkdir(exist_ok=True)
 
-# Logging einrichten
+# Komponenten werden einmal pro Lauf geladen und über alle Projekte/Styles geteilt
+COMPONENT_REGISTRY = get_registry(COMPONENTS_DIR)
+
+# Theme-Klassen (Vokabular für das CSS-Pruning) aus dem Schema des Headers
+THEME_VOCABULARY = theme_vocabulary(COMPONENT_REGISTRY.schemas().get("technik_header_section", {}))
+
+# Code, der das Ergebnis beeinflusst, gehört zum Cache-Schlüssel ("Generator-Version")
+SCRIPT_DIR = Path(__file__).resolve().parent
+GENERATOR_CODE_FILES = [Path(__file__).resolve()] + [SCRIPT_DIR / name for name in ("template_engine.py", "component_registry.py", "html_writer.py", "project_index.py", "content_overlay.py", "html_minifier.py", "precompress.py", "css_pruner.py", "css_consolidator.py")]
+CACHE_STAGE = "generate_site"
+
+# Logging einrichten (Worker-Prozesse, die das Modul neu importieren, hängen nur an)
 LOG_FILE = OUTPUT_DIR / "html_generator.log"
-logging.basicConfig(filename=LOG_FILE, level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s', filemode='w')
+logging.basicConfig(filename=LOG_FILE, level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s', filemode='w' if __name__ == "__main__" else 'a')
 
 # ==============================================================================
 # 2. HELFERFUNKTIONEN
@@ -33,7 +67,7 @@ logging.basicConfig(filename=LOG_FILE, level=logging.INFO, format='%(asctime)s -
 
 def load_json(file_path, default=None):
     """Lädt eine JSON-Datei sicher."""
-    if not file_path.exists():
+    if file_path is None or not file_path.exists():
         logging.warning(f"JSON-Datei nicht gefunden: {file_path}")
         return default if default is not None else {}
     try:
@@ -43,13 +77,6 @@ def load_json(file_path, default=None):
         logging.error(f"Fehler beim Parsen von JSON in {file_path}: {e}")
         return default if default is not None else {}
 
-def find_newest_file(directory, pattern):
-    """Findet die neueste Datei in einem Ordner, die einem Muster entspricht."""
-    try:
-        return max(directory.glob(pattern), key=lambda f: f.stat().st_mtime)
-    except ValueError:
-        return None
-
 def flatten_dict(d, parent_key='', sep='.'):
     """Macht ein verschachteltes Dictionary flach."""
     items = []
@@ -61,11 +88,11 @@ def flatten_dict(d, parent_key='', sep='.'):
             items.append((new_key, v))
     return dict(items)
 def replace_placeholders(html, data_dict):
-    """Ersetzt alle {{key}} Platzhalter in einem HTML-String."""
-    for key, value in data_dict.items():
-        # Stelle sicher, dass der Wert ein String ist, um Fehler zu vermeiden
-        html = html.replace(f"{{{{{key}}}}}", str(value))
-    return html
+    """
+    Ersetzt alle {{key}} Platzhalter in einem HTML-String (ein Durchlauf, kompiliertes Template).
+    Werte, die selbst Platzhalter enthalten, werden vorher aufgelöst.
+    """
+    return render_template(html, resolve_mapping_values(data_dict))
 
 # ==============================================================================
 # 3. KERNLOGIK DES HTML-GENERATORS
@@ -79,11 +106,12 @@ def replace_placeholders(html, data_dict):
 # 3. KERNLOGIK DES HTML-GENERATORS (FINALE, REPARIERTE VERSION V5.3)
 # ==============================================================================
 
-def generate_site_for_style(project_dir, style_name, content_data, layout_plan, placeholder_assets, global_defaults):
-    """Generiert eine einzelne HTML-Datei für einen bestimmten Style."""
-    project_name = project_dir.name
-    print(f"   - 🎨 Generiere Seite für Style: '{style_name}'")
-
+def iter_site_chunks(project_dir, style_name, content_data, layout_plan, placeholder_assets, global_defaults, style_data=None, colors_data=None):
+    """
+    Rendert die Seite für einen Style als Folge von HTML-Chunks (Streaming, ohne Gesamtstring).
+    style_data/colors_data können direkt übergeben werden (Pipeline im Speicher), sonst werden
+    die neuesten interpreted_*-Dateien aus dem Projektordner gelesen.
+    """
     # === Schritt A: Baue das globale Mapping für dieses Projekt und diesen Style ===
     # Dieses Mapping enthält ALLE globalen Werte für die gesamte Seite.
     global_mapping = {}
@@ -91,17 +119,16 @@ def generate_site_for_style(project_dir, style_name, content_data, layout_plan,
     if "global_settings" in content_data:
         global_mapping.update(flatten_dict(content_data["global_settings"]))
     
-    style_file = find_newest_file(project_dir, f"interpreted_styles_{style_name}*.json")
-    style_data = load_json(style_file)
+    if style_data is None:
+        style_data = load_json(get_project_index(project_dir).latest("interpreted_styles", style_name))
     global_mapping['theme_classes'] = style_data.get("theme_classes", "")
     
-    colors_file = find_newest_file(project_dir, "interpreted_colors*.json")
-    colors_data = load_json(colors_file)
+    if colors_data is None:
+        colors_data = load_json(get_project_index(project_dir).latest("interpreted_colors"))
     if "colors" in colors_data:
         global_mapping.update(flatten_dict(colors_data["colors"], parent_key="design.branding"))
 
-    # === Schritt B: Iteriere durch die Module und baue die HTML zusammen ===
-    final_html = ""
+    # === Schritt B: Iteriere durch die Module und liefere die HTML-Chunks ===
     component_counters = {row['component']: 0 for row in layout_plan}
 
     for item in sorted(layout_plan, key=lambda x: int(x.get('order', 0))):
@@ -114,34 +141,27 @@ def generate_site_for_style(project_dir, style_name, content_data, layout_plan,
         instance_data = component_instances[instance_index]
         component_counters[component_name] += 1
 
-        component_path = COMPONENTS_DIR / f"{component_name}.html"
-        if not component_path.exists(): continue
-        
-        # Lade das rohe HTML-Template für jede Instanz neu
-        component_html = component_path.read_text(encoding='utf-8')
+        # Komponente aus der Registry (HTML und Listen-Index einmal pro Lauf geladen)
+        component = COMPONENT_REGISTRY.get(component_name)
+        if component is None: continue
 
-        # === Schritt C: Ersetze Platzhalter ===
+        # === Schritt C: Mappings für Platzhalter vorbereiten ===
 
-        # 1. Listen zuerst ersetzen, da sie eine eigene Logik haben
+        # 1. Listen-Items: die Listen-Blöcke sind beim Laden vorindiziert
+        list_items = {}
         for key, list_data in instance_data.items():
             if isinstance(list_data, list):
                 list_marker = f"{component_name}.{key}"
-                pattern = re.compile(rf'<!-- BEGIN_LIST_ITEM:{re.escape(list_marker)} -->(.*?)<!-- END_LIST_ITEM:{re.escape(list_marker)} -->', re.DOTALL)
-                match = pattern.search(component_html)
-                if not match: continue
+                if list_marker not in component.list_index.by_marker: continue
                 
-                item_template = match.group(1)
-                generated_items_html = ""
-                for list_item in list_data:
-                    item_html = item_template
-                    for sub_key, sub_data in list_item.items():
-                        # Vorschau-Logik: Nutze example_value, wenn value leer ist
-                        sub_value = sub_data.get("value") if sub_data.get("value") else sub_data.get("example_value", "")
-                        item_html = item_html.replace(f"{{{{{sub_key}}}}}", str(sub_value))
-                    generated_items_html += item_html
-                component_html = pattern.sub(generated_items_html, component_html)
-
-        # 2. Alle anderen Platzhalter (lokal und global) ersetzen
+                # Vorschau-Logik: Nutze example_value, wenn value leer ist
+                list_items[list_marker] = [
+                    {sub_key: sub_data.get("value") if sub_data.get("value") else sub_data.get("example_value", "")
+                     for sub_key, sub_data in list_item.items()}
+                    for list_item in list_data
+                ]
+
+        # 2. Alle anderen Platzhalter (lokal und global)
         # Wir erstellen ein temporäres Mapping, das globale und lokale Werte kombiniert
         combined_mapping = global_mapping.copy()
         
@@ -159,84 +179,310 @@ def generate_site_for_style(project_dir, style_name, content_data, layout_plan,
                 urls = placeholder_assets.get(asset_key, {}).get("urls", [])
                 if urls:
                     combined_mapping[full_key] = urls[instance_index % len(urls)]
+
+        # Verschachtelte Platzhalter in Werten (z.B. Farben im Text) vorab auflösen
+        combined_mapping = resolve_mapping_values(combined_mapping)
+        list_items = {marker: [resolve_mapping_values(item_mapping, combined_mapping) for item_mapping in items]
+                      for marker, items in list_items.items()}
         
-        # Führe die finale Ersetzung durch
-        component_html = replace_placeholders(component_html, combined_mapping)
-        
-        final_html += component_html + "\n"
+        # === Schritt D: Listen expandieren und ersetzen in einem Durchlauf ===
+        yield from component.list_index.iter_render(combined_mapping, list_items)
+        yield "\n"
+
+
+def generate_site_for_style(project_dir, style_name, content_data, layout_plan, placeholder_assets, global_defaults, style_data=None, colors_data=None, minify=False):
+    """
+    Generiert eine einzelne HTML-Datei für einen bestimmten Style (gestreamt in eine gepufferte Datei).
+    CSS-Regeln für Theme-Klassen, die am <body> nicht aktiv sind, werden im selben Durchlauf entfernt.
+    Mit minify=True laufen die Chunks vor dem Schreiben durch den Streaming-Minifier.
+    """
+    project_name = project_dir.name
+    print(f"   - 🎨 Generiere Seite für Style: '{style_name}'")
 
-    # Speichere die fertige HTML-Datei
+    if style_data is None:
+        style_data = load_json(get_project_index(project_dir).latest("interpreted_styles", style_name))
     output_path = OUTPUT_DIR / f"{project_name}_{style_name}.html"
-    output_path.write_text(final_html, encoding='utf-8')
+    chunks = iter_site_chunks(project_dir, style_name, content_data, layout_plan, placeholder_assets, global_defaults, style_data, colors_data)
+    theme_pruner = ThemePruner(style_data.get("theme_classes", ""), THEME_VOCABULARY)
+    prune_stats = {}
+    chunks = prune_style_chunks(chunks, theme_pruner, prune_stats)
+    stats = {}
+    if minify:
+        chunks = minify_chunks(chunks, stats)
+    write_chunks(output_path, chunks)
+    if prune_stats.get("bytes_pruned"):
+        print(f"   - ✂️ Ungenutzte Theme-Regeln entfernt '{style_name}': {prune_stats['bytes_pruned'] / 1024:.1f} KB")
+    if stats:
+        saved = stats["bytes_in"] - stats["bytes_out"]
+        print(f"   - 🗜️ Minifiziert '{style_name}': {stats['bytes_in'] / 1024:.1f} KB -> {stats['bytes_out'] / 1024:.1f} KB ({saved / max(1, stats['bytes_in']):.0%} kleiner)")
     print(f"   - ✅ Website erfolgreich generiert: {output_path}")
+    return output_path
+
+
+def project_cache_key(project_dir, cache, minify=False, gzip_level=None):
+    """Cache-Schlüssel aller Inputs, aus denen die Seiten eines Projekts entstehen."""
+    # Nur die neueste Generation pro Style zählt: Retention (gc) älterer Dateien invalidiert nichts
+    project_index = get_project_index(project_dir)
+    inputs = [project_dir / "layout_extended_v2.csv"]
+    for kind in ("project_template_Stufe02_Styled", "interpreted_styles"):
+        inputs.extend(project_index.latest_by_style(kind).values())
+    # Overlays: die Stufe01-Datei, gegen die sie aufgelöst werden, gehört ebenfalls dazu
+    for content_file in project_index.latest_by_style("project_template_Stufe02_Styled").values():
+        try:
+            base = base_file(load_json(content_file), project_dir)
+        except FileNotFoundError:
+            continue  # fällt in check_project_inputs als Fehler auf
+        if base is not None:
+            inputs.append(base)
+    inputs.append(project_index.latest("interpreted_colors") or project_dir / "interpreted_colors.json")
+    inputs.append(COMPONENTS_DIR / "_placeholder_assets.json")
+    inputs.extend(component_template_files(COMPONENTS_DIR))
+    inputs.extend(GENERATOR_CODE_FILES)
+    options = {key: value for key, value in (("minify", minify), ("gzip", gzip_level)) if value}
+    return cache.stage_key(CACHE_STAGE, inputs, extra=options or None)
+
+
+def observe_project(project_dir, minify=False, gzip_level=None):
+    """Aktueller Input-Schlüssel eines Projekts (Datei-Hashes über den Build-Cache des Projekts)."""
+    cache = BuildCache(project_dir)
+    key = project_cache_key(project_dir, cache, minify, gzip_level)
+    cache.save()
+    return key
+
+
+def check_project_inputs(project_dir):
+    """Löst die Stufe02-Dateien eines Projekts probeweise auf; Liste der Fehler (leer, wenn alles passt)."""
+    errors = []
+    for style_name, content_file in get_project_index(project_dir).latest_by_style("project_template_Stufe02_Styled").items():
+        try:
+            content_data = resolve_content(load_json(content_file), project_dir)
+            if content_data:
+                content_data.get("page_content")
+        except (FileNotFoundError, ValueError) as e:
+            errors.append(f"{style_name}: {e}")
+    return errors
+
+
+def project_pages(project_name):
+    """Seiten (und .gz-Dateien) eines Projekts in docs/."""
+    return [path.resolve() for pattern in ('*.html', '*.html' + GZIP_SUFFIX) for path in OUTPUT_DIR.glob(pattern)
+            if parse_page_name(path.name.removesuffix(GZIP_SUFFIX))[0] == project_name]
+
+
+def failed_summary(project_name, errors):
+    return {"project": project_name, "styles": [], "errors": errors, "skipped": False, "cached": False, "cache_key": None, "outputs": []}
+
+
+def process_project(project_dir, placeholder_assets, global_defaults, cached=False, minify=False, gzip_level=None):
+    """
+    Generiert alle Styles eines Projekts. Fehler bleiben auf das Projekt beschränkt und landen
+    in der Zusammenfassung; den Projekt-Zustand speichert der Hauptprozess (summary["cache_key"], ["outputs"]).
+    Mit cached=True sind die Seiten bereits aktuell und werden nicht neu gerendert.
+    Mit gzip_level wird jede fertige Seite im Hintergrund komprimiert, während die übrigen noch rendern;
+    die Manifest-Einträge landen in summary["artifacts"].
+    """
+    project_name = project_dir.name
+    summary = {"project": project_name, "styles": [], "errors": [], "skipped": False, "cached": cached, "cache_key": None, "outputs": [], "artifacts": {}}
+    print(f"🚀 Verarbeite Projekt: {project_name}")
+
+    layout_file = project_dir / "layout_extended_v2.csv"
+    if not layout_file.exists():
+        logging.warning(f"Keine 'layout_extended_v2.csv' in {project_name} gefunden. Überspringe.")
+        summary["skipped"] = True
+        return summary
+
+    if cached:
+        print("   - ⏭️ Inputs unverändert, Seiten sind aktuell (Build-Cache).")
+        return summary
 
+    summary["cache_key"] = observe_project(project_dir, minify, gzip_level)
 
-def main():
+    try:
+        with layout_file.open(encoding='utf-8') as f:
+            layout_plan = [row for row in csv.DictReader(f) if row.get('enabled', 'FALSE').upper() == 'TRUE']
+
+        # Pro Style nur die neueste Stufe02-Generation laden (Projekt-Index, sortiert nach Style-Namen)
+        style_jobs = {}
+        for style_name, content_file in get_project_index(project_dir).latest_by_style("project_template_Stufe02_Styled").items():
+            # Overlay-Dateien verweisen auf ihre Stufe01-Basis und werden lazy aufgelöst
+            content_data = resolve_content(load_json(content_file), project_dir)
+            if not content_data: continue
+            style_jobs[style_name] = content_data
+
+        # Die Style-Varianten eines Projekts laufen parallel auf Threads
+        outputs = []
+        with ThreadPoolExecutor(max_workers=max(1, len(style_jobs))) as executor, \
+                (Precompressor(gzip_level) if gzip_level else nullcontext()) as compressor:
+            futures = [(style_name, executor.submit(generate_site_for_style, project_dir, style_name, content_data, layout_plan, placeholder_assets, global_defaults, minify=minify))
+                       for style_name, content_data in style_jobs.items()]
+            for style_name, future in futures:
+                try:
+                    output_path = future.result()
+                    outputs.append(output_path)
+                    summary["styles"].append(style_name)
+                    if compressor:
+                        compressor.submit(output_path)
+                except Exception as e:
+                    logging.error(f"Fehler bei Style '{style_name}' in {project_name}: {e}")
+                    summary["errors"].append(f"{style_name}: {e}")
+            if compressor:
+                summary["artifacts"] = compressor.results()
+                for name, entry in summary["artifacts"].items():
+                    if entry.get("encoding") == "gzip":
+                        original = summary["artifacts"][entry["source"]]["size"]
+                        print(f"   - 📦 {name}: {original / 1024:.1f} KB -> {entry['size'] / 1024:.1f} KB (Level {gzip_level})")
+                outputs.extend(OUTPUT_DIR / name for name in summary["artifacts"] if name.endswith(GZIP_SUFFIX))
+        summary["outputs"] = outputs
+    except Exception as e:
+        logging.error(f"Fehler bei Projekt {project_name}: {e}")
+        summary["errors"].append(str(e))
+
+    if summary["errors"]:
+        print(f"   - ❌ Projekt '{project_name}' mit Fehlern, wird beim nächsten Lauf erneut gebaut.")
+    print("-" * 50)
+    return summary
+
+
+def record_states(state, summaries):
+    """Speichert Status, Input-Schlüssel und Outputs der gebauten Projekte in der Zustands-DB."""
+    for s in summaries:
+        if s.get("cached"):
+            continue
+        if s["skipped"]:
+            state.mark_skipped(s["project"], CACHE_STAGE, "Keine 'layout_extended_v2.csv'")
+        elif s["errors"]:
+            state.mark_failed(s["project"], CACHE_STAGE, "; ".join(s["errors"]))
+        else:
+            state.mark_done(s["project"], CACHE_STAGE, s["cache_key"], s["outputs"])
+
+
+def print_summary(summaries):
+    """Gibt die aggregierte Zusammenfassung aller Projekte aus (in Projekt-Reihenfolge)."""
+    print("\n[ZUSAMMENFASSUNG]")
+    pages = sum(len(s["styles"]) for s in summaries)
+    failed = [s for s in summaries if s["errors"]]
+    skipped = [s for s in summaries if s["skipped"]]
+    for s in summaries:
+        if s["skipped"]:
+            status = "⏭️ übersprungen"
+        elif s.get("cached"):
+            status = "♻️ unverändert (Build-Cache)"
+        elif s["errors"]:
+            status = f"❌ {'; '.join(s['errors'])}"
+        else:
+            status = f"✅ {', '.join(s['styles']) or 'keine Styles'}"
+        print(f"   - {s['project']}: {status}")
+    cached = [s for s in summaries if s.get("cached")]
+    print(f"   - Projekte: {len(summaries)} | Seiten: {pages} | Aus Cache: {len(cached)} | Fehler: {len(failed)} | Übersprungen: {len(skipped)}")
+
+
+def update_manifest(gzip_level, keep_outputs, summaries):
+    """
+    Hält docs/manifest.json aktuell: Einträge der neuen Seiten, dazu die der unverändert gebliebenen.
+    Läuft bei jedem Lauf, sobald es ein Manifest gibt; ohne --gzip fallen die .gz-Einträge weg.
+    """
+    manifest = ArtifactManifest(OUTPUT_DIR)
+    if not gzip_level and not manifest.path.exists():
+        return
+    manifest.gzip_level = gzip_level
+    manifest.prune(keep_gzip=bool(gzip_level))
+    manifest.ensure(keep_outputs)
+    for s in summaries:
+        if s.get("artifacts"):
+            manifest.update(s["artifacts"])
+        else:
+            manifest.refresh(s.get("outputs", []))
+    manifest.save()
+    print(f"   - 🧾 Manifest mit {len(manifest.artifacts)} Artefakten geschrieben: {manifest.path}")
+
+
+def main(jobs=1, force=False, minify=False, gzip_level=None):
     """Hauptfunktion zur Steuerung des gesamten Generierungsprozesses."""
     print("--- STARTING HTML GENERATOR V5.2 (Final Corrected) ---")
 
+    # Content-Ordner behalten ihren Pfad; welches Projekt neu gebaut werden muss, weiß die Zustands-DB
+    state = ProjectStateStore(CONTENT_DIR / STATE_FILENAME)
+    projects_to_process = discover_projects(CONTENT_DIR)
+    state.sync(projects_to_process)
+    for project_dir in projects_to_process:
+        state.observe(project_dir.name, CACHE_STAGE, observe_project(project_dir, minify, gzip_level))
+    rebuild = set(state.needing_rebuild(CACHE_STAGE))
+
+    # Fertige Projekte mit unveränderten Inputs und Outputs: ihre Seiten bleiben in docs/ stehen
+    cached_projects = {}
+    if not force:
+        for project_dir in projects_to_process:
+            if project_dir.name in rebuild: continue
+            outputs = state.intact_outputs(project_dir.name, CACHE_STAGE)
+            if outputs is not None:
+                cached_projects[project_dir] = outputs
+    keep_outputs = {path for outputs in cached_projects.values() for path in outputs}
+
+    # Vor dem Aufräumen prüfen, ob sich die Inputs auflösen lassen: ein Projekt, das nicht
+    # gebaut werden kann, behält seine bisherigen Seiten, statt docs/ leer zu hinterlassen
+    preflight_errors = {}
+    for project_dir in projects_to_process:
+        if project_dir in cached_projects: continue
+        errors = check_project_inputs(project_dir)
+        if errors:
+            preflight_errors[project_dir] = errors
+            keep_outputs.update(project_pages(project_dir.name))
+            print(f"   - ❌ {project_dir.name}: Inputs nicht auflösbar, bisherige Seiten bleiben stehen ({'; '.join(errors)})")
+
     # === PHASE 1: AUFRÄUMEN ===
     print("\n[PHASE 1: AUFRÄUMEN]")
-    docs_archive_dir = OUTPUT_DIR / "docs_archives"
-    docs_archive_dir.mkdir(exist_ok=True)
+    # Inhaltsadressiert: jede Version einmal als Blob, der Index hält (Projekt, Style, Zeitstempel) fest
+    output_store = OutputStore(OUTPUT_DIR / "docs_archives")
+    new_blobs = 0
     for f in OUTPUT_DIR.glob('*.html'):
-        destination_path = docs_archive_dir / f.name
-        if destination_path.exists():
-            destination_path = destination_path.with_name(f"{f.stem}_{datetime.now().strftime('%Y%m%d_%H%M%S')}{f.suffix}")
-        shutil.move(str(f), str(destination_path))
-    print("   - ✅ Alte HTML-Dateien archiviert.")
-
-    content_archive_dir = CONTENT_DIR / "processed_contents_archives"
-    content_archive_dir.mkdir(exist_ok=True)
-    for folder in CONTENT_DIR.iterdir():
-        if folder.is_dir() and folder.name.startswith('processed_'):
-            if folder.name == content_archive_dir.name: continue
-            destination_path = content_archive_dir / folder.name
-            if destination_path.exists():
-                destination_path = destination_path.with_name(f"{folder.name}_{datetime.now().strftime('%Y%m%d_%H%M%S')}")
-            shutil.move(str(folder), str(destination_path))
-    print("   - ✅ Verarbeitete Projekte archiviert.")
+        if f.resolve() in keep_outputs: continue
+        new_blobs += output_store.archive(f)[1]
+    output_store.save()
+    # Vorkomprimierte Dateien werden nicht archiviert, sie lassen sich jederzeit neu erzeugen
+    for f in OUTPUT_DIR.glob('*.html' + GZIP_SUFFIX):
+        if f.resolve() not in keep_outputs:
+            f.unlink()
+    store_stats = output_store.stats()
+    print(f"   - ✅ Alte HTML-Dateien archiviert ({new_blobs} neue Blobs | Archiv: {store_stats['versions']} Versionen, "
+          f"{store_stats['bytes_stored'] / 1024:.0f} KB statt {store_stats['bytes_logical'] / 1024:.0f} KB).")
 
     # === PHASE 2: PROJEKTE VERARBEITEN ===
     print("\n[PHASE 2: SEITEN-GENERIERUNG]")
-    projects_to_process = [d for d in CONTENT_DIR.iterdir() if d.is_dir() and not d.name.startswith('processed_') and d.name != "processed_contents_archives"]
-    
+
     if not projects_to_process:
-        print("   - ℹ️ Keine neuen Projekte zur Verarbeitung gefunden. Prozess beendet.")
+        print("   - ℹ️ Keine Projekte zur Verarbeitung gefunden. Prozess beendet.")
+        update_manifest(gzip_level, keep_outputs, [])
+        state.close()
         return
 
     # Lade zentrale Defaults und Placeholders
     placeholder_assets = load_json(COMPONENTS_DIR / "_placeholder_assets.json")
     global_defaults = load_json(COMPONENTS_DIR / "_defaults.json")
 
-    for project_dir in projects_to_process:
-        project_name = project_dir.name
-        print(f"🚀 Verarbeite Projekt: {project_name}")
-
-        layout_file = project_dir / "layout_extended_v2.csv"
-        if not layout_file.exists():
-            logging.warning(f"Keine 'layout_extended_v2.csv' in {project_name} gefunden. Überspringe.")
-            continue
-        layout_plan = [row for row in csv.DictReader(layout_file.open(encoding='utf-8')) if row.get('enabled', 'FALSE').upper() == 'TRUE']
-
-        # Verarbeite jede gefundene Stufe02-Datei
-        for content_file in project_dir.glob("project_template_Stufe02_Styled_*.json"):
-            content_data = load_json(content_file)
-            if not content_data: continue
-            
-            style_name_match = re.search(r"_Styled_(.+?)_\d+", content_file.name)
-            if not style_name_match:
-                logging.warning(f"Konnte Style-Namen aus '{content_file.name}' nicht extrahieren. Überspringe.")
-                continue
-            style_name = style_name_match.group(1)
-
-            generate_site_for_style(project_dir, style_name, content_data, layout_plan, placeholder_assets, global_defaults)
-
-        # === PHASE 3: PROJEKT MARKIEREN ===
-        new_name = f"processed_{project_name}_{datetime.now().strftime('%Y%m%d')}"
-        project_dir.rename(project_dir.parent / new_name)
-        print(f"   - ✅ Projekt-Ordner markiert als: '{new_name}'")
-        print("-" * 50)
+    buildable = [project_dir for project_dir in projects_to_process if project_dir not in preflight_errors]
+    if jobs > 1 and len(buildable) > 1:
+        print(f"   - ⚙️ Verteile {len(buildable)} Projekte auf {jobs} Prozesse")
+        with ProcessPoolExecutor(max_workers=jobs) as executor:
+            futures = [(project_dir, executor.submit(process_project, project_dir, placeholder_assets, global_defaults, project_dir in cached_projects, minify, gzip_level))
+                       for project_dir in buildable]
+            summaries = []
+            for project_dir, future in futures:
+                try:
+                    summaries.append(future.result())
+                except Exception as e:
+                    # z.B. abgestürzter Worker-Prozess
+                    logging.error(f"Worker für Projekt {project_dir.name} fehlgeschlagen: {e}")
+                    summaries.append(failed_summary(project_dir.name, [str(e)]))
+    else:
+        summaries = [process_project(project_dir, placeholder_assets, global_defaults, project_dir in cached_projects, minify, gzip_level) for project_dir in buildable]
+    summaries += [failed_summary(project_dir.name, errors) for project_dir, errors in preflight_errors.items()]
+    summaries.sort(key=lambda s: s["project"])
+
+    # === PHASE 3: PROJEKT-ZUSTAND SPEICHERN (statt den Ordner umzubenennen) ===
+    record_states(state, summaries)
+    state.close()
+    print_summary(summaries)
+    update_manifest(gzip_level, keep_outputs, summaries)
 
 
 if __name__ == "__main__":
@@ -249,5 +495,12 @@ if __name__ == "__main__":
             "labels": {"career_button_text": "Offene Stellen", "application_button_text": "Initiativbewerbung", "imprint_text": "Impressum", "privacy_text": "Datenschutz", "contact_text": "Kontakt"},
             "project_config": {"canonical_url": "#"}
         }, indent=2))
-    main()
+    parser = argparse.ArgumentParser(description="Generiert die HTML-Seiten aller neuen Projekte.")
+    parser.add_argument("--jobs", type=int, default=1, help="Anzahl paralleler Projekt-Prozesse (Standard: 1)")
+    parser.add_argument("--force", action="store_true", help="Build-Cache ignorieren und alle Projekte neu generieren")
+    parser.add_argument("--minify", action="store_true", help="HTML und CSS der Seiten minifizieren (pre/textarea bleiben unverändert)")
+    parser.add_argument("--gzip", dest="gzip_level", type=int, choices=range(1, 10), metavar="LEVEL",
+                        help="Zusätzlich .html.gz (zlib-Level 1-9) und docs/manifest.json schreiben")
+    args = parser.parse_args()
+    main(jobs=args.jobs, force=args.force, minify=args.minify, gzip_level=args.gzip_level)
 
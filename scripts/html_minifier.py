@@ -0,0 +1,200 @@
+#!/usr/bin/env python3
+"""
+Streaming-Minifier für generierte HTML-Seiten (inkl. CSS in <style>).
+- Läuft in einem Durchlauf über die gerenderten Chunks, ohne die Seite vorher
+  zusammenzusetzen; angefangene Tags, Kommentare oder Whitespace-Folgen am Chunk-Ende
+  werden bis zum nächsten Chunk zurückgehalten.
+- HTML: Kommentare (auch <!-- BEGIN_LIST_ITEM ... -->) fallen weg, bedingte Kommentare
+  (<!--[if ...]>) bleiben. Whitespace zwischen Text und Tags wird zusammengefasst
+  (Folgen mit Zeilenumbruch -> ein Zeilenumbruch, sonst ein Leerzeichen), Tags bleiben unverändert.
+- <pre>, <textarea> und <script> werden unverändert durchgereicht.
+- CSS: Kommentare entfernt, Whitespace zusammengefasst und um { } ; , > sowie nach ':'
+  entfernt, letztes ';' vor '}' entfernt; Strings bleiben unangetastet.
+- Deterministisch: das Ergebnis hängt nicht davon ab, wie die Seite in Chunks zerfällt.
+"""
+import re
+
+RAW_TAGS = ("pre", "textarea", "script")
+TAG_NAME = re.compile(r'</?([a-zA-Z][a-zA-Z0-9-]*)')
+WHITESPACE = re.compile(r'\s+')
+TRAILING_WHITESPACE = re.compile(r'\s+$')
+
+
+def _collapse(match):
+    return "\n" if "\n" in match.group(0) else " "
+
+CSS_TOKEN = re.compile(r'"(?:\\.|[^"\\])*"|\'(?:\\.|[^\'\\])*\'|/\*.*?\*/|\s+|[^"\'/\s]+|/', re.DOTALL)
+CSS_TIGHT_BEFORE = set("{};,>")
+CSS_TIGHT_AFTER = set("{};,>:")
+
+
+def minify_css(css):
+    """CSS in einer Zeile, ohne Kommentare und überflüssigen Whitespace."""
+    out = []
+    pending_space = False
+    for token in CSS_TOKEN.findall(css):
+        if token.startswith("/*"):
+            continue
+        if token[0].isspace():
+            pending_space = bool(out)
+            continue
+        if pending_space and out and out[-1][-1] not in CSS_TIGHT_AFTER and token[0] not in CSS_TIGHT_BEFORE:
+            out.append(" ")
+        pending_space = False
+        if token[0] == "}" and out and out[-1] == ";":
+            out.pop()
+        # Einzelne Satzzeichen als eigene Tokens, damit ';' vor '}' erkannt wird
+        if token[0] not in "\"'" and len(token) > 1 and any(char in token for char in "{};,>:"):
+            for part in re.split(r'([{};,>:])', token):
+                if not part:
+                    continue
+                if part == "}" and out and out[-1] == ";":
+                    out.pop()
+                out.append(part)
+        else:
+            out.append(token)
+    return "".join(out)
+
+
+def _find_tag_end(buf):
+    """Index des schließenden '>' eines Tags am Anfang von `buf` (Attribute in Anführungszeichen beachtet)."""
+    quote = None
+    for i in range(1, len(buf)):
+        char = buf[i]
+        if quote:
+            if char == quote:
+                quote = None
+        elif char in "\"'":
+            quote = char
+        elif char == ">":
+            return i
+    return -1
+
+
+class HtmlMinifier:
+    """Zustandsbehafteter Minifier: feed() pro Chunk, close() am Ende."""
+
+    def __init__(self):
+        self.buf = ""
+        self.mode = "html"       # html | raw | style
+        self.raw_tag = None
+        self.pending_ws = ""     # zusammengefasster Whitespace vor der nächsten Ausgabe
+        self.bytes_in = 0
+        self.bytes_out = 0
+
+    def _whitespace(self, run):
+        self.pending_ws = "\n" if "\n" in run or self.pending_ws == "\n" else " "
+
+    def _text(self, out, text):
+        core = text.strip()
+        if not core:
+            if text:
+                self._whitespace(text)
+            return
+        if text[0].isspace():
+            self._whitespace(text[:len(text) - len(text.lstrip())])
+        self._emit(out, WHITESPACE.sub(_collapse, core))
+        if text[-1].isspace():
+            self._whitespace(text[len(text.rstrip()):])
+
+    def _emit(self, out, text):
+        if self.pending_ws:
+            out.append(self.pending_ws)
+            self.pending_ws = ""
+        out.append(text)
+
+    def _process(self, final):
+        out = []
+        buf = self.buf
+        while buf:
+            if self.mode == "html":
+                i = buf.find("<")
+                if i == -1:
+                    text = buf if final else TRAILING_WHITESPACE.sub("", buf)
+                    self._text(out, text)
+                    buf = buf[len(text):]
+                    break
+                self._text(out, buf[:i])
+                buf = buf[i:]
+                if buf.startswith("<!--") or (not final and "<!--".startswith(buf)):
+                    end = buf.find("-->", 4)
+                    if end == -1:
+                        if final:
+                            self._emit(out, buf)
+                            buf = ""
+                        break
+                    if buf.startswith("<!--["):
+                        self._emit(out, buf[:end + 3])
+                    buf = buf[end + 3:]
+                    continue
+                end = _find_tag_end(buf)
+                if end == -1:
+                    if final:
+                        self._emit(out, buf)
+                        buf = ""
+                    break
+                tag = buf[:end + 1]
+                self._emit(out, tag)
+                buf = buf[end + 1:]
+                match = TAG_NAME.match(tag)
+                name = match.group(1).lower() if match else ""
+                if not tag.startswith("</") and not tag.endswith("/>"):
+                    if name in RAW_TAGS:
+                        self.mode, self.raw_tag = "raw", name
+                    elif name == "style":
+                        self.mode, self.raw_tag = "style", name
+            else:
+                closing = "</" + self.raw_tag
+                i = buf.lower().find(closing)
+                if i == -1:
+                    if final:
+                        content = buf
+                    elif self.mode == "raw":
+                        # Rest zurückhalten, falls der schließende Tag über die Chunk-Grenze geht
+                        content = buf[:max(0, len(buf) - len(closing))]
+                    else:
+                        break  # CSS wird bis </style> gesammelt und am Stück minifiziert
+                    self._emit(out, content if self.mode == "raw" else minify_css(content))
+                    buf = buf[len(content):]
+                    if not final:
+                        break
+                    continue
+                content = buf[:i]
+                if content:
+                    self._emit(out, content if self.mode == "raw" else minify_css(content))
+                buf = buf[i:]
+                self.mode, self.raw_tag = "html", None
+        self.buf = buf
+        if final and self.pending_ws:
+            out.append(self.pending_ws)
+            self.pending_ws = ""
+        result = "".join(out)
+        self.bytes_out += len(result.encode("utf-8"))
+        return result
+
+    def feed(self, chunk):
+        self.bytes_in += len(chunk.encode("utf-8"))
+        self.buf += chunk
+        return self._process(final=False)
+
+    def close(self):
+        return self._process(final=True)
+
+
+def minify_chunks(chunks, stats=None):
+    """Generator: minifizierte Chunks; `stats` (dict) erhält am Ende bytes_in/bytes_out."""
+    minifier = HtmlMinifier()
+    for chunk in chunks:
+        if chunk:
+            result = minifier.feed(chunk)
+            if result:
+                yield result
+    result = minifier.close()
+    if result:
+        yield result
+    if stats is not None:
+        stats.update(bytes_in=minifier.bytes_in, bytes_out=minifier.bytes_out)
+
+
+def minify_html(html):
+    return "".join(minify_chunks([html]))
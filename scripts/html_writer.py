@@ -0,0 +1,29 @@
+#!/usr/bin/env python3
+"""
+Gepufferter Streaming-Writer für generierte HTML-Seiten.
+- Schreibt Chunks aus einem Generator direkt in eine gepufferte Datei,
+  statt das ganze Dokument vorher als String zusammenzubauen.
+- Schreibt zuerst in eine .part-Datei und ersetzt das Ziel erst am Ende,
+  damit ein Abbruch keine halbe Seite in docs/ hinterlässt.
+"""
+import os
+from pathlib import Path
+
+WRITE_BUFFER_SIZE = 64 * 1024
+
+
+def write_chunks(output_path, chunks, buffer_size=WRITE_BUFFER_SIZE):
+    """Schreibt alle Chunks nach `output_path` und gibt die Anzahl geschriebener Zeichen zurück."""
+    output_path = Path(output_path)
+    part_path = output_path.with_name(output_path.name + ".part")
+    written = 0
+    try:
+        with part_path.open('w', encoding='utf-8', buffering=buffer_size) as f:
+            for chunk in chunks:
+                if chunk:
+                    written += f.write(chunk)
+        os.replace(part_path, output_path)
+    except BaseException:
+        part_path.unlink(missing_ok=True)
+        raise
+    return written
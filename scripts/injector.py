@@ -9,6 +9,9 @@ import glob
 from pathlib import Path
 import argparse
 
+from project_state import discover_projects
+
+
 def find_color_definitions_file(project_dir: Path) -> Path | None:
     """Finds a file containing 'color_definitions.json' in its name."""
     # Sucht nach jeder JSON-Datei, deren Name 'color_definitions' enthält
@@ -90,13 +93,9 @@ def main():
 
     elif args.all:
         print("--- STARTING INJECTION FOR ALL PROJECTS ---")
-        for project_dir in content_dir.iterdir():
-            if project_dir.is_dir():
-                # Überspringe bereits verarbeitete/archivierte Ordner
-                if project_dir.name.startswith(('processed_', 'proceed_')):
-                    print(f"   - 🟡 SKIPPING: '{project_dir.name}' (bereits verarbeitet/archiviert)")
-                    continue
-                inject_data(project_dir.name, base_dir)
+        # Alt-Archiv-Ordner (processed_*, proceed_*) sind keine Projekte, siehe project_state
+        for project_dir in discover_projects(content_dir):
+            inject_data(project_dir.name, base_dir)
         print("-" * 40)
 
 
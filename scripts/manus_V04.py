@@ -8,11 +8,21 @@ Nutzt ALLE vorhandenen Farb-Daten aus den JSON-Dateien
 import os
 import json
 import csv
+import argparse
 import glob
 import re
+import sys
 from datetime import datetime
 
-def main():
+# Import der Template-Engine
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+from template_engine import resolve_placeholders
+from project_index import get_project_index
+from content_overlay import materialize, resolve_content
+from shared_stylesheet import SharedStylesheet
+from css_pruner import ThemePruner, prune_style_blocks, theme_vocabulary
+
+def main(shared_css=False):
     print("🚀 HTML Generator v4.0 gestartet - Mit korrigierter Farb-Integration")
     print("=" * 80)
     
@@ -35,6 +45,11 @@ def main():
         # Ausgabeordner erstellen falls nicht vorhanden
         os.makedirs(output_dir, exist_ok=True)
         print(f"   ✓ Ausgabeordner bereit")
+
+        # Optional: gemeinsames CSS als docs/assets/css/<hash>.css, pro Seite nur :root inline
+        shared_stylesheet = SharedStylesheet(output_dir) if shared_css else None
+        if shared_stylesheet:
+            print(f"   ✓ Gemeinsames Stylesheet: {shared_stylesheet.css_dir}")
         
     except Exception as e:
         print(f"💥 FATALER FEHLER in Schritt 1: {e}")
@@ -72,18 +87,8 @@ def main():
         
         for project_name in project_dirs:
             project_dir = os.path.join(content_base_dir, project_name)
-            style_pattern = os.path.join(project_dir, "interpreted_styles_*.json")
-            style_files = glob.glob(style_pattern)
-            
-            for file_path in style_files:
-                filename = os.path.basename(file_path)
-                
-                # Extrahiere alles zwischen "interpreted_styles_" und dem letzten "_"
-                match = re.search(r'interpreted_styles_(.+)_\d{8}_\d{6}\.json', filename)
-
-                if match:
-                    style_name = match.group(1)
-                    available_styles.add(style_name)
+            # Stil-Namen aus dem Projekt-Index (ein Verzeichnis-Scan pro Projekt)
+            available_styles.update(get_project_index(project_dir).styles("interpreted_styles"))
         
         available_styles = list(available_styles)
         print(f"   🎨 Verfügbare Stile: {available_styles}")
@@ -241,44 +246,24 @@ def main():
                 # Schritt 5.1: Stil-spezifische Pfade definieren
                 print(f"📂 Schritt 5.1: Stil-spezifische Pfade für '{style_name}'...")
                 
-                def find_newest_file(pattern):
-                    """Findet die neueste Datei basierend auf einem Muster"""
-                    files = glob.glob(pattern)
-                    if not files:
-                        return None
-                    # Sortiere nach Änderungsdatum (neueste zuerst)
-                    files.sort(key=os.path.getmtime, reverse=True)
-                    return files[0]
+                def find_newest_file(kind, style=None):
+                    """Neueste Datei einer Artefakt-Art aus dem Projekt-Index (Zeitstempel im Dateinamen)"""
+                    path = get_project_index(project_dir).latest(kind, style)
+                    return str(path) if path else None
                 
                 # Basis-Dateien (stil-unabhängig)
                 defaults_path = os.path.join(components_dir, "_defaults.json")
                 layout_path = os.path.join(project_dir, "layout_extended_v2.csv")
                 placeholder_assets_path = os.path.join(project_dir, "_placeholder_assets.json")
                 
-                # Farb-Dateien (KORRIGIERT: Auch ohne Zeitstempel suchen)
-                colors_pattern_timestamped = os.path.join(project_dir, f"interpreted_colors_*.json")
-                colors_pattern_simple = os.path.join(project_dir, "interpreted_colors.json")
-                
-                # Stil-spezifische Dateien
-               
-                project_template_pattern = os.path.join(project_dir, f"project_template_Stufe02_Styled_{style_name}_*.json")
-
-        
-                text_colors_pattern = os.path.join(project_dir, f"interpreted_text_colors_*.json")
-
-                # Exakte Suche - nur Dateien die genau dem style_name entsprechen
-                styles_pattern = os.path.join(project_dir, f"interpreted_styles_{style_name}_*.json")
-
-
-                project_template_path = find_newest_file(project_template_pattern)
+                # Stil-spezifische Dateien: exakter Stil-Name, neueste Generation
+                project_template_path = find_newest_file("project_template_Stufe02_Styled", style_name)
                 
-                # KORRIGIERT: Farb-Dateien richtig finden
-                colors_path = find_newest_file(colors_pattern_timestamped)
-                if not colors_path and os.path.exists(colors_pattern_simple):
-                    colors_path = colors_pattern_simple
+                # Farb-Dateien (mit oder ohne Zeitstempel)
+                colors_path = find_newest_file("interpreted_colors")
                 
-                text_colors_path = find_newest_file(text_colors_pattern)
-                styles_path = find_newest_file(styles_pattern)
+                text_colors_path = find_newest_file("interpreted_text_colors")
+                styles_path = find_newest_file("interpreted_styles", style_name)
                 
                 print(f"   ✓ Defaults: {os.path.basename(defaults_path) if os.path.exists(defaults_path) else 'FEHLT'}")
                 print(f"   ✓ Layout: {os.path.basename(layout_path) if os.path.exists(layout_path) else 'FEHLT'}")
@@ -350,7 +335,8 @@ def main():
                 # Lade Project Template (falls vorhanden)
                 if project_template_path and os.path.exists(project_template_path):
                     with open(project_template_path, 'r', encoding='utf-8') as f:
-                        project_data = json.load(f)
+                        # Stufe02-Overlays auf ihre Stufe01-Basis auflösen
+                        project_data = materialize(resolve_content(json.load(f), project_dir))
                         final_mapping.update(project_data)
                         print(f"   ✓ Project Template geladen: {len(project_data)} Einträge")
                 
@@ -678,46 +664,30 @@ def main():
                 continue
             
             try:
-                # Schritt 5.6: Iterative Platzhalter-Ersetzung
+                # Schritt 5.6: Platzhalter-Ersetzung (Single-Pass-Resolver)
                 print(f"🔄 Schritt 5.6: Platzhalter-Ersetzung für '{style_name}'...")
                 
-                def replace_placeholders(text, mapping, max_iterations=10):
-                    """Iterative Platzhalter-Ersetzung"""
-                    for iteration in range(max_iterations):
-                        original_text = text
-                        
-                        # Finde alle {{...}} Platzhalter
-                        placeholders = re.findall(r'\{\{([^}]+)\}\}', text)
-                        
-                        if not placeholders:
-                            print(f"      ✓ Iteration {iteration + 1}: Keine Platzhalter mehr gefunden")
-                            break
-                        
-                        replaced_count = 0
-                        for placeholder in placeholders:
-                            placeholder_key = placeholder.strip()
-                            if placeholder_key in mapping:
-                                old_placeholder = f"{{{{{placeholder}}}}}"
-                                new_value = str(mapping[placeholder_key])
-                                text = text.replace(old_placeholder, new_value)
-                                replaced_count += 1
-                        
-                        print(f"      ✓ Iteration {iteration + 1}: {replaced_count} Platzhalter ersetzt")
-                        
-                        # Wenn keine Änderungen mehr, beenden
-                        if text == original_text:
-                            print(f"      ✓ Konvergenz erreicht nach {iteration + 1} Iterationen")
-                            break
+                def replace_placeholders(text, mapping):
+                    """Platzhalter-Ersetzung in einem Scan (verschachtelte Werte rekursiv, mit Zyklus-Erkennung)"""
+                    text, unresolved, cyclic = resolve_placeholders(text, mapping)
+                    print(f"      ✓ Ein Durchlauf: {len(unresolved)} unbekannte, {len(cyclic)} zyklische Platzhalter")
                     
-                    # Prüfe auf verbleibende Platzhalter
-                    remaining_placeholders = re.findall(r'\{\{([^}]+)\}\}', text)
-                    if remaining_placeholders:
-                        print(f"      ⚠️  Verbleibende Platzhalter: {remaining_placeholders[:5]}...")
+                    # Melde verbleibende Platzhalter
+                    if unresolved:
+                        print(f"      ⚠️  Verbleibende Platzhalter: {unresolved[:5]}...")
+                    if cyclic:
+                        print(f"      ⚠️  Zyklische Platzhalter: {cyclic[:5]}...")
                     
                     return text
                 
                 # Führe Ersetzung durch
                 final_html = replace_placeholders(full_html, final_mapping)
+
+                # CSS-Regeln für Theme-Klassen entfernen, die am <body> nicht aktiv sind
+                # (Modul-Blöcke und GENERATED_STYLE_BLOCK, vor dem Auslagern ins gemeinsame Stylesheet)
+                theme_pruner = ThemePruner(final_mapping['BODY_CLASSES'], theme_vocabulary(json_schemas.get('technik_header_section', {})))
+                final_html, pruned_bytes = prune_style_blocks(final_html, theme_pruner)
+                print(f"   ✂️ Ungenutzte Theme-Regeln entfernt: {pruned_bytes:,} Bytes ({final_mapping['BODY_CLASSES']})")
                 
                 print(f"   ✓ Platzhalter-Ersetzung abgeschlossen")
                 print(f"   📄 Finale HTML-Größe: {len(final_html)} Zeichen")
@@ -732,6 +702,13 @@ def main():
                 
                 output_filename = f"DEF_88_{style_name}_v4.html"
                 output_path = os.path.join(output_dir, output_filename)
+
+                if shared_stylesheet:
+                    final_html, css_stats = shared_stylesheet.externalize(final_html, output_path)
+                    if css_stats:
+                        state = "neu geschrieben" if css_stats['created'] else "wiederverwendet"
+                        print(f"   🔗 Gemeinsames CSS: assets/css/{css_stats['hash']}.css ({css_stats['shared_bytes']:,} Bytes, {state})")
+                        print(f"   📉 Seite: {css_stats['page_bytes_before']:,} -> {css_stats['page_bytes_after']:,} Bytes (inline :root {css_stats['inline_bytes']:,} Bytes)")
                 
                 with open(output_path, 'w', encoding='utf-8') as f:
                     f.write(final_html)
@@ -762,7 +739,11 @@ def main():
     return len(generated_files) > 0
 
 if __name__ == "__main__":
-    success = main()
+    parser = argparse.ArgumentParser(description="HTML Generator v4.0")
+    parser.add_argument("--shared-css", action="store_true",
+                        help="Komponenten-CSS als gemeinsames docs/assets/css/<hash>.css auslagern, pro Seite nur :root inline")
+    args = parser.parse_args()
+    success = main(shared_css=args.shared_css)
     if success:
         print("\n🏆 MISSION ERFOLGREICH! Der Generator mit vollständiger Farb-Integration funktioniert.")
     else:
@@ -0,0 +1,146 @@
+#!/usr/bin/env python3
+"""
+Inhaltsadressierter Archiv-Speicher für generierte Seiten (docs/docs_archives).
+- Jede archivierte Version liegt genau einmal als Blob unter objects/<aa>/<sha256>;
+  identische Re-Renders kosten keinen zusätzlichen Platz.
+- Blobs entstehen per Hardlink auf die Seite (gleiches Dateisystem), sonst per Kopie.
+- index.json hält pro Version (Projekt, Style, Zeitstempel) -> Blob fest; die Historie
+  eines Projekts ist ein Blick in den Index, kein Verzeichnis-Durchlauf.
+- Lose Dateien aus der Zeit vor dem Speicher (<name>[_YYYYMMDD_HHMMSS].html) werden beim
+  ersten Zugriff übernommen.
+"""
+import hashlib
+import json
+import os
+import re
+import shutil
+from datetime import datetime
+from pathlib import Path
+
+OBJECTS_DIRNAME = "objects"
+INDEX_FILENAME = "index.json"
+INDEX_VERSION = 1
+TIMESTAMP_FORMAT = "%Y%m%d_%H%M%S"
+# Längere Style-Namen zuerst, damit 'classic_accents' nicht als 'classic' erkannt wird
+PAGE_STYLES = ("classic_accents", "hyper_stylish", "classic", "stylish")
+PAGE_NAME = re.compile(r'^(?P<project>.+?)(?:_(?P<style>' + "|".join(PAGE_STYLES) + r'))?(?:_(?P<timestamp>\d{8}_\d{6}))?(?P<ext>\.[^.]*)?$')
+HASH_BLOCK_SIZE = 1024 * 1024
+
+
+def parse_page_name(filename):
+    """Zerlegt einen Seitennamen in (Projekt, Style, Zeitstempel, ursprünglicher Dateiname)."""
+    match = PAGE_NAME.match(filename)
+    project, style, timestamp, ext = match.group("project", "style", "timestamp", "ext")
+    original = project + (f"_{style}" if style else "") + (ext or "")
+    return project, style, timestamp, original
+
+
+def _file_digest(path):
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(HASH_BLOCK_SIZE), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+class OutputStore:
+    """Archiv-Speicher eines Ausgabeordners; Änderungen am Index werden mit save() geschrieben."""
+
+    def __init__(self, store_dir):
+        self.store_dir = Path(store_dir)
+        self.objects_dir = self.store_dir / OBJECTS_DIRNAME
+        self.index_path = self.store_dir / INDEX_FILENAME
+        self.entries = []
+        self._dirty = False
+        if self.index_path.exists():
+            with self.index_path.open(encoding='utf-8') as f:
+                data = json.load(f)
+            if data.get("version") == INDEX_VERSION:
+                self.entries = data["entries"]
+        self.blobs = {entry["sha256"] for entry in self.entries}
+        self.import_loose_files()
+
+    def blob_path(self, digest):
+        return self.objects_dir / digest[:2] / digest
+
+    def _store_blob(self, path, digest):
+        """Legt den Blob an (Hardlink, sonst Kopie); False, wenn er schon existiert."""
+        blob = self.blob_path(digest)
+        if digest in self.blobs or blob.exists():
+            self.blobs.add(digest)
+            return False
+        blob.parent.mkdir(parents=True, exist_ok=True)
+        try:
+            os.link(path, blob)
+        except OSError:
+            # Anderes Dateisystem oder keine Hardlinks: kopieren, erst dann ersetzen
+            part_path = blob.with_name(blob.name + ".part")
+            shutil.copyfile(path, part_path)
+            os.replace(part_path, blob)
+        self.blobs.add(digest)
+        return True
+
+    def archive(self, path, timestamp=None, remove=True):
+        """
+        Archiviert eine Seite; Zeitstempel ist die mtime der Datei (Zeit des Renderns).
+        Mit remove=True verschwindet die Seite danach aus dem Ausgabeordner.
+        Gibt (Index-Eintrag, Blob neu angelegt) zurück.
+        """
+        path = Path(path)
+        stat = path.stat()
+        project, style, name_timestamp, original = parse_page_name(path.name)
+        timestamp = timestamp or name_timestamp or datetime.fromtimestamp(stat.st_mtime).strftime(TIMESTAMP_FORMAT)
+        digest = _file_digest(path)
+        created = self._store_blob(path, digest)
+        entry = {"project": project, "style": style, "timestamp": timestamp, "name": original,
+                 "sha256": digest, "size": stat.st_size}
+        self.entries.append(entry)
+        self._dirty = True
+        if remove:
+            path.unlink()
+        return entry, created
+
+    def import_loose_files(self):
+        """Übernimmt Dateien, die noch direkt im Archiv-Ordner liegen (altes Verfahren), in den Speicher."""
+        if not self.store_dir.is_dir():
+            return 0
+        loose = sorted(entry.path for entry in os.scandir(self.store_dir)
+                       if entry.is_file() and entry.name != INDEX_FILENAME and not entry.name.endswith((".part", ".tmp")))
+        for path in loose:
+            self.archive(path)
+        if loose:
+            self.save()
+        return len(loose)
+
+    def history(self, project=None, style=None):
+        """Archivierte Versionen (optional gefiltert), älteste zuerst."""
+        entries = [entry for entry in self.entries
+                   if (project is None or entry["project"] == project) and (style is None or entry["style"] == style)]
+        return sorted(entries, key=lambda entry: (entry["timestamp"], entry["project"], entry["style"] or ""))
+
+    def restore(self, entry, target_dir):
+        """Schreibt eine archivierte Version unter ihrem ursprünglichen Namen nach `target_dir` (Hash geprüft)."""
+        blob = self.blob_path(entry["sha256"])
+        if _file_digest(blob) != entry["sha256"]:
+            raise ValueError(f"Prüfsumme von '{entry['name']}' ({entry['timestamp']}) im Archiv stimmt nicht.")
+        target = Path(target_dir) / entry["name"]
+        part_path = target.with_name(target.name + ".part")
+        shutil.copyfile(blob, part_path)
+        os.replace(part_path, target)
+        return target
+
+    def stats(self):
+        """Versionen, eindeutige Blobs und Bytes: logisch archiviert vs. tatsächlich belegt."""
+        unique = {entry["sha256"]: entry["size"] for entry in self.entries}
+        return {"versions": len(self.entries), "blobs": len(unique),
+                "bytes_logical": sum(entry["size"] for entry in self.entries), "bytes_stored": sum(unique.values())}
+
+    def save(self):
+        if not self._dirty:
+            return
+        self.store_dir.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.index_path.with_name(self.index_path.name + ".tmp")
+        with tmp_path.open('w', encoding='utf-8') as f:
+            json.dump({"version": INDEX_VERSION, "entries": self.entries}, f, indent=2)
+        os.replace(tmp_path, self.index_path)
+        self._dirty = False
@@ -0,0 +1,292 @@
+#!/usr/bin/env python3
+"""
+Pipeline-Runner: alle Stufen eines Projekts in einem einzigen Prozess.
+- interpret_colors -> interpret_styles -> Stufe01 -> Stufe02 (Style-Injektion) -> HTML-Seiten
+- Zwischenergebnisse werden als Python-Objekte weitergereicht statt als JSON-Dateien
+  geschrieben und von der nächsten Stufe wieder eingelesen.
+- Mit --persist werden die Zwischenstände zusätzlich wie von den Einzelskripten
+  in den Projektordner geschrieben (Debugging / Nachvollziehbarkeit).
+- gc: alte Generationen der Zwischenstände ins Archiv-Paket des Projekts packen,
+  restore: eine archivierte Datei zurückholen.
+- pages: Historie der archivierten Seiten (docs/docs_archives) anzeigen oder eine Version zurückholen.
+- publish: nur das Delta von docs/ gegenüber dem zuletzt veröffentlichten Stand ausgeben
+  (Verzeichnis oder tar-Stream für den Upload-Job).
+
+Aufruf: python scripts/pipeline.py run --project DEF_88 [--persist] [--keep 3]
+        python scripts/pipeline.py gc [--project DEF_88] [--keep 3] [--dry-run]
+        python scripts/pipeline.py restore --project DEF_88 <dateiname> [--sha256 PRÄFIX]
+        python scripts/pipeline.py pages [--project DEF_88] [--style classic] [--restore YYYYMMDD_HHMMSS]
+        python scripts/pipeline.py publish (--out DIR | --tar DATEI|- [--gzip] | --dry-run)
+"""
+import argparse
+import hashlib
+import importlib.util
+import json
+import logging
+import sys
+import time
+from datetime import datetime
+from functools import lru_cache
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).resolve().parent))
+from artifact_retention import DEFAULT_KEEP, compact_project, restore_artifact
+from content_overlay import build_overlay
+from output_store import OutputStore
+from project_state import discover_projects
+from publish import publish
+
+# ==============================================================================
+# 1. KONFIGURATION & PFADE
+# ==============================================================================
+SCRIPT_DIR = Path(__file__).resolve().parent
+BASE_DIR = SCRIPT_DIR.parent
+CONTENT_DIR = BASE_DIR / "content"
+DOCS_DIR = BASE_DIR / "docs"
+COMPONENTS_DIR = BASE_DIR / "templates" / "components"
+LOG_FILE = DOCS_DIR / "pipeline.log"
+
+# Die Stufen-Skripte haben keine importierbaren Modulnamen (Ziffern, Punkte im Namen)
+STAGE_SCRIPTS = {
+    "colors": "00020_Interpret_colors_v2.0.py",
+    "styles": "00030_Interpret_styles_v2.0.py",
+    "stufe01": "00035_content_projectspez_template_stufe01_generator.py",
+    "inject": "00040_Inject_styles_v2.0.py",
+    "generator": "generator_v_fullpower_V03_neue_strukt.py",
+}
+
+# ==============================================================================
+# 2. HELFERFUNKTIONEN
+# ==============================================================================
+
+@lru_cache(maxsize=None)
+def load_stage(name):
+    """Importiert ein Stufen-Skript einmal pro Prozess als Modul."""
+    path = SCRIPT_DIR / STAGE_SCRIPTS[name]
+    spec = importlib.util.spec_from_file_location(f"pipeline_stage_{name}", path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def load_json(file_path):
+    with open(file_path, encoding='utf-8') as f:
+        return json.load(f)
+
+
+class StageTimer:
+    """Misst die Laufzeit der einzelnen Stufen für die Zusammenfassung."""
+
+    def __init__(self):
+        self.timings = []
+
+    def run(self, label, func, *args, **kwargs):
+        start = time.perf_counter()
+        result = func(*args, **kwargs)
+        self.timings.append((label, time.perf_counter() - start))
+        return result
+
+# ==============================================================================
+# 3. KERNLOGIK DER PIPELINE
+# ==============================================================================
+
+def run_pipeline(project_name, persist=False):
+    """
+    Führt alle Stufen für ein Projekt aus und gibt eine Zusammenfassung zurück.
+    Geschrieben werden nur die HTML-Seiten in docs/, mit persist=True zusätzlich
+    alle Zwischenstände (gleiche Dateinamen wie die Einzelskripte).
+    """
+    project_dir = CONTENT_DIR / project_name
+    if not (project_dir / "layout_extended_v2.csv").exists():
+        raise FileNotFoundError(f"Keine 'layout_extended_v2.csv' in {project_dir} gefunden.")
+
+    colors_stage, styles_stage, stufe01_stage = load_stage("colors"), load_stage("styles"), load_stage("stufe01")
+    inject_stage, generator = load_stage("inject"), load_stage("generator")
+    timer = StageTimer()
+    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+    summary = {"project": project_name, "styles": [], "outputs": [], "persisted": [], "timings": timer.timings}
+    print(f"🚀 Pipeline für Projekt: {project_name}")
+
+    # --- Schritt 1: Inputs einmal lesen ---
+    layout = stufe01_stage.load_layout(project_dir / "layout_extended_v2.csv")
+    color_data = load_json(colors_stage.find_color_definitions(project_dir))
+    style_modulator = load_json(COMPONENTS_DIR / "style_modulator.json")
+    config = load_json(project_dir / "customer_style_config.json")
+    layout_rules = load_json(project_dir / "layout_rules.json")
+
+    # --- Schritt 2: Farben und Styles interpretieren ---
+    interpreted_colors = timer.run("interpret_colors", colors_stage.build_interpreted_colors, color_data)
+    styles_output, text_colors = timer.run("interpret_styles", styles_stage.build_styles,
+                                           interpreted_colors["colors"], layout, style_modulator, config, layout_rules)
+
+    # --- Schritt 3: Stufe01-Template und Stufe02-Varianten ---
+    content_template = timer.run("content_template", stufe01_stage.build_content_template, layout, project_dir / "layout_extended_v2.csv")
+    styled_templates = {}
+    for variant in inject_stage.STYLE_VARIANTS:
+        if variant not in styles_output:
+            print(f"   - ⚠️ Keine Styles für '{variant}' (preferred_variants). Überspringe.")
+            continue
+        styled_templates[variant] = timer.run(f"inject {variant}", inject_stage.inject_variant,
+                                              content_template, styles_output[variant].get("styles", {}), variant)
+
+    if persist:
+        colors_file = project_dir / "interpreted_colors.json"
+        with colors_file.open('w') as f:
+            json.dump(interpreted_colors, f, indent=2)
+        summary["persisted"].append(colors_file)
+        summary["persisted"].extend(Path(p) for p in styles_stage.write_styles(project_dir, styles_output, text_colors, timestamp))
+        content_template_file = stufe01_stage.write_content_template(project_dir, content_template, timestamp)
+        summary["persisted"].append(content_template_file)
+        # Stufe02 wie beim Injector als Overlay über der eben geschriebenen Stufe01-Basis
+        base_sha256 = hashlib.sha256(content_template_file.read_bytes()).hexdigest()
+        for variant in styled_templates:
+            overlay = build_overlay(content_template, content_template_file, base_sha256,
+                                    styles_output[variant].get("styles", {}), variant, inject_stage.GENERATOR_VERSION)
+            summary["persisted"].append(inject_stage.write_variant(project_dir, variant, overlay, timestamp))
+
+    # --- Schritt 4: HTML-Seiten (wie der V03-Generator, Reihenfolge nach Style-Namen) ---
+    layout_plan = [row for row in layout if row.get('enabled', 'FALSE').upper() == 'TRUE']
+    placeholder_assets = generator.load_json(COMPONENTS_DIR / "_placeholder_assets.json")
+    global_defaults = generator.load_json(COMPONENTS_DIR / "_defaults.json")
+    for variant in sorted(styled_templates):
+        output_path = timer.run(f"generate {variant}", generator.generate_site_for_style,
+                                project_dir, variant, styled_templates[variant], layout_plan, placeholder_assets, global_defaults,
+                                style_data=styles_output[variant], colors_data=interpreted_colors)
+        summary["styles"].append(variant)
+        summary["outputs"].append(output_path)
+
+    return summary
+
+
+def run_gc(project_names, keep=DEFAULT_KEEP, dry_run=False):
+    """Retention für die angegebenen Projekte (Standard: alle unter content/)."""
+    if not project_names:
+        project_names = [project_dir.name for project_dir in discover_projects(CONTENT_DIR)]
+    summaries = []
+    for project_name in project_names:
+        summary = compact_project(CONTENT_DIR / project_name, keep=keep, dry_run=dry_run)
+        verb = "würden archiviert" if dry_run else "archiviert"
+        print(f"   - 🗜️ {project_name}: {len(summary['archived'])} Dateien {verb} ({summary['bytes_freed'] / 1024:.0f} KB)")
+        summaries.append(summary)
+    return summaries
+
+
+def run_pages(project=None, style=None, restore=None):
+    """Historie der archivierten Seiten aus dem Index; mit restore wird diese Version nach docs/ geschrieben."""
+    store = OutputStore(DOCS_DIR / "docs_archives")
+    entries = store.history(project, style)
+    if restore is None:
+        for entry in entries:
+            print(f"   - {entry['timestamp']}  {entry['name']:<40} {entry['size'] / 1024:>7.1f} KB  {entry['sha256'][:12]}")
+        stats = store.stats()
+        print(f"   - 🗄️ {len(entries)} Versionen | Archiv gesamt: {stats['versions']} Versionen in {stats['blobs']} Blobs, "
+              f"{stats['bytes_stored'] / 1024:.0f} KB statt {stats['bytes_logical'] / 1024:.0f} KB")
+        return entries
+    matches = [entry for entry in entries if entry["timestamp"] == restore]
+    if len(matches) != 1:
+        raise KeyError(f"{len(matches)} archivierte Versionen mit Zeitstempel {restore} (Projekt/Style angeben).")
+    return [store.restore(matches[0], DOCS_DIR)]
+
+
+def run_publish(out_dir=None, tar=None, compress=False, dry_run=False):
+    """Delta von docs/ ausgeben; bei tar '-' geht der Stream nach stdout, die Meldungen nach stderr."""
+    log = sys.stderr if tar == "-" else sys.stdout
+    tar_file = sys.stdout.buffer if tar == "-" else tar
+    delta = publish(DOCS_DIR, out_dir=out_dir, tar_file=tar_file, compression="gz" if compress else "", dry_run=dry_run)
+    for label, names in (("➕", delta.added), ("✏️", delta.changed), ("➖", delta.removed)):
+        for name in names:
+            print(f"   - {label} {name}", file=log)
+    print(f"   - 📤 Delta: {len(delta.added)} neu, {len(delta.changed)} geändert, {len(delta.removed)} entfernt | "
+          f"{delta.bytes_upload / 1024:.1f} KB von {delta.bytes_total / 1024:.1f} KB"
+          f"{' (dry-run, Stand nicht gespeichert)' if dry_run else ''}", file=log)
+    return delta
+
+
+def print_summary(summary):
+    print("\n[ZUSAMMENFASSUNG]")
+    for label, elapsed in summary["timings"]:
+        print(f"   - ⏱️ {label:<28} {elapsed * 1000:>8.1f} ms")
+    print(f"   - ✅ {len(summary['outputs'])} Seiten generiert: {', '.join(summary['styles'])}")
+    if summary["persisted"]:
+        print(f"   - 💾 {len(summary['persisted'])} Zwischenstände geschrieben (--persist)")
+    if summary.get("gc"):
+        print(f"   - 🗜️ {len(summary['gc']['archived'])} alte Generationen archiviert")
+
+# ==============================================================================
+# 4. KOMMANDOZEILE
+# ==============================================================================
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Führt die Content-Pipeline eines Projekts in einem Prozess aus.")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    run_parser = subparsers.add_parser("run", help="Alle Stufen für ein Projekt ausführen")
+    run_parser.add_argument("--project", required=True, help="Projektordner unter content/ (z.B. DEF_88)")
+    run_parser.add_argument("--persist", "--debug", dest="persist", action="store_true",
+                            help="Zwischenstände (interpreted_*, Stufe01, Stufe02) zusätzlich in den Projektordner schreiben")
+    run_parser.add_argument("--keep", type=int, default=None,
+                            help="Nach dem Lauf nur die neuesten N Generationen behalten, ältere archivieren")
+
+    gc_parser = subparsers.add_parser("gc", help="Alte Generationen der Zwischenstände archivieren")
+    gc_parser.add_argument("--project", action="append", default=[], help="Projektordner (mehrfach möglich, Standard: alle)")
+    gc_parser.add_argument("--keep", type=int, default=DEFAULT_KEEP, help=f"Generationen pro Art und Style, die bleiben (Standard: {DEFAULT_KEEP})")
+    gc_parser.add_argument("--dry-run", action="store_true", help="Nur anzeigen, was archiviert würde")
+
+    restore_parser = subparsers.add_parser("restore", help="Eine archivierte Datei wiederherstellen")
+    restore_parser.add_argument("--project", required=True, help="Projektordner unter content/")
+    restore_parser.add_argument("name", help="Dateiname des archivierten Artefakts")
+    restore_parser.add_argument("--overwrite", action="store_true", help="Vorhandene Datei überschreiben")
+    restore_parser.add_argument("--sha256", default=None, help="Bestimmte Version (Hash oder Präfix), Standard: zuletzt archivierte")
+
+    pages_parser = subparsers.add_parser("pages", help="Historie der archivierten Seiten anzeigen / Version wiederherstellen")
+    pages_parser.add_argument("--project", default=None, help="Nur dieses Projekt")
+    pages_parser.add_argument("--style", default=None, help="Nur diesen Style")
+    pages_parser.add_argument("--restore", metavar="ZEITSTEMPEL", default=None, help="Diese Version nach docs/ zurückschreiben")
+
+    publish_parser = subparsers.add_parser("publish", help="Nur die Änderungen an docs/ seit der letzten Veröffentlichung ausgeben")
+    target = publish_parser.add_mutually_exclusive_group(required=True)
+    target.add_argument("--out", help="Delta in dieses Verzeichnis kopieren")
+    target.add_argument("--tar", help="Delta als tar-Datei schreiben ('-' für stdout)")
+    target.add_argument("--dry-run", action="store_true", help="Nur anzeigen, was sich geändert hat")
+    publish_parser.add_argument("--gzip", action="store_true", help="tar-Stream gzip-komprimieren")
+    args = parser.parse_args(argv)
+
+    # Vor dem Laden der Stufen konfigurieren, sonst greift die basicConfig des Generators
+    logging.basicConfig(filename=LOG_FILE, level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s', filemode='w')
+
+    if args.command == "run":
+        try:
+            summary = run_pipeline(args.project, persist=args.persist)
+        except FileNotFoundError as e:
+            print(f"   - ❌ FEHLER: {e}")
+            return 1
+        if args.keep is not None:
+            summary["gc"] = compact_project(CONTENT_DIR / args.project, keep=args.keep)
+        print_summary(summary)
+    elif args.command == "gc":
+        run_gc(args.project, keep=args.keep, dry_run=args.dry_run)
+    elif args.command == "restore":
+        try:
+            target = restore_artifact(CONTENT_DIR / args.project, args.name, overwrite=args.overwrite, sha256=args.sha256)
+        except (KeyError, FileExistsError, ValueError) as e:
+            print(f"   - ❌ FEHLER: {e}")
+            return 1
+        print(f"   - ✅ Wiederhergestellt: {target}")
+    elif args.command == "pages":
+        try:
+            restored = run_pages(args.project, args.style, args.restore)
+        except (KeyError, ValueError) as e:
+            print(f"   - ❌ FEHLER: {e}")
+            return 1
+        if args.restore:
+            print(f"   - ✅ Wiederhergestellt: {restored[0]}")
+    elif args.command == "publish":
+        try:
+            run_publish(out_dir=args.out, tar=args.tar, compress=args.gzip, dry_run=args.dry_run)
+        except FileExistsError as e:
+            print(f"   - ❌ FEHLER: {e}")
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,156 @@
+#!/usr/bin/env python3
+"""
+Vorkomprimierte Geschwister-Dateien (.gz) und Hash-Manifest für docs/.
+- Jede fertige Seite bekommt eine <seite>.html.gz (zlib, gzip-Container, Level einstellbar),
+  damit der Webserver sie per gzip_static direkt ausliefern kann.
+- Komprimiert wird auf einem Thread-Pool: eine Seite wird gepackt, während die nächste rendert
+  (zlib gibt dabei den GIL frei).
+- Die .gz-Dateien sind deterministisch (mtime 0, kein Dateiname im Header): gleiche Seite,
+  gleiche Bytes, gleicher Hash.
+- docs/manifest.json führt Inhalts-Hash (SHA-256) und Größe jedes Artefakts; Deploys können
+  damit unveränderte Dateien überspringen.
+"""
+import hashlib
+import json
+import os
+import zlib
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+GZIP_SUFFIX = ".gz"
+MANIFEST_NAME = "manifest.json"
+MANIFEST_VERSION = 1
+DEFAULT_LEVEL = 9
+HASH_BLOCK_SIZE = 1024 * 1024
+
+
+def file_digest(path):
+    """SHA-256 einer Datei (blockweise gelesen)."""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(HASH_BLOCK_SIZE), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def gzip_bytes(data, level=DEFAULT_LEVEL):
+    """gzip-Container über zlib (wbits 31: Header mit mtime 0, ohne Dateinamen)."""
+    compressor = zlib.compressobj(level, zlib.DEFLATED, 31)
+    return compressor.compress(data) + compressor.flush()
+
+
+def artifact_entry(path, source=None):
+    """Manifest-Eintrag einer Datei; `source` verweist bei .gz auf die Originaldatei."""
+    path = Path(path)
+    entry = {"sha256": file_digest(path), "size": path.stat().st_size}
+    if source is not None:
+        entry.update(encoding="gzip", source=source)
+    return entry
+
+
+def precompress_file(path, level=DEFAULT_LEVEL):
+    """
+    Schreibt <path>.gz (über eine .part-Datei) und gibt die Manifest-Einträge beider Dateien zurück:
+    {name: eintrag, name.gz: eintrag}.
+    """
+    path = Path(path)
+    data = path.read_bytes()
+    packed = gzip_bytes(data, level)
+    gz_path = path.with_name(path.name + GZIP_SUFFIX)
+    part_path = gz_path.with_name(gz_path.name + ".part")
+    try:
+        part_path.write_bytes(packed)
+        os.replace(part_path, gz_path)
+    except BaseException:
+        part_path.unlink(missing_ok=True)
+        raise
+    return {
+        path.name: {"sha256": hashlib.sha256(data).hexdigest(), "size": len(data)},
+        gz_path.name: {"sha256": hashlib.sha256(packed).hexdigest(), "size": len(packed), "encoding": "gzip", "source": path.name},
+    }
+
+
+class Precompressor:
+    """Thread-Pool, der fertige Seiten im Hintergrund komprimiert; als Context-Manager nutzbar."""
+
+    def __init__(self, level=DEFAULT_LEVEL, max_workers=None):
+        self.level = level
+        self.executor = ThreadPoolExecutor(max_workers=max_workers or min(4, os.cpu_count() or 1))
+        self.futures = []
+
+    def submit(self, path):
+        future = self.executor.submit(precompress_file, path, self.level)
+        self.futures.append(future)
+        return future
+
+    def results(self):
+        """Wartet auf alle Aufträge; liefert die zusammengeführten Manifest-Einträge."""
+        entries = {}
+        for future in self.futures:
+            entries.update(future.result())
+        return entries
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.executor.shutdown(wait=True)
+
+
+class ArtifactManifest:
+    """docs/manifest.json: Hash und Größe jedes Artefakts, relativ zum Ausgabeordner."""
+
+    def __init__(self, output_dir):
+        self.output_dir = Path(output_dir)
+        self.path = self.output_dir / MANIFEST_NAME
+        self.artifacts = {}
+        self.gzip_level = None
+        if self.path.exists():
+            try:
+                with self.path.open(encoding='utf-8') as f:
+                    data = json.load(f)
+                if data.get("version") == MANIFEST_VERSION:
+                    self.artifacts = data.get("artifacts", {})
+                    self.gzip_level = data.get("gzip_level")
+            except (json.JSONDecodeError, OSError):
+                # Ein kaputtes Manifest wird einfach neu aufgebaut
+                pass
+
+    def update(self, entries):
+        self.artifacts.update(entries)
+
+    def ensure(self, paths):
+        """Trägt vorhandene Dateien nach, für die (noch) kein Eintrag existiert (z.B. aus dem Build-Cache)."""
+        for path in paths:
+            path = Path(path)
+            name = os.path.relpath(path, self.output_dir).replace(os.sep, "/")
+            if name not in self.artifacts and path.exists():
+                source = name[:-len(GZIP_SUFFIX)] if name.endswith(GZIP_SUFFIX) else None
+                self.artifacts[name] = artifact_entry(path, source)
+
+    def refresh(self, paths):
+        """Berechnet die Einträge dieser Dateien neu (z.B. neu gerenderte Seiten ohne .gz)."""
+        for path in paths:
+            path = Path(path)
+            name = os.path.relpath(path, self.output_dir).replace(os.sep, "/")
+            source = name[:-len(GZIP_SUFFIX)] if name.endswith(GZIP_SUFFIX) else None
+            self.artifacts[name] = artifact_entry(path, source)
+
+    def prune(self, keep_gzip=True):
+        """Entfernt Einträge, deren Datei fehlt oder eine andere Größe hat; ohne keep_gzip alle .gz-Einträge."""
+        pruned = {}
+        for name, entry in self.artifacts.items():
+            path = self.output_dir / name
+            if not keep_gzip and name.endswith(GZIP_SUFFIX):
+                continue
+            if path.exists() and path.stat().st_size == entry["size"]:
+                pruned[name] = entry
+        self.artifacts = pruned
+
+    def save(self):
+        data = {"version": MANIFEST_VERSION, "gzip_level": self.gzip_level,
+                "artifacts": dict(sorted(self.artifacts.items()))}
+        tmp_path = self.path.with_name(self.path.name + ".tmp")
+        with tmp_path.open('w', encoding='utf-8') as f:
+            json.dump(data, f, indent=2)
+        os.replace(tmp_path, self.path)
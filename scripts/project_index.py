@@ -0,0 +1,127 @@
+#!/usr/bin/env python3
+"""
+Datei-Index eines Projekt-Ordners für die zeitgestempelten Stufen-Artefakte.
+- Ein einziger os.scandir-Durchlauf statt eines glob + stat() pro Suche.
+- Zerlegt Dateinamen in Art (kind), Style und Zeitstempel (_YYYYMMDD_HHMMSS);
+  "neuestes Artefakt der Art K für Style S" ist danach ein Dict-Zugriff.
+- Style-Namen werden exakt verglichen: 'classic' findet keine 'classic_accents'-Dateien
+  mehr (der alte Glob 'interpreted_styles_classic*' tat das).
+- Der geteilte Index wird neu aufgebaut, sobald sich die mtime des Ordners ändert
+  (Dateien hinzugefügt, umbenannt oder gelöscht).
+"""
+import os
+import re
+from datetime import datetime
+from pathlib import Path
+
+# Bekannte Artefakt-Arten; längere Präfixe zuerst, damit z.B. 'interpreted_text_colors'
+# nicht als 'interpreted_colors' o.ä. erkannt wird
+ARTIFACT_KINDS = (
+    "project_template_Stufe02_Styled",
+    "project_template_Stufe01_Anleitung",
+    "interpreted_text_colors",
+    "interpreted_styles",
+    "interpreted_colors",
+)
+TIMESTAMP_FORMAT = "%Y%m%d_%H%M%S"
+TIMESTAMP_SUFFIX = re.compile(r'_(\d{8}_\d{6})$')
+
+
+def parse_artifact_name(filename):
+    """Zerlegt einen Dateinamen in (kind, style, timestamp); None, wenn es kein Stufen-Artefakt ist."""
+    stem, ext = os.path.splitext(filename)
+    if ext != ".json":
+        return None
+    match = TIMESTAMP_SUFFIX.search(stem)
+    timestamp = match.group(1) if match else None
+    if match:
+        stem = stem[:match.start()]
+    for kind in ARTIFACT_KINDS:
+        if stem == kind:
+            return kind, None, timestamp
+        if stem.startswith(kind + "_"):
+            return kind, stem[len(kind) + 1:], timestamp
+    return None
+
+
+class Artifact:
+    """Ein Stufen-Artefakt im Projekt-Ordner."""
+
+    __slots__ = ("path", "kind", "style", "timestamp")
+
+    def __init__(self, path, kind, style, timestamp):
+        self.path = path
+        self.kind = kind
+        self.style = style
+        self.timestamp = timestamp
+
+    def __repr__(self):
+        return f"Artifact({self.path.name!r})"
+
+
+class ProjectIndex:
+    """Alle Stufen-Artefakte eines Projekt-Ordners, gruppiert nach (kind, style), älteste zuerst."""
+
+    def __init__(self, project_dir):
+        self.project_dir = Path(project_dir)
+        self.dir_mtime = None
+        self.artifacts = {}
+        self.scans = 0
+        self.refresh()
+
+    def refresh(self):
+        artifacts = {}
+        with os.scandir(self.project_dir) as entries:
+            for entry in entries:
+                if not entry.is_file():
+                    continue
+                parsed = parse_artifact_name(entry.name)
+                if parsed is None:
+                    continue
+                kind, style, timestamp = parsed
+                if timestamp is None:
+                    # Dateien ohne Zeitstempel im Namen (z.B. interpreted_colors.json) über ihre mtime einordnen
+                    timestamp = datetime.fromtimestamp(entry.stat().st_mtime).strftime(TIMESTAMP_FORMAT)
+                artifacts.setdefault((kind, style), []).append(Artifact(Path(entry.path), kind, style, timestamp))
+        for generations in artifacts.values():
+            generations.sort(key=lambda a: (a.timestamp, a.path.name))
+        self.artifacts = artifacts
+        self.dir_mtime = self.project_dir.stat().st_mtime_ns
+        self.scans += 1
+
+    def is_stale(self):
+        try:
+            return self.project_dir.stat().st_mtime_ns != self.dir_mtime
+        except FileNotFoundError:
+            return True
+
+    def latest(self, kind, style=None):
+        """Pfad des neuesten Artefakts der Art `kind` (und ggf. des Styles) oder None."""
+        generations = self.artifacts.get((kind, style))
+        return generations[-1].path if generations else None
+
+    def generations(self, kind, style=None):
+        """Alle Generationen einer Art/eines Styles, älteste zuerst."""
+        return list(self.artifacts.get((kind, style), ()))
+
+    def styles(self, kind):
+        """Alle Styles, für die es Artefakte der Art `kind` gibt."""
+        return sorted(style for artifact_kind, style in self.artifacts if artifact_kind == kind and style is not None)
+
+    def latest_by_style(self, kind):
+        """{style: neuester Pfad} für eine Art."""
+        return {style: self.latest(kind, style) for style in self.styles(kind)}
+
+
+_INDEXES = {}
+
+
+def get_project_index(project_dir):
+    """Geteilter Index pro Projekt-Ordner; wird neu gescannt, wenn sich der Ordner geändert hat."""
+    key = Path(project_dir).resolve()
+    index = _INDEXES.get(key)
+    if index is None:
+        index = _INDEXES[key] = ProjectIndex(key)
+    elif index.is_stale():
+        index.refresh()
+    return index
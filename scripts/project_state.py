@@ -0,0 +1,182 @@
+#!/usr/bin/env python3
+"""
+Projekt-Zustand in einer lokalen SQLite-Datenbank (`content/.project_state.sqlite`).
+- Ersetzt das Umbenennen fertiger Projekte in processed_<name>_<datum> und das Verschieben
+  nach processed_contents_archives: Content-Ordner behalten ihren Pfad.
+- Pro Projekt und Stufe: Status (pending | done | failed | skipped), zuletzt beobachteter
+  Input-Schlüssel, Schlüssel des letzten erfolgreichen Laufs, Fehlertext und Outputs
+  (Pfad, Größe, mtime_ns).
+- "Welche Projekte müssen neu gebaut werden?" ist eine Abfrage über den Index (stage, status)
+  statt einer Namenskonvention, die jedes Skript selbst filtern muss.
+- Stufen: interpret_colors, interpret_styles, Stufe01, inject_styles (über record_stage, mit dem
+  Schlüssel ihres Build-Caches als Input-Hash) und generate_site (V03-Generator).
+- Ordner aus dem alten Verfahren (processed_*, proceed_*, *_archives) gelten nicht als Projekte.
+"""
+import os
+import sqlite3
+from datetime import datetime
+from pathlib import Path
+
+STATE_FILENAME = ".project_state.sqlite"
+LEGACY_PREFIXES = ("processed_", "proceed_")
+LEGACY_SUFFIX = "_archives"
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS projects (
+    name TEXT PRIMARY KEY,
+    path TEXT NOT NULL,
+    active INTEGER NOT NULL DEFAULT 1,
+    first_seen TEXT NOT NULL,
+    last_seen TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS stages (
+    project TEXT NOT NULL REFERENCES projects(name) ON DELETE CASCADE,
+    stage TEXT NOT NULL,
+    status TEXT NOT NULL DEFAULT 'pending',
+    input_hash TEXT,
+    built_hash TEXT,
+    error TEXT,
+    updated_at TEXT NOT NULL,
+    PRIMARY KEY (project, stage)
+);
+CREATE INDEX IF NOT EXISTS stages_by_status ON stages (stage, status);
+CREATE TABLE IF NOT EXISTS outputs (
+    project TEXT NOT NULL,
+    stage TEXT NOT NULL,
+    path TEXT NOT NULL,
+    size INTEGER NOT NULL,
+    mtime_ns INTEGER NOT NULL,
+    PRIMARY KEY (project, stage, path),
+    FOREIGN KEY (project, stage) REFERENCES stages(project, stage) ON DELETE CASCADE
+);
+"""
+
+
+def _now():
+    return datetime.now().isoformat(timespec='seconds')
+
+
+def is_project_dir(path):
+    """Content-Ordner, der ein Projekt ist (keine versteckten oder Alt-Archiv-Ordner)."""
+    name = path.name
+    return (path.is_dir() and not name.startswith(".") and not name.startswith(LEGACY_PREFIXES)
+            and not name.endswith(LEGACY_SUFFIX))
+
+
+def discover_projects(content_dir):
+    """Alle Projekt-Ordner unter content/, sortiert nach Name."""
+    return sorted(path for path in Path(content_dir).iterdir() if is_project_dir(path))
+
+
+class ProjectStateStore:
+    """Zustands-Datenbank; nur im Hauptprozess benutzen (Worker liefern ihre Ergebnisse per Summary)."""
+
+    def __init__(self, db_path):
+        self.db_path = Path(db_path)
+        self.conn = sqlite3.connect(self.db_path)
+        self.conn.execute("PRAGMA foreign_keys = ON")
+        self.conn.executescript(SCHEMA)
+
+    def close(self):
+        self.conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def sync(self, project_dirs):
+        """Registriert die vorhandenen Projekt-Ordner; nicht mehr vorhandene werden inaktiv."""
+        now = _now()
+        with self.conn:
+            self.conn.execute("UPDATE projects SET active = 0")
+            self.conn.executemany(
+                "INSERT INTO projects (name, path, active, first_seen, last_seen) VALUES (?, ?, 1, ?, ?) "
+                "ON CONFLICT(name) DO UPDATE SET path = excluded.path, active = 1, last_seen = excluded.last_seen",
+                [(path.name, str(Path(path).resolve()), now, now) for path in project_dirs])
+
+    def register(self, project_dir):
+        """Registriert einen einzelnen Projekt-Ordner als aktiv (ohne die übrigen anzufassen)."""
+        now = _now()
+        with self.conn:
+            self.conn.execute(
+                "INSERT INTO projects (name, path, active, first_seen, last_seen) VALUES (?, ?, 1, ?, ?) "
+                "ON CONFLICT(name) DO UPDATE SET path = excluded.path, active = 1, last_seen = excluded.last_seen",
+                (Path(project_dir).name, str(Path(project_dir).resolve()), now, now))
+
+    def observe(self, project, stage, input_hash):
+        """Hält den aktuellen Input-Schlüssel einer Stufe fest (Status bleibt, neue Stufen sind 'pending')."""
+        with self.conn:
+            self.conn.execute(
+                "INSERT INTO stages (project, stage, input_hash, updated_at) VALUES (?, ?, ?, ?) "
+                "ON CONFLICT(project, stage) DO UPDATE SET input_hash = excluded.input_hash",
+                (project, stage, input_hash, _now()))
+
+    def needing_rebuild(self, stage):
+        """Aktive Projekte, deren Stufe nicht 'done' ist oder deren Inputs sich seit dem letzten Lauf geändert haben."""
+        rows = self.conn.execute(
+            "SELECT p.name FROM projects p LEFT JOIN stages s ON s.project = p.name AND s.stage = ? "
+            "WHERE p.active = 1 AND (s.status IS NULL OR s.status != 'done' OR s.built_hash IS NOT s.input_hash) "
+            "ORDER BY p.name", (stage,))
+        return [name for (name,) in rows]
+
+    def outputs(self, project, stage):
+        rows = self.conn.execute("SELECT path FROM outputs WHERE project = ? AND stage = ? ORDER BY path", (project, stage))
+        return [Path(path) for (path,) in rows]
+
+    def intact_outputs(self, project, stage):
+        """Outputs der Stufe, wenn alle unverändert existieren (Größe, mtime_ns), sonst None."""
+        paths = []
+        for path, size, mtime_ns in self.conn.execute(
+                "SELECT path, size, mtime_ns FROM outputs WHERE project = ? AND stage = ?", (project, stage)):
+            try:
+                stat = os.stat(path)
+            except FileNotFoundError:
+                return None
+            if stat.st_size != size or stat.st_mtime_ns != mtime_ns:
+                return None
+            paths.append(Path(path))
+        return sorted(paths)
+
+    def _set_status(self, project, stage, status, built_hash=None, error=None):
+        self.conn.execute(
+            "INSERT INTO stages (project, stage, status, built_hash, error, updated_at) VALUES (?, ?, ?, ?, ?, ?) "
+            "ON CONFLICT(project, stage) DO UPDATE SET status = excluded.status, built_hash = excluded.built_hash, "
+            "error = excluded.error, updated_at = excluded.updated_at",
+            (project, stage, status, built_hash, error, _now()))
+
+    def mark_done(self, project, stage, built_hash, outputs):
+        """Stufe erfolgreich gelaufen: Schlüssel der verwendeten Inputs und Output-Signaturen speichern."""
+        with self.conn:
+            self._set_status(project, stage, "done", built_hash=built_hash)
+            self.conn.execute("DELETE FROM outputs WHERE project = ? AND stage = ?", (project, stage))
+            rows = []
+            for output in outputs:
+                stat = os.stat(output)
+                rows.append((project, stage, str(Path(output).resolve()), stat.st_size, stat.st_mtime_ns))
+            self.conn.executemany("INSERT INTO outputs (project, stage, path, size, mtime_ns) VALUES (?, ?, ?, ?, ?)", rows)
+
+    def mark_failed(self, project, stage, error):
+        with self.conn:
+            self._set_status(project, stage, "failed", error=error)
+
+    def mark_skipped(self, project, stage, reason):
+        with self.conn:
+            self._set_status(project, stage, "skipped", error=reason)
+
+
+def record_stage(project_dir, stage, input_hash, outputs=(), error=None):
+    """
+    Ergebnis einer Stufe für die Einzel-Skripte: Input-Schlüssel und Status ('done' mit Outputs,
+    mit `error` 'failed') in der Zustands-DB des content/-Ordners, in dem das Projekt liegt.
+    """
+    project_dir = Path(project_dir)
+    with ProjectStateStore(project_dir.parent / STATE_FILENAME) as state:
+        state.register(project_dir)
+        state.observe(project_dir.name, stage, input_hash)
+        if error is None:
+            state.mark_done(project_dir.name, stage, input_hash, outputs)
+        else:
+            state.mark_failed(project_dir.name, stage, error)
+
@@ -0,0 +1,185 @@
+#!/usr/bin/env python3
+"""
+Inkrementelles Veröffentlichen von docs/.
+- Ein Hash-Manifest des zuletzt veröffentlichten Stands (`docs/.publish_state.json`) wird mit
+  dem aktuellen docs/-Baum verglichen: hinzugefügte, geänderte und entfernte Dateien.
+- Ausgegeben wird nur das Delta, als Verzeichnis oder als tar-Stream (Datei oder stdout) für
+  den Upload-Job; `_delta.json` im Delta listet zusätzlich die zu löschenden Dateien.
+- Entscheidend ist der Inhalts-Hash: eine neu geschriebene, aber gleiche Seite ist keine Änderung.
+- Hashes werden über (mtime_ns, Größe) aus dem letzten Stand übernommen; nur geänderte
+  Dateien werden gelesen.
+- Der neue Stand wird erst gespeichert, nachdem das Delta vollständig geschrieben ist;
+  ein Delta-Verzeichnis wird dabei komplett ersetzt, nie mit einem alten Delta vermischt.
+- Nicht veröffentlicht: docs_archives/, Logs, versteckte Dateien sowie .part/.tmp-Reste.
+"""
+import hashlib
+import io
+import json
+import os
+import shutil
+import tarfile
+import tempfile
+from pathlib import Path
+
+STATE_FILENAME = ".publish_state.json"
+STATE_VERSION = 1
+DELTA_FILENAME = "_delta.json"
+EXCLUDED_DIRS = {"docs_archives"}
+EXCLUDED_SUFFIXES = (".log", ".part", ".tmp")
+HASH_BLOCK_SIZE = 1024 * 1024
+
+
+def _file_digest(path):
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(HASH_BLOCK_SIZE), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def _is_published(name):
+    return not name.startswith(".") and not name.endswith(EXCLUDED_SUFFIXES)
+
+
+def _walk(root, directory=""):
+    """(relativer Pfad, os.DirEntry) aller veröffentlichten Dateien, sortiert."""
+    with os.scandir(os.path.join(root, directory) if directory else root) as entries:
+        for entry in sorted(entries, key=lambda e: e.name):
+            relative = f"{directory}/{entry.name}" if directory else entry.name
+            if entry.is_dir(follow_symlinks=False):
+                if entry.name not in EXCLUDED_DIRS and not entry.name.startswith("."):
+                    yield from _walk(root, relative)
+            elif entry.is_file() and _is_published(entry.name):
+                yield relative, entry
+
+
+def load_state(docs_dir):
+    """Zuletzt veröffentlichter Stand: {relativer Pfad: {sha256, size, mtime_ns}} (leer beim ersten Mal)."""
+    state_path = Path(docs_dir) / STATE_FILENAME
+    try:
+        with state_path.open(encoding='utf-8') as f:
+            data = json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return {}
+    return data.get("files", {}) if data.get("version") == STATE_VERSION else {}
+
+
+def save_state(docs_dir, files):
+    state_path = Path(docs_dir) / STATE_FILENAME
+    tmp_path = state_path.with_name(state_path.name + ".tmp")
+    with tmp_path.open('w', encoding='utf-8') as f:
+        json.dump({"version": STATE_VERSION, "files": dict(sorted(files.items()))}, f, indent=2)
+    os.replace(tmp_path, state_path)
+
+
+def scan_tree(docs_dir, previous=None):
+    """Aktueller Stand des docs/-Baums; Hashes unveränderter Dateien (mtime, Größe) kommen aus `previous`."""
+    previous = previous or {}
+    files = {}
+    for relative, entry in _walk(str(docs_dir)):
+        stat = entry.stat()
+        known = previous.get(relative)
+        if known and known["mtime_ns"] == stat.st_mtime_ns and known["size"] == stat.st_size:
+            digest = known["sha256"]
+        else:
+            digest = _file_digest(entry.path)
+        files[relative] = {"sha256": digest, "size": stat.st_size, "mtime_ns": stat.st_mtime_ns}
+    return files
+
+
+class Delta:
+    """Unterschied zwischen veröffentlichtem und aktuellem Stand."""
+
+    __slots__ = ("added", "changed", "removed", "files")
+
+    def __init__(self, published, current):
+        self.files = current
+        self.added = sorted(name for name in current if name not in published)
+        self.changed = sorted(name for name in current if name in published and published[name]["sha256"] != current[name]["sha256"])
+        self.removed = sorted(name for name in published if name not in current)
+
+    @property
+    def upload(self):
+        return self.added + self.changed
+
+    @property
+    def bytes_upload(self):
+        return sum(self.files[name]["size"] for name in self.upload)
+
+    @property
+    def bytes_total(self):
+        return sum(entry["size"] for entry in self.files.values())
+
+    def __bool__(self):
+        return bool(self.added or self.changed or self.removed)
+
+    def description(self):
+        """Inhalt von _delta.json: was hochzuladen und was zu löschen ist."""
+        return {"added": self.added, "changed": self.changed, "removed": self.removed,
+                "sha256": {name: self.files[name]["sha256"] for name in self.upload}}
+
+
+def compute_delta(docs_dir):
+    """Vergleicht docs/ mit dem zuletzt veröffentlichten Stand."""
+    published = load_state(docs_dir)
+    return Delta(published, scan_tree(docs_dir, published))
+
+
+def write_delta_dir(delta, docs_dir, target_dir):
+    """
+    Kopiert hinzugefügte/geänderte Dateien (mit relativen Pfaden) und _delta.json nach `target_dir`.
+    Das Delta entsteht in einem frischen Nachbarordner und ersetzt `target_dir` erst danach, damit
+    keine Dateien eines früheren Deltas liegen bleiben. Ein nicht leerer Ordner ohne _delta.json
+    ist kein früheres Delta und wird nicht überschrieben.
+    """
+    target_dir = Path(target_dir)
+    if target_dir.exists() and any(target_dir.iterdir()) and not (target_dir / DELTA_FILENAME).is_file():
+        raise FileExistsError(f"{target_dir} ist nicht leer und enthält kein früheres Delta ({DELTA_FILENAME})")
+    target_dir.parent.mkdir(parents=True, exist_ok=True)
+    staging_dir = Path(tempfile.mkdtemp(prefix=f".{target_dir.name}.", suffix=".tmp", dir=target_dir.parent))
+    try:
+        for name in delta.upload:
+            destination = staging_dir / name
+            destination.parent.mkdir(parents=True, exist_ok=True)
+            shutil.copy2(Path(docs_dir) / name, destination)
+        (staging_dir / DELTA_FILENAME).write_text(json.dumps(delta.description(), indent=2), encoding='utf-8')
+        if target_dir.exists():
+            previous_dir = staging_dir.with_name(staging_dir.name[:-len(".tmp")] + ".old")
+            os.replace(target_dir, previous_dir)
+            os.replace(staging_dir, target_dir)
+            shutil.rmtree(previous_dir)
+        else:
+            os.replace(staging_dir, target_dir)
+    finally:
+        if staging_dir.exists():
+            shutil.rmtree(staging_dir)
+
+
+def write_delta_tar(delta, docs_dir, fileobj, compression=""):
+    """Schreibt das Delta als tar-Stream (`compression`: "" oder "gz") in ein binäres Datei-Objekt."""
+    with tarfile.open(fileobj=fileobj, mode=f"w|{compression}") as tar:
+        for name in delta.upload:
+            tar.add(Path(docs_dir) / name, arcname=name, recursive=False)
+        data = json.dumps(delta.description(), indent=2).encode('utf-8')
+        info = tarfile.TarInfo(DELTA_FILENAME)
+        info.size = len(data)
+        tar.addfile(info, io.BytesIO(data))
+
+
+def publish(docs_dir, out_dir=None, tar_file=None, compression="", dry_run=False):
+    """
+    Berechnet das Delta und schreibt es nach `out_dir` bzw. in `tar_file` (Pfad oder Datei-Objekt).
+    Ohne dry_run wird danach der aktuelle Stand als veröffentlicht gespeichert.
+    """
+    delta = compute_delta(docs_dir)
+    if not dry_run:
+        if out_dir is not None:
+            write_delta_dir(delta, docs_dir, out_dir)
+        if tar_file is not None:
+            if hasattr(tar_file, "write"):
+                write_delta_tar(delta, docs_dir, tar_file, compression)
+            else:
+                with open(tar_file, 'wb') as f:
+                    write_delta_tar(delta, docs_dir, f, compression)
+        save_state(docs_dir, delta.files)
+    return delta
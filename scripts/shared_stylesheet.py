@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+"""
+Gemeinsames, inhalts-gehashtes Stylesheet für alle generierten Seiten.
+- Zieht alle <style>-Blöcke aus einer fertigen Seite.
+- :root-Regeln (Farben und Variablen, je Variante und Projekt verschieden) bleiben als
+  kleiner Inline-Block im <head>, auch innerhalb von @media.
+- Alles andere (Basis- und Komponenten-CSS) wird dedupliziert, in Dokument-Reihenfolge
+  zusammengefügt und als docs/assets/css/<hash>.css abgelegt. Der Name ist ein Hash des
+  Inhalts: Seiten mit gleichem CSS (alle Varianten, alle Projekte mit denselben Modulen)
+  verweisen auf dieselbe Datei, die Browser und CDNs unbegrenzt cachen können.
+"""
+import hashlib
+import os
+import re
+from pathlib import Path
+
+from css_consolidator import STYLE_BLOCK, StyleSheet
+from css_pruner import LEADING_TRIVIA, parse_css
+from html_writer import write_chunks
+
+ASSETS_SUBDIR = Path("assets") / "css"
+HASH_LENGTH = 16
+HEAD_END = re.compile(r'</head>', re.IGNORECASE)
+
+
+def _node_text(node):
+    if node[0] == "raw":
+        return node[1]
+    if node[0] == "rule":
+        return node[1] + node[2]
+    return node[1] + "".join(_node_text(child) for child in node[2]) + node[3]
+
+
+def _is_root_rule(node):
+    return node[0] == "rule" and node[1][len(LEADING_TRIVIA.match(node[1]).group(0)):].strip() == ":root"
+
+
+def _is_root_only(node):
+    """:root-Regel oder Gruppe (@media ...), die nur :root-Regeln enthält."""
+    if node[0] == "group":
+        rules = [child for child in node[2] if child[0] != "raw"]
+        return bool(rules) and all(_is_root_only(child) for child in rules)
+    return _is_root_rule(node)
+
+
+def split_root_css(css):
+    """CSS -> (:root-Anteil, restliches CSS); beide in Original-Reihenfolge."""
+    root_parts, shared_parts = [], []
+    for node in parse_css(css):
+        (root_parts if _is_root_only(node) else shared_parts).append(_node_text(node))
+    return "".join(root_parts), "".join(shared_parts)
+
+
+class SharedStylesheet:
+    """Lagert das gemeinsame CSS von Seiten in docs/assets/css/<hash>.css aus."""
+
+    def __init__(self, output_dir):
+        self.output_dir = Path(output_dir)
+        self.css_dir = self.output_dir / ASSETS_SUBDIR
+        self.written = {}
+
+    def _write(self, css_text):
+        digest = hashlib.sha256(css_text.encode('utf-8')).hexdigest()[:HASH_LENGTH]
+        css_path = self.css_dir / f"{digest}.css"
+        created = False
+        if digest not in self.written and not css_path.exists():
+            self.css_dir.mkdir(parents=True, exist_ok=True)
+            write_chunks(css_path, [css_text])
+            created = True
+        self.written[digest] = css_path
+        return digest, css_path, created
+
+    def externalize(self, html, page_path=None):
+        """
+        Seite -> (Seite mit <link> und Inline-:root-Block, Kennzahlen).
+        `page_path` bestimmt den relativen Link (Standard: Seite liegt direkt im Ausgabeordner).
+        """
+        blocks = STYLE_BLOCK.findall(html)
+        if not blocks:
+            return html, None
+        shared = StyleSheet()
+        root_parts = []
+        for css in blocks:
+            root_css, shared_css = split_root_css(css)
+            if root_css.strip():
+                root_parts.append(root_css.strip('\n'))
+            if shared_css.strip():
+                shared.add(shared_css)
+        css_text = "\n".join(shared.blocks) + "\n"
+        digest, css_path, created = self._write(css_text)
+
+        page_dir = Path(page_path).parent if page_path else self.output_dir
+        href = os.path.relpath(css_path, page_dir).replace(os.sep, "/")
+        head = f'<link rel="stylesheet" href="{href}">\n'
+        inline = "\n".join(root_parts)
+        if inline:
+            head += f"<style>\n{inline}\n</style>\n"
+
+        page = STYLE_BLOCK.sub('', html)
+        match = HEAD_END.search(page)
+        page = page[:match.start()] + head + page[match.start():] if match else head + page
+        stats = {"hash": digest, "path": css_path, "created": created,
+                 "shared_bytes": len(css_text.encode('utf-8')), "inline_bytes": len(inline.encode('utf-8')),
+                 "page_bytes_before": len(html.encode('utf-8')), "page_bytes_after": len(page.encode('utf-8'))}
+        return page, stats
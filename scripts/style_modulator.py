@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+"""
+Kompilierter style_modulator (plus fixed_layouts aus layout_rules.json).
+- Alle {{colors.*}}-Tokens in alternating_backgrounds, element_styles und fixed_layouts
+  werden einmal pro Palette aufgelöst, statt verstreut per verketteter .replace-Aufrufe
+  (oder gar nicht) in den einzelnen Skripten.
+- Ergebnis pro Variante: aufgelöste Hintergründe, Element-Styles und die Style-Namen
+  für interpret_styles, dazu eine Kontrast-Näherung pro Hintergrund (halbtransparente
+  Akzent-Hintergründe werden für den Kontrast-Check als Akzentfarbe gewertet).
+- Cache über Palette-Hash (und Hash von Modulator/Regeln): Projekte mit gleichen
+  Markenfarben verwenden dieselbe kompilierte Struktur. Die Strukturen werden geteilt
+  und dürfen nicht verändert werden (bei Bedarf kopieren).
+"""
+import hashlib
+import json
+import re
+
+from color_contrast import parse_hex
+
+COLOR_TOKEN = re.compile(r"\{\{colors\.([A-Za-z0-9_]+)\}\}")
+ACCENT_RGB_TOKEN = "{{colors.accent_color_rgb}}"
+DEFAULT_BACKGROUNDS = ("#FFFFFF", "#F5F5F5")
+
+_COMPILED = {}
+
+
+def data_hash(data):
+    """Stabiler Hash einer JSON-Struktur (Key-Reihenfolge egal)."""
+    return hashlib.sha256(json.dumps(data, sort_keys=True, separators=(",", ":")).encode("utf-8")).hexdigest()[:16]
+
+
+def palette_hash(colors):
+    return data_hash(colors)
+
+
+def _token_value(value):
+    # Listen (z.B. accent_color_rgb) werden wie in CSS-rgba() durch Kommas verbunden
+    return ",".join(map(str, value)) if isinstance(value, (list, tuple)) else str(value)
+
+
+def resolve_tokens(data, colors):
+    """Ersetzt {{colors.<key>}} in Strings (rekursiv in dicts/lists); unbekannte Keys bleiben stehen."""
+    if isinstance(data, str):
+        if "{{" not in data:
+            return data
+        return COLOR_TOKEN.sub(lambda match: _token_value(colors[match.group(1)]) if match.group(1) in colors else match.group(0), data)
+    if isinstance(data, dict):
+        return {key: resolve_tokens(value, colors) for key, value in data.items()}
+    if isinstance(data, list):
+        return [resolve_tokens(value, colors) for value in data]
+    return data
+
+
+class CompiledVariant:
+    """Eine Modulator-Variante mit aufgelösten Farben."""
+
+    __slots__ = ("alternating_backgrounds", "element_styles", "image_frame", "card_style", "button_style")
+
+    def __init__(self, alternating_backgrounds, element_styles):
+        self.alternating_backgrounds = alternating_backgrounds
+        self.element_styles = element_styles
+        self.image_frame = element_styles.get("image_frame", {}).get("style", "none")
+        self.card_style = element_styles.get("card", {}).get("style", "none")
+        self.button_style = element_styles.get("button", {}).get("style", "none")
+
+
+class CompiledModulator:
+    """Alle Varianten und fixed_layouts einer Palette, plus Kontrast-Näherungen der Hintergründe."""
+
+    __slots__ = ("palette_hash", "variants", "default_variant", "fixed_layouts", "contrast_backgrounds")
+
+    def __init__(self, palette_hash, variants, default_variant, fixed_layouts, contrast_backgrounds):
+        self.palette_hash = palette_hash
+        self.variants = variants
+        self.default_variant = default_variant
+        self.fixed_layouts = fixed_layouts
+        self.contrast_backgrounds = contrast_backgrounds
+
+    def variant(self, name):
+        """Kompilierte Variante; unbekannte Namen bekommen die Standardwerte (weiß/grau, Styles 'none')."""
+        return self.variants.get(name, self.default_variant)
+
+    def contrast_background(self, background):
+        """Hex-Farbe, gegen die der Textkontrast eines (aufgelösten) Hintergrunds geprüft wird."""
+        return self.contrast_backgrounds.get(background, background)
+
+
+def _compile(style_modulator, colors, layout_rules):
+    accent = colors.get("accent_color")
+    accent_hex = "#%02X%02X%02X" % parse_hex(accent) if accent else None
+    contrast_backgrounds = {}
+
+    def background(raw):
+        resolved = resolve_tokens(raw, colors)
+        if accent_hex and ACCENT_RGB_TOKEN in raw:
+            # rgba(<akzent>, 0.2/0.3) über Weiß: für den Kontrast-Check als Akzentfarbe genähert
+            contrast_backgrounds[resolved] = accent_hex
+        return resolved
+
+    def compile_variant(variant_styles):
+        backgrounds = [background(raw) for raw in variant_styles.get("alternating_backgrounds", DEFAULT_BACKGROUNDS)]
+        return CompiledVariant(backgrounds, resolve_tokens(variant_styles.get("element_styles", {}), colors))
+
+    variants = {name: compile_variant(variant_styles) for name, variant_styles in style_modulator.get("variants", {}).items()}
+    fixed_layouts = {}
+    for component, layout in (layout_rules or {}).get("fixed_layouts", {}).items():
+        fixed_layouts[component] = {key: background(value) if key == "background_color" else resolve_tokens(value, colors)
+                                    for key, value in layout.items()}
+    return CompiledModulator(palette_hash(colors), variants, compile_variant({}), fixed_layouts, contrast_backgrounds)
+
+
+def compile_modulator(style_modulator, colors, layout_rules=None):
+    """Kompilierter Modulator für eine Palette; gecacht über Palette-, Modulator- und Regel-Hash."""
+    key = (palette_hash(colors), data_hash(style_modulator), data_hash(layout_rules or {}))
+    if key not in _COMPILED:
+        _COMPILED[key] = _compile(style_modulator, colors, layout_rules)
+    return _COMPILED[key]
@@ -0,0 +1,284 @@
+#!/usr/bin/env python3
+"""
+Template-Engine für die Komponenten-HTMLs.
+- Zerlegt ein HTML-Template einmalig in Literal- und Platzhalter-Segmente.
+- Rendert danach in einem einzigen Durchlauf mit Dictionary-Lookups,
+  statt pro Mapping-Key ein komplettes str.replace über das Template zu laufen.
+- Indiziert BEGIN_LIST_ITEM/END_LIST_ITEM-Blöcke einmalig als Baum mit Offsets,
+  sodass Listen-Expansion nur noch ein Join über vorkompilierte Item-Renderer ist.
+- Streaming-Modus: iter_render liefert die fertige Komponente als Chunks,
+  ohne Zwischenkopien des ganzen Dokuments im Speicher.
+"""
+import re
+from collections import ChainMap
+from functools import lru_cache
+
+# Identisch mit dem Muster, das die Generatoren für {{...}} verwenden
+PLACEHOLDER_PATTERN = re.compile(r'\{\{([^}]+)\}\}')
+LIST_MARKER_PATTERN = re.compile(r'<!-- (BEGIN|END)_LIST_ITEM:([\w.]+) -->')
+
+
+class CompiledTemplate:
+    """Ein vorkompiliertes Template aus Literal- und Platzhalter-Segmenten."""
+
+    __slots__ = ("source", "literals", "keys")
+
+    def __init__(self, source):
+        self.source = source
+        # literals hat immer genau ein Element mehr als keys:
+        # literals[0] keys[0] literals[1] keys[1] ... literals[-1]
+        self.literals = []
+        self.keys = []
+        position = 0
+        for match in PLACEHOLDER_PATTERN.finditer(source):
+            self.literals.append(source[position:match.start()])
+            self.keys.append(match.group(1))
+            position = match.end()
+        self.literals.append(source[position:])
+
+    @property
+    def placeholders(self):
+        """Alle im Template vorkommenden Platzhalter-Keys (ohne Duplikate, in Reihenfolge)."""
+        return list(dict.fromkeys(self.keys))
+
+    def render(self, mapping, missing=None):
+        """
+        Ersetzt alle {{key}} Platzhalter in einem Durchlauf.
+        Unbekannte Platzhalter bleiben unverändert stehen und werden, falls
+        `missing` ein Set ist, dort eingetragen.
+        """
+        if not self.keys:
+            return self.source
+        literals = self.literals
+        parts = [literals[0]]
+        append = parts.append
+        for index, key in enumerate(self.keys, 1):
+            value = mapping.get(key, _MISSING)
+            if value is _MISSING:
+                if missing is not None:
+                    missing.add(key)
+                append("{{" + key + "}}")
+            else:
+                append(value if isinstance(value, str) else str(value))
+            append(literals[index])
+        return "".join(parts)
+
+
+_MISSING = object()
+
+
+@lru_cache(maxsize=512)
+def compile_template(source):
+    """Kompiliert ein Template und cached das Ergebnis pro Quelltext."""
+    return CompiledTemplate(source)
+
+
+def render_template(source, mapping, missing=None):
+    """Kurzform: kompilieren (gecached) und direkt rendern."""
+    return compile_template(source).render(mapping, missing)
+
+
+class ListBlock:
+    """
+    Ein BEGIN_LIST_ITEM/END_LIST_ITEM-Block im Template.
+    start/end umfassen den Block inkl. Marker, body_start/body_end nur das Item-Template.
+    """
+
+    __slots__ = ("marker", "start", "end", "body_start", "body_end", "item", "children", "segments")
+
+    def __init__(self, marker, start, body_start):
+        self.marker = marker
+        self.start = start
+        self.body_start = body_start
+        self.body_end = None
+        self.end = None
+        self.item = None
+        self.children = []
+        # Item-Template zerlegt in kompilierte Text-Segmente und verschachtelte Blöcke
+        self.segments = []
+
+    @property
+    def placeholders(self):
+        """Platzhalter-Keys innerhalb des Item-Templates (roh, nicht gestrippt)."""
+        return self.item.placeholders
+
+
+class ListIndex:
+    """Vorindizierte Listen-Blöcke eines Templates (Baum, in Quelltext-Reihenfolge)."""
+
+    __slots__ = ("source", "blocks", "by_marker", "segments")
+
+    def __init__(self, source):
+        self.source = source
+        self.blocks = []
+        self.by_marker = {}
+        stack = []
+        for match in LIST_MARKER_PATTERN.finditer(source):
+            kind, marker = match.group(1), match.group(2)
+            if kind == "BEGIN":
+                stack.append(ListBlock(marker, match.start(), match.end()))
+                continue
+            # END ohne passendes BEGIN wird ignoriert (bleibt Literal)
+            if not any(block.marker == marker for block in stack):
+                continue
+            # Nicht geschlossene innere Blöcke verwerfen (bleiben Literal)
+            while stack[-1].marker != marker:
+                stack.pop()
+            block = stack.pop()
+            block.body_end = match.start()
+            block.end = match.end()
+            block.item = CompiledTemplate(source[block.body_start:block.body_end])
+            (stack[-1].children if stack else self.blocks).append(block)
+            self.by_marker.setdefault(marker, []).append(block)
+        # Geschlossene Blöcke innerhalb nie geschlossener Eltern gehören auf die oberste Ebene
+        for orphan in stack:
+            self.blocks.extend(orphan.children)
+        self.blocks.sort(key=lambda block: block.start)
+        self.segments = self._build_segments(0, len(source), self.blocks)
+
+    def _build_segments(self, start, end, blocks):
+        segments = []
+        position = start
+        for block in blocks:
+            if block.start > position:
+                segments.append(CompiledTemplate(self.source[position:block.start]))
+            block.segments = self._build_segments(block.body_start, block.body_end, block.children)
+            segments.append(block)
+            position = block.end
+        if end > position:
+            segments.append(CompiledTemplate(self.source[position:end]))
+        return segments
+
+    @property
+    def markers(self):
+        return list(self.by_marker)
+
+    def expand(self, lists):
+        """
+        Ersetzt jeden Block, dessen Marker in `lists` vorkommt, durch seine gerenderten Items.
+        `lists` bildet Marker (z.B. 'benefits_section.benefits_list') auf eine Liste
+        von Item-Mappings ab. Blöcke ohne Daten bleiben unverändert stehen.
+        """
+        if not self.blocks or not lists:
+            return self.source
+        return self._expand_range(0, len(self.source), self.blocks, lists)
+
+    def _expand_range(self, start, end, blocks, lists):
+        source = self.source
+        parts = []
+        position = start
+        for block in blocks:
+            parts.append(source[position:block.start])
+            items = lists.get(block.marker)
+            if items is None:
+                parts.append(source[block.start:block.body_start])
+                parts.append(self._expand_range(block.body_start, block.body_end, block.children, lists))
+                parts.append(source[block.body_end:block.end])
+            else:
+                item = block.item
+                if block.children:
+                    item = compile_template(self._expand_range(block.body_start, block.body_end, block.children, lists))
+                parts.append("".join(item.render(item_mapping) for item_mapping in items))
+            position = block.end
+        parts.append(source[position:end])
+        return "".join(parts)
+
+
+    def iter_render(self, mapping, lists=None, missing=None):
+        """
+        Streaming-Rendering: Listen expandieren und Platzhalter ersetzen in einem Durchlauf.
+        Liefert Chunks (Text-Segmente bzw. einzelne Items) statt eines Gesamtstrings.
+        Platzhalter in Items werden zuerst aus dem Item-Mapping, dann aus `mapping` gefüllt.
+        """
+        return self._iter_segments(self.segments, mapping, lists or {}, missing)
+
+    def _iter_segments(self, segments, mapping, lists, missing):
+        source = self.source
+        for segment in segments:
+            if isinstance(segment, CompiledTemplate):
+                yield segment.render(mapping, missing)
+                continue
+            items = lists.get(segment.marker)
+            if items is None:
+                yield source[segment.start:segment.body_start]
+                yield from self._iter_segments(segment.segments, mapping, lists, missing)
+                yield source[segment.body_end:segment.end]
+            else:
+                for item_mapping in items:
+                    yield from self._iter_segments(segment.segments, ChainMap(item_mapping, mapping), lists, missing)
+
+
+@lru_cache(maxsize=512)
+def index_list_blocks(source):
+    """Indiziert die Listen-Blöcke eines Templates und cached das Ergebnis pro Quelltext."""
+    return ListIndex(source)
+
+
+class PlaceholderResolver:
+    """
+    Löst Platzhalter in einem Dokument in einem einzigen Scan auf.
+    Werte, die selbst wieder {{...}} enthalten, werden rekursiv aufgelöst
+    und pro Key memoisiert; Zyklen werden erkannt statt endlos expandiert.
+    """
+
+    def __init__(self, mapping, strip_keys=True):
+        self.mapping = mapping
+        self.strip_keys = strip_keys
+        self.unresolved = set()
+        self.cyclic = set()
+        self._resolved = {}
+        self._active = set()
+
+    def resolve(self, text):
+        """Ersetzt alle Platzhalter in `text`; unbekannte oder zyklische bleiben stehen."""
+        if "{{" not in text:
+            return text
+        return PLACEHOLDER_PATTERN.sub(self._substitute, text)
+
+    def _substitute(self, match):
+        key = match.group(1).strip() if self.strip_keys else match.group(1)
+        value = self._expand(key)
+        return match.group(0) if value is None else value
+
+    def _expand(self, key):
+        if key in self._resolved:
+            return self._resolved[key]
+        if key not in self.mapping:
+            self.unresolved.add(key)
+            return None
+        if key in self._active:
+            self.cyclic.add(key)
+            return None
+        self._active.add(key)
+        try:
+            value = self.resolve(str(self.mapping[key]))
+        finally:
+            self._active.discard(key)
+        self._resolved[key] = value
+        return value
+
+
+def resolve_mapping_values(mapping, fallback=None, strip_keys=False):
+    """
+    Löst Platzhalter innerhalb der Werte eines Mappings auf, bevor damit gerendert wird.
+    Verweise werden zuerst in `mapping`, dann in `fallback` gesucht. Ohne verschachtelte
+    Werte wird `mapping` unverändert zurückgegeben, sonst eine aufgelöste Kopie.
+    """
+    nested = [key for key, value in mapping.items() if isinstance(value, str) and "{{" in value]
+    if not nested:
+        return mapping
+    resolver = PlaceholderResolver(mapping if fallback is None else ChainMap(mapping, fallback), strip_keys=strip_keys)
+    resolved = dict(mapping)
+    for key in nested:
+        resolved[key] = resolver.resolve(mapping[key])
+    return resolved
+
+
+def resolve_placeholders(text, mapping, strip_keys=True):
+    """
+    Fixpunkt-Auflösung in einem Durchlauf.
+    Gibt (text, unresolved_keys, cyclic_keys) zurück, beide Listen sortiert.
+    """
+    resolver = PlaceholderResolver(mapping, strip_keys=strip_keys)
+    text = resolver.resolve(text)
+    return text, sorted(resolver.unresolved), sorted(resolver.cyclic)
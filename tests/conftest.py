@@ -0,0 +1,6 @@
+"""Die Hilfsmodule liegen in scripts/ und werden dort direkt importiert (wie von den Skripten selbst)."""
+import sys
+from pathlib import Path
+
+SCRIPTS_DIR = Path(__file__).resolve().parent.parent / "scripts"
+sys.path.insert(0, str(SCRIPTS_DIR))
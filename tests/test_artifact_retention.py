@@ -0,0 +1,48 @@
+import hashlib
+import json
+
+from artifact_retention import ARCHIVE_FILENAME, compact_project, load_archive_index, restore_artifact
+
+
+def write_generations(project_dir, kind, style, stamps):
+    paths = []
+    for number, stamp in enumerate(stamps):
+        path = project_dir / f"{kind}_{style}_{stamp}.json"
+        path.write_text(json.dumps({"style": style, "generation": number, "pad": "x" * 200 * number}), encoding="utf-8")
+        paths.append(path)
+    return paths
+
+
+def test_compact_then_restore_gives_same_bytes(tmp_path):
+    project_dir = tmp_path / "P1"
+    project_dir.mkdir()
+    stamps = ["20250101_000000", "20250102_000000", "20250103_000000", "20250104_000000"]
+    paths = write_generations(project_dir, "interpreted_styles", "classic", stamps)
+    paths += write_generations(project_dir, "interpreted_styles", "stylish", stamps)
+    original = {path.name: path.read_bytes() for path in paths}
+
+    summary = compact_project(project_dir, keep=1)
+    expired = sorted(name for name in original if not name.endswith("20250104_000000.json"))
+    assert sorted(summary["archived"]) == expired
+    assert summary["bytes_freed"] == sum(len(original[name]) for name in expired)
+    assert sorted(path.name for path in project_dir.glob("interpreted_styles_*")) == sorted(set(original) - set(expired))
+
+    for name in expired:
+        assert restore_artifact(project_dir, name).read_bytes() == original[name]
+
+
+def test_same_name_keeps_every_version(tmp_path):
+    project_dir = tmp_path / "P1"
+    project_dir.mkdir()
+    old, _ = write_generations(project_dir, "interpreted_styles", "classic", ["20250101_000000", "20250102_000000"])
+    first = old.read_bytes()
+    compact_project(project_dir, keep=1)
+    # Gleicher Name, anderer Inhalt (z.B. wiederhergestellt, bearbeitet und erneut archiviert)
+    old.write_bytes(b'{"edited": true}')
+    compact_project(project_dir, keep=1)
+
+    versions = load_archive_index(project_dir)["artifacts"][old.name]
+    assert [version["sha256"] for version in versions] == [hashlib.sha256(first).hexdigest(), hashlib.sha256(b'{"edited": true}').hexdigest()]
+    assert restore_artifact(project_dir, old.name).read_bytes() == b'{"edited": true}'
+    assert restore_artifact(project_dir, old.name, overwrite=True, sha256=versions[0]["sha256"][:12]).read_bytes() == first
+    assert (project_dir / ARCHIVE_FILENAME).exists()
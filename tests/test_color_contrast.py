@@ -0,0 +1,109 @@
+"""WCAG-Kontrast-Engine (color_contrast.py) gegen die exakte WCAG-Formel (pow() pro Kanal, ohne Tabelle und Cache)."""
+import random
+
+import pytest
+
+from color_contrast import (LINEAR_LUT, WCAG_AA_NORMAL, best_text_color, contrast_ratio, contrast_table, hex_to_oklab,
+                            oklab_to_hex, repair_contrast, repair_table, score_variants)
+
+
+def reference_luminance(color):
+    """Exakte WCAG-2.x-Formel als Referenz."""
+    value = color.lstrip('#')
+    channels = []
+    for i in (0, 2, 4):
+        c = int(value[i:i + 2], 16) / 255.0
+        channels.append(c / 12.92 if c <= 0.04045 else ((c + 0.055) / 1.055) ** 2.4)
+    r, g, b = channels
+    return 0.2126 * r + 0.7152 * g + 0.0722 * b
+
+
+def reference_contrast(a, b):
+    la, lb = reference_luminance(a), reference_luminance(b)
+    return (max(la, lb) + 0.05) / (min(la, lb) + 0.05)
+
+
+def random_color(rng):
+    return "#%06X" % rng.randrange(1 << 24)
+
+
+def test_lut_matches_exact_linearization():
+    for channel in range(256):
+        c = channel / 255.0
+        assert LINEAR_LUT[channel] == (c / 12.92 if c <= 0.04045 else ((c + 0.055) / 1.055) ** 2.4)
+
+
+@pytest.mark.parametrize("a, b, expected", [
+    ("#000000", "#FFFFFF", 21.0), ("#FFFFFF", "#FFFFFF", 1.0), ("#767676", "#FFFFFF", 4.54),
+    ("#777777", "#FFFFFF", 4.48), ("#0000FF", "#FFFFFF", 8.59), ("#FF0000", "#FFFFFF", 4.0),
+])
+def test_known_pairs(a, b, expected):
+    assert round(contrast_ratio(a, b), 2) == expected
+
+
+def test_random_pairs_match_reference_and_are_symmetric():
+    rng = random.Random(42)
+    for _ in range(20_000):
+        a, b = random_color(rng), random_color(rng)
+        assert abs(contrast_ratio(a, b) - reference_contrast(a, b)) < 1e-12
+        assert contrast_ratio(a, b) == contrast_ratio(b, a)
+
+
+def test_batch_api_matches_single_pairs():
+    rng = random.Random(7)
+    backgrounds = ["#FFFFFF", "#F5F5F5"] + [random_color(rng) for _ in range(50)]
+    table = contrast_table(backgrounds + backgrounds[:10], ("#000000", "#FFFFFF"))
+    assert len(table) == 2 * len(backgrounds)
+    for (background, text), ratio in table.items():
+        assert ratio == contrast_ratio(background, text)
+    variants = {"classic": {"hero": backgrounds[0], "footer": backgrounds[2]}, "stylish": {"hero": backgrounds[3]}}
+    scores = score_variants(variants, ("#000000",))
+    assert scores["stylish"]["hero"]["#000000"] == contrast_ratio(backgrounds[3], "#000000")
+    assert set(scores["classic"]) == {"hero", "footer"}
+
+
+def test_best_text_color():
+    assert best_text_color("#FFFFFF") == "#000000"
+    assert best_text_color("#000000") == "#FFFFFF"
+    # Kein Kandidat erreicht AA: der mit dem höchsten Kontrast
+    assert best_text_color("#777777", ("#888888", "#FFFFFF")) == "#FFFFFF"
+    assert contrast_ratio("#777777", "#FFFFFF") < WCAG_AA_NORMAL
+
+
+def scan_repair(background, brand, step=0.001):
+    """Referenz für die Reparatur: kleinste Verschiebung von L per linearem Scan (beide Richtungen)."""
+    lightness, a, b = hex_to_oklab(brand)
+    shift = 0.0
+    while shift <= 1.0:
+        for candidate in (lightness - shift, lightness + shift):
+            if 0.0 <= candidate <= 1.0 and contrast_ratio(background, oklab_to_hex(candidate, a, b)) >= WCAG_AA_NORMAL:
+                return shift
+        shift += step
+    return None
+
+
+def test_repair_is_readable_with_minimal_lightness_shift():
+    rng = random.Random(42)
+    checked = 0
+    for background in ["#FFFFFF", "#F5F5F5", "#000000"] + [random_color(rng) for _ in range(20)]:
+        for _ in range(10):
+            brand = random_color(rng)
+            repaired = repair_contrast(background, brand)
+            expected_shift = scan_repair(background, brand)
+            if expected_shift is None:
+                continue
+            assert contrast_ratio(background, repaired) >= WCAG_AA_NORMAL, f"{brand} auf {background}: {repaired}"
+            # Bisektion darf nicht schlechter sein als der Scan (Toleranz: Scan-Schritt + Hex-Rundung)
+            assert abs(hex_to_oklab(repaired)[0] - hex_to_oklab(brand)[0]) <= expected_shift + 0.006
+            checked += 1
+    assert checked > 100
+
+
+def test_repair_keeps_readable_colors_and_batches_pairs():
+    assert repair_contrast("#FFFFFF", "#000080") == "#000080"
+    pairs = [("#FFFFFF", "#FFFF00"), ("#000000", "#000080"), ("#FFFFFF", "#FFFF00")]
+    table = repair_table(pairs)
+    assert len(table) == 2
+    for (background, brand), color in table.items():
+        assert color == repair_contrast(background, brand)
+        assert contrast_ratio(background, color) >= WCAG_AA_NORMAL
@@ -0,0 +1,41 @@
+import hashlib
+import json
+import shutil
+from pathlib import Path
+
+from benchmark_content_model import VARIANTS, build_styles, build_template, legacy_inject
+from content_overlay import build_overlay, materialize, resolve_content, styled_view
+from project_index import get_project_index
+
+BASE_DIR = Path(__file__).resolve().parent.parent
+GENERATOR_VERSION = "v2.0-structured-injector"
+
+
+def test_materialized_overlay_equals_legacy_copy(tmp_path):
+    """Echte Stufe01 (DEF_88): Overlay-Datei schreiben, lesen, auflösen == bisherige tiefe Kopie (inkl. Key-Reihenfolge)."""
+    source_dir = BASE_DIR / "content" / "DEF_88"
+    project_index = get_project_index(source_dir)
+    base_file = shutil.copy2(project_index.latest("project_template_Stufe01_Anleitung"), tmp_path)
+    base_bytes = Path(base_file).read_bytes()
+    base_template = json.loads(base_bytes)
+    base_sha256 = hashlib.sha256(base_bytes).hexdigest()
+
+    for variant in VARIANTS:
+        with project_index.latest("interpreted_styles", variant).open(encoding="utf-8") as f:
+            styles_data = json.load(f).get("styles", {})
+        overlay = build_overlay(base_template, base_file, base_sha256, styles_data, variant, GENERATOR_VERSION)
+        overlay = json.loads(json.dumps(overlay))
+        resolved = materialize(resolve_content(overlay, tmp_path))
+        assert json.dumps(resolved) == json.dumps(legacy_inject(base_template, styles_data, variant))
+
+
+def test_styled_view_equals_legacy_copy():
+    base_template = build_template(5, 3, 4)
+    styles = build_styles(base_template)
+    for variant in VARIANTS:
+        view = styled_view(base_template, styles[variant], variant, GENERATOR_VERSION)
+        assert json.dumps(materialize(view)) == json.dumps(legacy_inject(base_template, styles[variant], variant))
+    # Die Basis bleibt unverändert, die Sichten teilen ihre Listen
+    assert "styling_default" not in base_template["page_content"]["component_0"][0]
+    view = styled_view(base_template, styles["classic"], "classic", GENERATOR_VERSION)
+    assert view["page_content"]["component_0"][0]["items_list"] is base_template["page_content"]["component_0"][0]["items_list"]
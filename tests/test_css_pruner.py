@@ -0,0 +1,100 @@
+"""CSS-Pruning (css_pruner.py) auf den echten Komponenten und an einem kleinen Beispiel."""
+import csv
+import importlib.util
+import itertools
+import json
+import random
+import re
+from pathlib import Path
+
+import pytest
+
+from css_consolidator import STYLE_BLOCK, StyleSheet, split_styles
+from css_pruner import (CLASS_SELECTOR, ThemePruner, _prune_nodes, parse_css, prune_css, prune_style_blocks,
+                        prune_style_chunks, theme_vocabulary)
+
+BASE_DIR = Path(__file__).resolve().parent.parent
+COMPONENTS_DIR = BASE_DIR / "templates" / "components"
+COMPONENTS = {path.stem: path.read_text(encoding="utf-8") for path in sorted(COMPONENTS_DIR.glob("*.html"))}
+HEADER_SCHEMA = json.loads((COMPONENTS_DIR / "technik_header_section.json").read_text(encoding="utf-8"))
+VOCABULARY = theme_vocabulary(HEADER_SCHEMA)
+COMBINATIONS = [" ".join(combo) for combo in itertools.product(*HEADER_SCHEMA["theme_classes"]["available_options"].values())]
+
+
+@pytest.mark.parametrize("name", sorted(COMPONENTS))
+def test_parser_roundtrip(name):
+    """Ohne inaktive Theme-Klassen ergibt jeder Block exakt wieder den Originaltext."""
+    for css in split_styles(COMPONENTS[name])[1]:
+        assert _prune_nodes(parse_css(css), frozenset())[0] == css
+
+
+@pytest.mark.parametrize("theme_classes", COMBINATIONS)
+def test_no_selector_for_inactive_theme_class_remains(theme_classes):
+    stylesheet = StyleSheet(prune=ThemePruner(theme_classes, VOCABULARY))
+    for html in COMPONENTS.values():
+        stylesheet.extract(html)
+    for block in stylesheet.blocks:
+        assert_no_inactive_selectors(block, theme_classes)
+
+
+def assert_no_inactive_selectors(css, theme_classes):
+    inactive = VOCABULARY - set(theme_classes.split())
+    for rule in re.findall(r'([^{}]+)\{', re.sub(r'/\*.*?\*/', '', css, flags=re.DOTALL)):
+        for selector in rule.split(","):
+            if ":not(" not in selector:
+                assert not inactive & set(CLASS_SELECTOR.findall(selector)), selector.strip()
+
+
+def test_prune_example():
+    css = (".card { padding: 1rem; }\n.bg-solid .card, .bg-gradient .card { color: red; }\n"
+           "@media (max-width: 768px) { .bg-gradient .hero { margin: 0; } }\n"
+           "body:not(.bg-gradient) .x { top: 0; }\n")
+    pruned = prune_css(css, frozenset({"bg-solid"}), frozenset({"bg-solid", "bg-gradient"}))
+    assert ".card { padding: 1rem; }" in pruned
+    assert ".bg-solid .card" in pruned and ".bg-gradient .card" not in pruned
+    assert "@media" not in pruned
+    assert "body:not(.bg-gradient) .x" in pruned
+    # Alle Theme-Klassen aktiv: Block bleibt unverändert
+    assert prune_css(css, frozenset({"bg-solid", "bg-gradient"}), frozenset({"bg-solid", "bg-gradient"})) == css
+
+
+def test_prune_style_chunks_matches_whole_page():
+    html = "".join(f"<p>{name}</p>{source}" for name, source in COMPONENTS.items())
+    pruner = ThemePruner("bg-solid card-flat anim-subtle", VOCABULARY)
+    reference, removed = prune_style_blocks(html, pruner)
+    assert removed > 0
+    rng = random.Random(0)
+    for _ in range(20):
+        cuts = sorted(rng.sample(range(1, len(html)), 200))
+        stats = {}
+        chunks = [html[start:end] for start, end in zip([0] + cuts, cuts + [len(html)])]
+        assert "".join(prune_style_chunks(chunks, pruner, stats)) == reference
+        assert stats["bytes_pruned"] == removed
+
+
+def load_generator(monkeypatch, output_dir):
+    spec = importlib.util.spec_from_file_location("generator_v03", BASE_DIR / "scripts" / "generator_v_fullpower_V03_neue_strukt.py")
+    generator = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(generator)
+    monkeypatch.setattr(generator, "OUTPUT_DIR", output_dir)
+    return generator
+
+
+def test_generated_page_gets_smaller(monkeypatch, tmp_path):
+    """Echte Seite (DEF_88, V03-Generator): ohne die Regeln inaktiver Theme-Klassen kleiner, Rest unverändert."""
+    generator = load_generator(monkeypatch, tmp_path)
+    project_dir = BASE_DIR / "content" / "DEF_88"
+    with (project_dir / "layout_extended_v2.csv").open(encoding="utf-8") as f:
+        layout_plan = [row for row in csv.DictReader(f) if row.get("enabled", "FALSE").upper() == "TRUE"]
+    content_file = generator.get_project_index(project_dir).latest("project_template_Stufe02_Styled", "classic")
+    content_data = generator.resolve_content(generator.load_json(content_file), project_dir)
+    style_data = generator.load_json(generator.get_project_index(project_dir).latest("interpreted_styles", "classic"))
+    global_defaults = generator.load_json(COMPONENTS_DIR / "_defaults.json")
+    args = (project_dir, "classic", content_data, layout_plan, {}, global_defaults, style_data)
+
+    unpruned = "".join(generator.iter_site_chunks(*args))
+    page = generator.generate_site_for_style(*args).read_text(encoding="utf-8")
+    assert len(page.encode("utf-8")) < len(unpruned.encode("utf-8"))
+    assert STYLE_BLOCK.sub("", page) == STYLE_BLOCK.sub("", unpruned)
+    for css in STYLE_BLOCK.findall(page):
+        assert_no_inactive_selectors(css, style_data.get("theme_classes", ""))
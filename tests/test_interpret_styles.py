@@ -0,0 +1,41 @@
+"""interpret_styles (00030) mit kompiliertem LayoutPlan gegen die bisherige O(Zeilen²)-Fassung."""
+import json
+
+import pytest
+
+from benchmark_interpret_styles import build_inputs, legacy_build_styles, load_script
+from style_modulator import resolve_tokens
+
+styles_stage = load_script("00030_Interpret_styles_v2.0.py")
+
+
+def test_compile_layout():
+    layout_data = [
+        {"component": "hero_section", "order": "1", "enabled": "true", "styling_default": "fade-up"},
+        {"component": "module_a", "order": "2", "enabled": "TRUE", "styling_default": "neutral"},
+        {"component": "module_b", "order": "3", "enabled": "false", "styling_default": "neutral"},
+        {"component": "footer", "order": "4", "enabled": "true", "styling_default": "neutral"},
+    ]
+    plan = styles_stage.compile_layout(layout_data, {"hero_section": {"class": "fade-up"}})
+    assert (plan.max_order, plan.enabled_count, plan.odd_enabled) == (4, 3, True)
+    assert [row.bg_index for row in plan.rows] == [1, 0, 1, 0]
+    assert [row.last_before_footer for row in plan.rows] == [False, False, False, False]
+    assert plan.rows[0].fixed == {"class": "fade-up"} and plan.rows[1].fixed is None
+    plan = styles_stage.compile_layout(layout_data[:3], {})
+    assert plan.rows[2].last_before_footer and plan.enabled_count == 2
+
+
+# Dunkler/heller Footer, gerade/ungerade Anzahl aktiver Zeilen, mehr Varianten als im style_modulator
+@pytest.mark.parametrize("row_count, variant_count", [(14, 4), (60, 12)])
+@pytest.mark.parametrize("primary, extra_rows", [("#FF5733", 0), ("#F0F0F0", 0), ("#F0F0F0", 1)])
+def test_build_styles_matches_legacy(row_count, variant_count, primary, extra_rows):
+    inputs = build_inputs(row_count + extra_rows, variant_count, primary)
+    result = styles_stage.build_styles(*inputs)
+    try:
+        legacy = legacy_build_styles(*inputs)
+    except ValueError:
+        # Bisher Absturz: rgba-Hintergrund vor hellem Footer landete ungeparst im Kontrast-Check
+        assert primary == "#F0F0F0"
+        return
+    # Die bisherige Fassung ließ {{colors.*}}-Tokens in den Hintergründen stehen
+    assert json.dumps(resolve_tokens(list(legacy), inputs[0])) == json.dumps(result)
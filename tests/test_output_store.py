@@ -0,0 +1,53 @@
+from output_store import OutputStore, parse_page_name
+
+
+def write(path, text):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(text, encoding="utf-8")
+    return path
+
+
+def test_parse_page_name():
+    assert parse_page_name("DEF_88_classic_accents_20250903_193056.html") == ("DEF_88", "classic_accents", "20250903_193056", "DEF_88_classic_accents.html")
+    assert parse_page_name("DEF_88_classic.html") == ("DEF_88", "classic", None, "DEF_88_classic.html")
+
+
+def test_same_bytes_twice_dedupe_to_one_blob(tmp_path):
+    docs, store_dir = tmp_path / "docs", tmp_path / "docs" / "docs_archives"
+    store = OutputStore(store_dir)
+    page = docs / "DEF_88_classic.html"
+    first, created = store.archive(write(page, "<html>gleich</html>"), timestamp="20250101_000000")
+    assert created
+    second, created = store.archive(write(page, "<html>gleich</html>"), timestamp="20250102_000000")
+    assert not created
+    assert first["sha256"] == second["sha256"]
+    store.save()
+    assert [p.name for p in (store_dir / "objects").rglob("*") if p.is_file()] == [first["sha256"]]
+    assert OutputStore(store_dir).stats() == {"versions": 2, "blobs": 1, "bytes_logical": 38, "bytes_stored": 19}
+    assert not page.exists()
+
+
+def test_import_loose_files_keeps_every_version(tmp_path):
+    store_dir = tmp_path / "docs_archives"
+    versions = {
+        "DEF_88_classic_20250101_000000.html": "v1",
+        "DEF_88_classic_20250102_000000.html": "v2",
+        "DEF_88_classic_20250103_000000.html": "v1",
+        "DEF_88_stylish_20250101_000000.html": "s1",
+    }
+    for name, text in versions.items():
+        write(store_dir / name, text)
+
+    store = OutputStore(store_dir)
+    assert not any(path.suffix == ".html" for path in store_dir.iterdir())
+    history = store.history("DEF_88", "classic")
+    assert [entry["timestamp"] for entry in history] == ["20250101_000000", "20250102_000000", "20250103_000000"]
+    assert store.stats()["versions"] == 4 and store.stats()["blobs"] == 3
+    for entry in store.history():
+        restore_dir = tmp_path / "restore" / entry["timestamp"]
+        restore_dir.mkdir(parents=True, exist_ok=True)
+        target = store.restore(entry, restore_dir)
+        assert target.name == f"{entry['project']}_{entry['style']}.html"
+        assert target.read_text(encoding="utf-8") == versions[f"{entry['project']}_{entry['style']}_{entry['timestamp']}.html"]
+    # Index wurde gespeichert: ein neuer Speicher sieht dieselben Versionen, ohne erneut zu importieren
+    assert OutputStore(store_dir).stats() == store.stats()
@@ -0,0 +1,42 @@
+"""Projekt-Index (project_index.py): Zerlegung der Dateinamen und neuestes Artefakt pro Art/Style."""
+import os
+
+from project_index import ProjectIndex, get_project_index, parse_artifact_name
+
+
+def touch(path):
+    path.write_text("{}")
+    return path
+
+
+def test_parse_artifact_name():
+    assert parse_artifact_name("interpreted_styles_classic_accents_20250901_075853.json") == \
+        ("interpreted_styles", "classic_accents", "20250901_075853")
+    assert parse_artifact_name("interpreted_text_colors_20250901_075853.json") == \
+        ("interpreted_text_colors", None, "20250901_075853")
+    assert parse_artifact_name("interpreted_colors.json") == ("interpreted_colors", None, None)
+    assert parse_artifact_name("interpreted_styles_classic_20250901_075853.html") is None
+    assert parse_artifact_name("notes.json") is None
+
+
+def test_latest_uses_timestamp_and_exact_style(tmp_path):
+    touch(tmp_path / "interpreted_styles_classic_20250102_000000.json")
+    newest = touch(tmp_path / "interpreted_styles_classic_20250103_000000.json")
+    touch(tmp_path / "interpreted_styles_classic_accents_20250104_000000.json")
+    # Ältere mtime für die neueste Generation: maßgeblich ist der Zeitstempel im Namen
+    os.utime(newest, (0, 0))
+    index = ProjectIndex(tmp_path)
+    assert index.latest("interpreted_styles", "classic") == newest
+    assert [a.timestamp for a in index.generations("interpreted_styles", "classic")] == ["20250102_000000", "20250103_000000"]
+    assert index.styles("interpreted_styles") == ["classic", "classic_accents"]
+    assert index.latest("interpreted_styles", "stylish") is None
+
+
+def test_shared_index_rescans_after_directory_change(tmp_path):
+    touch(tmp_path / "interpreted_text_colors_20250101_000000.json")
+    index = get_project_index(tmp_path)
+    assert get_project_index(tmp_path) is index and index.scans == 1
+    newer = touch(tmp_path / "interpreted_text_colors_20250201_000000.json")
+    os.utime(tmp_path, ns=(0, index.dir_mtime + 1))
+    assert get_project_index(tmp_path).latest("interpreted_text_colors") == newer
+    assert index.scans == 2
@@ -0,0 +1,71 @@
+from project_state import STATE_FILENAME, ProjectStateStore, discover_projects, record_stage
+
+STAGE = "generate_site"
+
+
+def make_projects(content_dir, *names):
+    for name in names:
+        (content_dir / name).mkdir(parents=True)
+    return discover_projects(content_dir)
+
+
+def test_discover_skips_legacy_folders(tmp_path):
+    make_projects(tmp_path, "B", "A", "processed_A_20250101", "proceed_contents_archives", ".hidden")
+    (tmp_path / "notes.txt").write_text("x", encoding="utf-8")
+    assert [path.name for path in discover_projects(tmp_path)] == ["A", "B"]
+
+
+def test_needing_rebuild(tmp_path):
+    projects = make_projects(tmp_path, "A", "B", "C")
+    with ProjectStateStore(tmp_path / STATE_FILENAME) as state:
+        state.sync(projects)
+        for project in projects:
+            state.observe(project.name, STAGE, "k1")
+        # Neue Projekte (noch nie gebaut) müssen gebaut werden
+        assert state.needing_rebuild(STAGE) == ["A", "B", "C"]
+
+        for project in projects:
+            output = project / "page.html"
+            output.write_text(project.name, encoding="utf-8")
+            state.mark_done(project.name, STAGE, "k1", [output])
+        assert state.needing_rebuild(STAGE) == []
+
+        # Geänderte Inputs
+        state.observe("A", STAGE, "k2")
+        # Fehlgeschlagener Lauf
+        state.mark_failed("B", STAGE, "kaputt")
+        assert state.needing_rebuild(STAGE) == ["A", "B"]
+
+        # Inaktive Projekte (Ordner nicht mehr vorhanden) tauchen nicht auf
+        state.sync([path for path in projects if path.name != "A"])
+        assert state.needing_rebuild(STAGE) == ["B"]
+
+
+def test_missing_or_changed_outputs_are_not_intact(tmp_path):
+    (project,) = make_projects(tmp_path, "A")
+    outputs = [project / "a.html", project / "b.html"]
+    for output in outputs:
+        output.write_text("seite", encoding="utf-8")
+    with ProjectStateStore(tmp_path / STATE_FILENAME) as state:
+        state.sync([project])
+        state.observe("A", STAGE, "k1")
+        state.mark_done("A", STAGE, "k1", outputs)
+        assert state.intact_outputs("A", STAGE) == [path.resolve() for path in outputs]
+
+        outputs[0].write_text("andere Seite", encoding="utf-8")
+        assert state.intact_outputs("A", STAGE) is None
+        state.mark_done("A", STAGE, "k1", outputs)
+        outputs[1].unlink()
+        assert state.intact_outputs("A", STAGE) is None
+
+
+def test_record_stage(tmp_path):
+    (project,) = make_projects(tmp_path, "A")
+    output = project / "interpreted_colors.json"
+    output.write_text("{}", encoding="utf-8")
+    record_stage(project, "interpret_colors", "k1", [output])
+    record_stage(project, "inject_styles", "k1", error="kaputt")
+    with ProjectStateStore(tmp_path / STATE_FILENAME) as state:
+        assert state.needing_rebuild("interpret_colors") == []
+        assert state.outputs("A", "interpret_colors") == [output.resolve()]
+        assert state.needing_rebuild("inject_styles") == ["A"]
@@ -0,0 +1,59 @@
+import json
+
+import pytest
+
+from publish import DELTA_FILENAME, compute_delta, publish
+
+
+def write(path, text):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(text, encoding="utf-8")
+
+
+def test_delta_dir_replaces_previous_delta(tmp_path):
+    docs, out = tmp_path / "docs", tmp_path / "out"
+    write(docs / "a.html", "a")
+    write(docs / "sub" / "b.html", "b")
+    publish(docs, out_dir=out)
+    assert sorted(p.relative_to(out).as_posix() for p in out.rglob("*") if p.is_file()) == [DELTA_FILENAME, "a.html", "sub/b.html"]
+
+    (docs / "a.html").unlink()
+    write(docs / "c.html", "c")
+    publish(docs, out_dir=out)
+    assert sorted(p.relative_to(out).as_posix() for p in out.rglob("*") if p.is_file()) == [DELTA_FILENAME, "c.html"]
+    assert json.loads((out / DELTA_FILENAME).read_text(encoding="utf-8"))["removed"] == ["a.html"]
+    assert sorted(p.name for p in tmp_path.iterdir()) == ["docs", "out"]
+
+
+def test_delta_dir_refuses_foreign_directory(tmp_path):
+    docs, target = tmp_path / "docs", tmp_path / "target"
+    write(docs / "a.html", "a")
+    write(target / "keep.txt", "nicht anfassen")
+    with pytest.raises(FileExistsError):
+        publish(docs, out_dir=target)
+    assert (target / "keep.txt").read_text(encoding="utf-8") == "nicht anfassen"
+    # Stand wurde nicht gespeichert: beim nächsten Versuch ist a.html weiterhin neu
+    assert publish(docs, dry_run=True).added == ["a.html"]
+
+
+def test_delta_classifies_added_changed_removed(tmp_path):
+    docs = tmp_path / "docs"
+    write(docs / "keep.html", "gleich")
+    write(docs / "edit.html", "alt")
+    write(docs / "gone.html", "weg")
+    write(docs / "docs_archives" / "old.html", "nie veröffentlicht")
+    write(docs / "page.html.part", "halb geschrieben")
+    first = publish(docs)
+    assert (first.added, first.changed, first.removed) == (["edit.html", "gone.html", "keep.html"], [], [])
+
+    write(docs / "keep.html", "gleich")  # neu geschrieben, gleicher Inhalt: keine Änderung
+    write(docs / "edit.html", "neuer Text")
+    (docs / "gone.html").unlink()
+    write(docs / "sub" / "new.html", "neu")
+    delta = compute_delta(docs)
+    assert (delta.added, delta.changed, delta.removed) == (["sub/new.html"], ["edit.html"], ["gone.html"])
+    assert delta.upload == ["sub/new.html", "edit.html"]
+    assert delta.bytes_upload == len("neu") + len("neuer Text")
+
+    publish(docs)
+    assert not compute_delta(docs)
@@ -0,0 +1,133 @@
+import importlib.util
+from pathlib import Path
+
+from template_engine import ListIndex, PlaceholderResolver, compile_template, resolve_mapping_values, resolve_placeholders
+
+BASE_DIR = Path(__file__).resolve().parent.parent
+
+
+def load_generator():
+    spec = importlib.util.spec_from_file_location("generator_v03", BASE_DIR / "scripts" / "generator_v_fullpower_V03_neue_strukt.py")
+    generator = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(generator)
+    return generator
+
+
+def test_resolve_mapping_values():
+    mapping = {"name": "ACME", "claim": "Arbeiten bei {{name}}", "title": "{{claim}}!", "loop": "{{loop}}", "count": 3}
+    resolved = resolve_mapping_values(mapping)
+    assert resolved == {"name": "ACME", "claim": "Arbeiten bei ACME", "title": "Arbeiten bei ACME!", "loop": "{{loop}}", "count": 3}
+    assert mapping["title"] == "{{claim}}!"
+    plain = {"name": "ACME"}
+    assert resolve_mapping_values(plain) is plain
+    assert resolve_mapping_values({"text": "bei {{name}}"}, fallback=mapping) == {"text": "bei ACME"}
+
+
+def test_v03_replace_placeholders_resolves_nested_values():
+    generator = load_generator()
+    # Reihenfolge der Keys spielt keine Rolle (die alte replace-Schleife löste nur "spätere" Keys auf)
+    mapping = {"title": "{{claim}}!", "claim": "Arbeiten bei {{company.name}}", "company.name": "ACME"}
+    assert generator.replace_placeholders("<h1>{{title}}</h1>", mapping) == "<h1>Arbeiten bei ACME!</h1>"
+
+
+def test_v03_iter_site_chunks_resolves_nested_values():
+    generator = load_generator()
+    content_data = {
+        "global_settings": {"company": {"name": "ACME"}},
+        "page_content": {"benefits_section": [{
+            "headline": {"value": "Benefits bei {{company.name}}"},
+            "description": {"value": "{{benefits_section.description}}"},
+            "benefits_list": [{"icon": {"value": "*"}, "title": {"value": "{{benefits_section.headline}}"},
+                               "text": {"value": "Nur bei {{company.name}}"}}],
+        }]},
+    }
+    layout_plan = [{"component": "benefits_section", "order": "1"}]
+    html = "".join(generator.iter_site_chunks(BASE_DIR / "content" / "DEF_88", "classic", content_data, layout_plan,
+                                              {}, {}, {"theme_classes": ""}, {}))
+    assert "<h2>Benefits bei ACME</h2>" in html
+    assert "<h3>Benefits bei ACME</h3>" in html
+    assert "<p>Nur bei ACME</p>" in html
+    # Zyklischer Verweis bleibt als Platzhalter stehen statt endlos zu expandieren
+    assert '<p class="description">{{benefits_section.description}}</p>' in html
+
+
+def test_resolver_nested_values():
+    mapping = {"a": "<{{b}}>", "b": "{{c}}{{c}}", "c": "x"}
+    assert resolve_placeholders("{{a}} {{ c }}", mapping) == ("<xx> x", [], [])
+
+
+def test_resolver_reports_unresolved():
+    text, unresolved, cyclic = resolve_placeholders("{{a}} {{missing}} {{a}}", {"a": "{{other}}"})
+    assert text == "{{other}} {{missing}} {{other}}"
+    assert unresolved == ["missing", "other"]
+    assert cyclic == []
+
+
+def test_resolver_detects_cycles():
+    resolver = PlaceholderResolver({"a": "1{{b}}", "b": "2{{a}}", "self": "[{{self}}]", "ok": "fine"})
+    assert resolver.resolve("{{ok}} {{self}}") == "fine [{{self}}]"
+    assert resolver.cyclic == {"self"}
+    # Der Zyklus a -> b -> a endet beim zweiten Besuch von a, der Platzhalter bleibt stehen
+    assert resolver.resolve("{{a}}") == "12{{a}}"
+    assert resolver.cyclic == {"self", "a"}
+    assert resolver.unresolved == set()
+
+
+def test_resolver_strip_keys():
+    mapping = {"name": "ACME"}
+    assert resolve_placeholders("{{ name }}", mapping)[0] == "ACME"
+    assert resolve_placeholders("{{ name }}", mapping, strip_keys=False) == ("{{ name }}", [" name "], [])
+
+
+NESTED = (
+    "<ul>{{title}}"
+    "<!-- BEGIN_LIST_ITEM:s.outer --><li>{{name}}"
+    "<!-- BEGIN_LIST_ITEM:s.inner --><b>{{tag}}</b><!-- END_LIST_ITEM:s.inner -->"
+    "</li><!-- END_LIST_ITEM:s.outer --></ul>"
+)
+
+
+def render_via_expand(index, mapping, lists):
+    return compile_template(index.expand(lists)).render(mapping)
+
+
+def test_nested_list_blocks():
+    index = ListIndex(NESTED)
+    assert [block.marker for block in index.blocks] == ["s.outer"]
+    assert [child.marker for child in index.blocks[0].children] == ["s.inner"]
+    lists = {"s.outer": [{"name": "A"}, {"name": "B"}], "s.inner": [{"tag": "x"}, {"tag": "y"}]}
+    assert index.expand(lists) == "<ul>{{title}}<li>A<b>x</b><b>y</b></li><li>B<b>x</b><b>y</b></li></ul>"
+    # Ohne Daten für den äußeren Block bleibt er samt Markern stehen, der innere wird expandiert
+    assert index.expand({"s.inner": [{"tag": "x"}]}) == (
+        "<ul>{{title}}<!-- BEGIN_LIST_ITEM:s.outer --><li>{{name}}<b>x</b>"
+        "</li><!-- END_LIST_ITEM:s.outer --></ul>")
+
+
+def test_end_without_begin_stays_literal():
+    source = "a<!-- END_LIST_ITEM:s.x -->b<!-- BEGIN_LIST_ITEM:s.y -->{{v}}<!-- END_LIST_ITEM:s.y -->"
+    index = ListIndex(source)
+    assert index.markers == ["s.y"]
+    assert index.expand({"s.x": [{}], "s.y": [{"v": 1}, {"v": 2}]}) == "a<!-- END_LIST_ITEM:s.x -->b12"
+
+
+def test_unclosed_parent_block():
+    source = "<!-- BEGIN_LIST_ITEM:s.open -->[<!-- BEGIN_LIST_ITEM:s.item -->{{v}}<!-- END_LIST_ITEM:s.item -->]"
+    index = ListIndex(source)
+    # Der nie geschlossene Elternblock bleibt Literal, sein geschlossenes Kind wird oberste Ebene
+    assert [block.marker for block in index.blocks] == ["s.item"]
+    assert index.expand({"s.open": [{}], "s.item": [{"v": 1}, {"v": 2}]}) == "<!-- BEGIN_LIST_ITEM:s.open -->[12]"
+
+
+def test_iter_render_matches_expand_then_render():
+    cases = [
+        (NESTED, {"title": "T", "name": "global"},
+         {"s.outer": [{"name": "A"}, {}], "s.inner": [{"tag": "x"}, {"tag": "y"}]}),
+        (NESTED, {"title": "T"}, {"s.inner": [{"tag": "x"}]}),
+        (NESTED, {"title": "T"}, {}),
+        ("a<!-- END_LIST_ITEM:s.x -->{{v}}<!-- BEGIN_LIST_ITEM:s.y -->{{v}}<!-- END_LIST_ITEM:s.y -->",
+         {"v": "g"}, {"s.y": [{"v": 1}]}),
+    ]
+    for source, mapping, lists in cases:
+        index = ListIndex(source)
+        # Item-Keys gehen vor, fehlende fallen auf das globale Mapping zurück (leeres Item -> "global")
+        assert "".join(index.iter_render(mapping, lists)) == render_via_expand(index, mapping, lists)